@@ -0,0 +1,64 @@
+"""Products full-text search vector
+
+Revision ID: a1c4e2f9b301
+Revises: f3b9acc07490
+Create Date: 2026-01-12 10:14:03.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e2f9b301'
+down_revision: Union[str, None] = 'f3b9acc07490'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Weights: A = name/code, B = keywords, C = description, D = specification values.
+# The code goes through the 'simple' config so "ST123456A" is never stemmed.
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION products_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese', unaccent(coalesce(NEW.name, ''))), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.code, '')), 'A') ||
+        setweight(to_tsvector('portuguese', unaccent(coalesce(NEW.keywords, ''))), 'B') ||
+        setweight(to_tsvector('portuguese', unaccent(coalesce(NEW.description, ''))), 'C') ||
+        setweight(to_tsvector('portuguese', unaccent(coalesce((
+            SELECT string_agg(spec.value, ' ')
+            FROM jsonb_each_text(
+                CASE WHEN jsonb_typeof(NEW.specifications) = 'object'
+                     THEN NEW.specifications ELSE '{}'::jsonb END
+            ) AS spec
+        ), ''))), 'D');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS "unaccent"')
+    op.add_column('products', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True, comment='Maintained by trigger products_search_vector_trg'))
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER products_search_vector_trg
+        BEFORE INSERT OR UPDATE OF name, code, keywords, description, specifications
+        ON products
+        FOR EACH ROW EXECUTE FUNCTION products_search_vector_update()
+    """)
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE products SET name = name")
+    op.create_index('ix_products_search_vector', 'products', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_search_vector', table_name='products', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS products_search_vector_trg ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_search_vector_update()")
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,30 @@
+"""Products trigram indexes for fuzzy lookup
+
+Revision ID: b7d21e5c4a88
+Revises: a1c4e2f9b301
+Create Date: 2026-01-19 15:42:27.506931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d21e5c4a88'
+down_revision: Union[str, None] = 'a1c4e2f9b301'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS "pg_trgm"')
+    # GIN serves the % / <% filters on names; GiST serves KNN (<->) ordering on codes
+    op.create_index('ix_products_name_trgm', 'products', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_products_code_trgm', 'products', ['code'], unique=False, postgresql_using='gist', postgresql_ops={'code': 'gist_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_code_trgm', table_name='products', postgresql_using='gist')
+    op.drop_index('ix_products_name_trgm', table_name='products', postgresql_using='gin')
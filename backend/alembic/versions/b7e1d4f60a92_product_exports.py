@@ -0,0 +1,51 @@
+"""Product exports (background export jobs)
+
+Revision ID: b7e1d4f60a92
+Revises: f5c3a9d27e61
+Create Date: 2026-03-09 15:42:07.315840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1d4f60a92'
+down_revision: Union[str, None] = 'f5c3a9d27e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_exports',
+    sa.Column('job_id', sa.String(length=50), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('file_format', sa.String(length=10), nullable=False),
+    sa.Column('product_status', sa.String(length=20), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='exportstatus'), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('file_size', sa.BigInteger(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_exports_account_id'), 'product_exports', ['account_id'], unique=False)
+    op.create_index(op.f('ix_product_exports_created_at'), 'product_exports', ['created_at'], unique=False)
+    op.create_index(op.f('ix_product_exports_id'), 'product_exports', ['id'], unique=False)
+    op.create_index(op.f('ix_product_exports_job_id'), 'product_exports', ['job_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_exports_job_id'), table_name='product_exports')
+    op.drop_index(op.f('ix_product_exports_id'), table_name='product_exports')
+    op.drop_index(op.f('ix_product_exports_created_at'), table_name='product_exports')
+    op.drop_index(op.f('ix_product_exports_account_id'), table_name='product_exports')
+    op.drop_table('product_exports')
+    sa.Enum(name='exportstatus').drop(op.get_bind(), checkfirst=True)
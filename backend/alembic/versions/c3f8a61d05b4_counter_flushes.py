@@ -0,0 +1,35 @@
+"""Applied engagement counter flushes (idempotent Redis batch retries)
+
+Revision ID: c3f8a61d05b4
+Revises: b7e1d4f60a92
+Create Date: 2026-03-12 10:18:44.602915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a61d05b4'
+down_revision: Union[str, None] = 'b7e1d4f60a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('counter_flushes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_counter_flushes_created_at'), 'counter_flushes', ['created_at'], unique=False)
+    op.create_index(op.f('ix_counter_flushes_id'), 'counter_flushes', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_counter_flushes_id'), table_name='counter_flushes')
+    op.drop_index(op.f('ix_counter_flushes_created_at'), table_name='counter_flushes')
+    op.drop_table('counter_flushes')
@@ -0,0 +1,33 @@
+"""Products composite indexes for keyset pagination
+
+Revision ID: c58e0a3f19d2
+Revises: b7d21e5c4a88
+Create Date: 2026-01-26 09:31:48.240117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e0a3f19d2'
+down_revision: Union[str, None] = 'b7d21e5c4a88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Catalog listings (filtered by status) and seller inventories (filtered by account)
+    op.create_index('ix_products_status_created_at_id', 'products', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_products_status_price_id', 'products', ['status', 'price', 'id'], unique=False)
+    op.create_index('ix_products_account_created_at_id', 'products', ['account_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_products_account_price_id', 'products', ['account_id', 'price', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_account_price_id', table_name='products')
+    op.drop_index('ix_products_account_created_at_id', table_name='products')
+    op.drop_index('ix_products_status_price_id', table_name='products')
+    op.drop_index('ix_products_status_created_at_id', table_name='products')
@@ -0,0 +1,103 @@
+"""Product count delta outbox and capture triggers
+
+Revision ID: d94b7f2e6c10
+Revises: c58e0a3f19d2
+Create Date: 2026-02-02 11:08:55.731402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94b7f2e6c10'
+down_revision: Union[str, None] = 'c58e0a3f19d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers append one aggregated delta per (entity, statement),
+# so concurrent writers never contend on the categories/brands rows.
+# Only ACTIVE products count (same rule as Category/Brand.update_product_count).
+CAPTURE_FUNCTION = """
+CREATE OR REPLACE FUNCTION products_capture_count_deltas()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO product_count_deltas (entity_type, entity_id, delta)
+        SELECT 'category', category_id, count(*) FROM new_rows
+        WHERE status = 'ACTIVE' AND category_id IS NOT NULL GROUP BY category_id
+        UNION ALL
+        SELECT 'brand', brand_id, count(*) FROM new_rows
+        WHERE status = 'ACTIVE' AND brand_id IS NOT NULL GROUP BY brand_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO product_count_deltas (entity_type, entity_id, delta)
+        SELECT 'category', category_id, -count(*) FROM old_rows
+        WHERE status = 'ACTIVE' AND category_id IS NOT NULL GROUP BY category_id
+        UNION ALL
+        SELECT 'brand', brand_id, -count(*) FROM old_rows
+        WHERE status = 'ACTIVE' AND brand_id IS NOT NULL GROUP BY brand_id;
+    ELSE
+        -- Unchanged rows cancel out, so plain counter updates emit nothing
+        INSERT INTO product_count_deltas (entity_type, entity_id, delta)
+        SELECT entity_type, entity_id, sum(delta) FROM (
+            SELECT 'category' AS entity_type, category_id AS entity_id, 1 AS delta
+            FROM new_rows WHERE status = 'ACTIVE' AND category_id IS NOT NULL
+            UNION ALL
+            SELECT 'category', category_id, -1
+            FROM old_rows WHERE status = 'ACTIVE' AND category_id IS NOT NULL
+            UNION ALL
+            SELECT 'brand', brand_id, 1
+            FROM new_rows WHERE status = 'ACTIVE' AND brand_id IS NOT NULL
+            UNION ALL
+            SELECT 'brand', brand_id, -1
+            FROM old_rows WHERE status = 'ACTIVE' AND brand_id IS NOT NULL
+        ) AS changes
+        GROUP BY entity_type, entity_id
+        HAVING sum(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('product_count_deltas',
+    sa.Column('entity_type', sa.String(length=10), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_count_deltas_created_at'), 'product_count_deltas', ['created_at'], unique=False)
+    op.execute(CAPTURE_FUNCTION)
+    # Transition tables require one trigger per event
+    op.execute("""
+        CREATE TRIGGER products_count_deltas_insert_trg
+        AFTER INSERT ON products REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION products_capture_count_deltas()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_count_deltas_update_trg
+        AFTER UPDATE ON products REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION products_capture_count_deltas()
+    """)
+    op.execute("""
+        CREATE TRIGGER products_count_deltas_delete_trg
+        AFTER DELETE ON products REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION products_capture_count_deltas()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS products_count_deltas_delete_trg ON products")
+    op.execute("DROP TRIGGER IF EXISTS products_count_deltas_update_trg ON products")
+    op.execute("DROP TRIGGER IF EXISTS products_count_deltas_insert_trg ON products")
+    op.execute("DROP FUNCTION IF EXISTS products_capture_count_deltas()")
+    op.drop_index(op.f('ix_product_count_deltas_created_at'), table_name='product_count_deltas')
+    op.drop_table('product_count_deltas')
@@ -0,0 +1,38 @@
+"""Usage delta outbox for batched AvAdmin usage reporting
+
+Revision ID: e2a7c4d81b35
+Revises: d94b7f2e6c10
+Create Date: 2026-02-09 15:42:10.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c4d81b35'
+down_revision: Union[str, None] = 'd94b7f2e6c10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('usage_deltas',
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('counter_type', sa.String(length=30), nullable=False),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_usage_deltas_created_at'), 'usage_deltas', ['created_at'], unique=False)
+    op.create_index(op.f('ix_usage_deltas_id'), 'usage_deltas', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_usage_deltas_id'), table_name='usage_deltas')
+    op.drop_index(op.f('ix_usage_deltas_created_at'), table_name='usage_deltas')
+    op.drop_table('usage_deltas')
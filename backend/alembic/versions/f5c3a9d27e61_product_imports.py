@@ -0,0 +1,72 @@
+"""Product imports (batch progress and per-row errors)
+
+Revision ID: f5c3a9d27e61
+Revises: e2a7c4d81b35
+Create Date: 2026-03-02 10:18:44.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c3a9d27e61'
+down_revision: Union[str, None] = 'e2a7c4d81b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_imports',
+    sa.Column('batch_id', sa.String(length=50), nullable=False),
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('file_format', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='importstatus'), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=True),
+    sa.Column('processed_rows', sa.Integer(), nullable=False),
+    sa.Column('inserted_rows', sa.Integer(), nullable=False),
+    sa.Column('updated_rows', sa.Integer(), nullable=False),
+    sa.Column('error_rows', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_imports_account_id'), 'product_imports', ['account_id'], unique=False)
+    op.create_index(op.f('ix_product_imports_batch_id'), 'product_imports', ['batch_id'], unique=True)
+    op.create_index(op.f('ix_product_imports_created_at'), 'product_imports', ['created_at'], unique=False)
+    op.create_index(op.f('ix_product_imports_id'), 'product_imports', ['id'], unique=False)
+    op.create_table('product_import_errors',
+    sa.Column('batch_id', sa.String(length=50), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=True),
+    sa.Column('field', sa.String(length=50), nullable=True),
+    sa.Column('message', sa.String(length=500), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_import_errors_batch_id'), 'product_import_errors', ['batch_id'], unique=False)
+    op.create_index(op.f('ix_product_import_errors_created_at'), 'product_import_errors', ['created_at'], unique=False)
+    op.create_index(op.f('ix_product_import_errors_id'), 'product_import_errors', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_import_errors_id'), table_name='product_import_errors')
+    op.drop_index(op.f('ix_product_import_errors_created_at'), table_name='product_import_errors')
+    op.drop_index(op.f('ix_product_import_errors_batch_id'), table_name='product_import_errors')
+    op.drop_table('product_import_errors')
+    op.drop_index(op.f('ix_product_imports_id'), table_name='product_imports')
+    op.drop_index(op.f('ix_product_imports_created_at'), table_name='product_imports')
+    op.drop_index(op.f('ix_product_imports_batch_id'), table_name='product_imports')
+    op.drop_index(op.f('ix_product_imports_account_id'), table_name='product_imports')
+    op.drop_table('product_imports')
+    sa.Enum(name='importstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,13 @@
+# ========================================
+# STOCKTECH - API Routers
+# ========================================
+
+from .admin import router as admin_router
+from .catalog import router as catalog_router
+from .inventory import router as inventory_router
+
+__all__ = [
+    "admin_router",
+    "catalog_router",
+    "inventory_router",
+]
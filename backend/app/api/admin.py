@@ -0,0 +1,48 @@
+# ========================================
+# STOCKTECH - Marketplace Admin API
+# ========================================
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import get_db
+from ..core.security import TokenClaims
+from ..models import ProductStatus
+from ..services.exports import EXPORT_FORMAT_PATTERN
+from ..services.serializers import json_response
+from .deps import require_admin
+from .inventory import export_download, export_response, get_export_job
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+@router.get("/products/export")
+async def export_marketplace(
+    request: Request,
+    file_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    status: Optional[ProductStatus] = Query(None, description="Filter by status (default: all)"),
+    background: bool = Query(False, description="Always run as a background job"),
+    user: TokenClaims = Depends(require_admin)
+):
+    """Export every seller's products (streamed; background job past EXPORT_INLINE_MAX_ROWS)"""
+    return await export_response(request, None, user, file_format, status, background)
+
+@router.get("/exports/{job_id}")
+async def get_export(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    user: TokenClaims = Depends(require_admin)
+):
+    """Status of any background export"""
+    job = await get_export_job(db, job_id)
+    return json_response(job.to_dict())
+
+@router.get("/exports/{job_id}/download")
+async def download_export(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    user: TokenClaims = Depends(require_admin)
+):
+    """File of any completed background export"""
+    return export_download(await get_export_job(db, job_id))
@@ -0,0 +1,199 @@
+# ========================================
+# STOCKTECH - Catalog API
+# ========================================
+
+import uuid
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import get_read_db
+from ..models import ProductCondition
+from ..services.catalog import get_product, list_products
+from ..services.engagement import counter_buffer
+from ..services.facets import FacetFilters, get_facets
+from ..services.pagination import InvalidCursorError
+from ..services.response_cache import (
+    PRODUCTS_TAG,
+    compute_etag,
+    product_tag,
+    response_cache,
+    send_cached,
+)
+from ..services.search import fuzzy_search_products, search_products, suggest_terms
+from ..services.serializers import dumps, serialize_marketplace
+
+router = APIRouter(prefix="/api/catalog", tags=["catalog"])
+
+def _validate_term(q: str) -> str:
+    """Strip and enforce settings.search_min_chars"""
+    term = q.strip()
+    if len(term) < settings.search_min_chars:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search term must have at least {settings.search_min_chars} characters"
+        )
+    return term
+
+SORT_PATTERN = "^(newest|oldest|price_asc|price_desc)$"
+
+@router.get("/products")
+async def list_catalog_products(
+    request: Request,
+    sort: str = Query("newest", pattern=SORT_PATTERN),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    category_id: Optional[uuid.UUID] = None,
+    brand_id: Optional[uuid.UUID] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Browse active products with keyset (cursor) pagination"""
+    key = ("catalog:products", sort, cursor, limit, category_id, brand_id)
+    entry = response_cache.get(key)
+    
+    if entry is None:
+        generation = response_cache.generation
+        try:
+            products, next_cursor = await list_products(
+                db,
+                sort=sort,
+                limit=limit,
+                cursor=cursor,
+                category_id=category_id,
+                brand_id=brand_id
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        items = await serialize_marketplace(db, products)
+        body = dumps({
+            "sort": sort,
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "items": items,
+        })
+        entry = response_cache.put(key, body, compute_etag(key, products, items), [PRODUCTS_TAG], generation)
+    
+    return send_cached(request, entry)
+
+@router.get("/products/{product_id}")
+async def get_catalog_product(
+    request: Request,
+    product_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Product detail (records a view through the counter buffer)"""
+    key = ("catalog:product", product_id)
+    entry = response_cache.get(key)
+    
+    if entry is None:
+        generation = response_cache.generation
+        product = await get_product(db, product_id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        
+        items = await serialize_marketplace(db, [product])
+        entry = response_cache.put(
+            key, dumps(items[0]), compute_etag(key, [product], items), [product_tag(product_id)], generation
+        )
+    
+    await counter_buffer.record_view(product_id)
+    return send_cached(request, entry)
+
+@router.post("/products/{product_id}/contact")
+async def contact_seller(product_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
+    """Record a WhatsApp click and return the message template"""
+    product = await get_product(db, product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    
+    await counter_buffer.record_contact(product.id)
+    return {
+        "product_id": str(product.id),
+        "message": product.get_whatsapp_message(),
+    }
+
+@router.get("/facets")
+async def catalog_facets(
+    category_id: Optional[uuid.UUID] = None,
+    brand_id: Optional[uuid.UUID] = None,
+    condition: Optional[ProductCondition] = None,
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Counts per category, brand, condition and price band for the current filters"""
+    filters = FacetFilters(
+        category_id=category_id,
+        brand_id=brand_id,
+        condition=condition,
+        min_price=min_price,
+        max_price=max_price
+    )
+    return await get_facets(db, filters)
+
+@router.get("/search")
+async def search_catalog(
+    request: Request,
+    q: str = Query(..., description="Search terms"),
+    mode: str = Query("fulltext", pattern="^(fulltext|fuzzy)$", description="fulltext or fuzzy (typo-tolerant)"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Ranked search over the marketplace catalog (full-text or trigram fuzzy)"""
+    term = _validate_term(q)
+    key = ("catalog:search", term, mode, page, page_size)
+    entry = response_cache.get(key)
+    if entry is not None:
+        return send_cached(request, entry)
+    
+    generation = response_cache.generation
+    search = fuzzy_search_products if mode == "fuzzy" else search_products
+    
+    # Fetch one extra row to know if there is a next page without COUNT(*)
+    hits = await search(
+        db,
+        term,
+        limit=page_size + 1,
+        offset=(page - 1) * page_size
+    )
+    
+    has_more = len(hits) > page_size
+    products = [product for product, _ in hits[:page_size]]
+    items = await serialize_marketplace(db, products)
+    for item, (_, rank) in zip(items, hits):
+        item["rank"] = rank
+    
+    # "Did you mean" only when the first page comes back empty
+    suggestions = []
+    if not items and page == 1:
+        suggestions = await suggest_terms(db, term)
+    
+    body = dumps({
+        "query": term,
+        "mode": mode,
+        "page": page,
+        "page_size": page_size,
+        "has_more": has_more,
+        "items": items,
+        "suggestions": suggestions,
+    })
+    entry = response_cache.put(key, body, compute_etag(key, products, items), [PRODUCTS_TAG], generation)
+    return send_cached(request, entry)
+
+@router.get("/suggest")
+async def suggest_catalog(
+    q: str = Query(..., description="Partial or misspelled name/code"),
+    limit: int = Query(settings.search_suggestion_limit, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Did-you-mean suggestions from product names and codes"""
+    term = _validate_term(q)
+    return {
+        "query": term,
+        "suggestions": await suggest_terms(db, term, limit=limit),
+    }
@@ -0,0 +1,52 @@
+# ========================================
+# STOCKTECH - API Dependencies (Authentication)
+# ========================================
+
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from ..core.config import settings
+from ..core.security import InvalidTokenError, TokenClaims, decode_access_token
+from ..services.auth import has_module_access, revocation_list
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> TokenClaims:
+    """Verify the bearer token locally (no AvAdmin call on the hot path)"""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+
+    try:
+        claims = decode_access_token(credentials.credentials)
+    except InvalidTokenError as e:
+        raise _unauthorized(f"Invalid token: {str(e)}")
+
+    await revocation_list.ensure_fresh()
+    if not revocation_list.available:
+        raise HTTPException(status_code=503, detail="Token revocation list unavailable")
+    if revocation_list.is_revoked(claims):
+        raise _unauthorized("Token has been revoked")
+    return claims
+
+def require_module(module: str = "StockTech"):
+    """Dependency factory: authenticated user whose account can use `module`"""
+
+    async def dependency(claims: TokenClaims = Depends(get_current_user)) -> TokenClaims:
+        if not await has_module_access(claims, module):
+            raise HTTPException(status_code=403, detail=f"No access to module {module}")
+        return claims
+
+    return dependency
+
+async def require_admin(claims: TokenClaims = Depends(get_current_user)) -> TokenClaims:
+    """Authenticated user with a marketplace admin role (ADMIN_ROLES)"""
+    if claims.role not in settings.admin_roles:
+        raise HTTPException(status_code=403, detail="Marketplace admin role required")
+    return claims
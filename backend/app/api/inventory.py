@@ -0,0 +1,219 @@
+# ========================================
+# STOCKTECH - Seller Inventory API
+# ========================================
+
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import get_db, get_read_db
+from ..core.security import TokenClaims
+from ..models import ExportStatus, ProductExport, ProductImport, ProductImportError, ProductStatus
+from ..services.catalog import list_products
+from ..services.exports import EXPORT_FORMAT_PATTERN, export_filename, media_type, product_exporter
+from ..services.import_rows import ImportFileError
+from ..services.imports import product_importer
+from ..services.pagination import InvalidCursorError
+from ..services.serializers import json_response, serialize_marketplace
+from .catalog import SORT_PATTERN
+from .deps import require_module
+
+router = APIRouter(prefix="/api/inventory", tags=["inventory"])
+
+def _own_account(account_id: uuid.UUID, user: TokenClaims) -> None:
+    if user.account_id != str(account_id):
+        raise HTTPException(status_code=403, detail="Inventory belongs to another account")
+
+@router.get("/{account_id}/products")
+async def list_inventory_products(
+    account_id: uuid.UUID,
+    sort: str = Query("newest", pattern=SORT_PATTERN),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    status: Optional[ProductStatus] = Query(None, description="Filter by status (default: all)"),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """Scroll a seller's whole inventory (any status) with keyset pagination"""
+    _own_account(account_id, user)
+    
+    try:
+        products, next_cursor = await list_products(
+            db,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            account_id=account_id
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return json_response({
+        "account_id": str(account_id),
+        "sort": sort,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": await serialize_marketplace(db, products),
+    })
+
+# ==========================================
+# BULK IMPORT
+# ==========================================
+
+async def _get_import(db: AsyncSession, account_id: uuid.UUID, batch_id: str) -> ProductImport:
+    batch = (await db.execute(
+        select(ProductImport).where(ProductImport.batch_id == batch_id, ProductImport.account_id == account_id)
+    )).scalar_one_or_none()
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return batch
+
+@router.post("/{account_id}/imports", status_code=202)
+async def start_import(
+    account_id: uuid.UUID,
+    file: UploadFile = File(..., description="CSV or XLSX with a header row (code, name, price, ...)"),
+    db: AsyncSession = Depends(get_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """Upload a spreadsheet; rows are validated and merged by code in the background"""
+    _own_account(account_id, user)
+    
+    try:
+        batch = await product_importer.start(db, file, user.account_id, user.user_id)
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return json_response(batch.to_dict(), status_code=202)
+
+@router.get("/{account_id}/imports/{batch_id}")
+async def get_import(
+    account_id: uuid.UUID,
+    batch_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """Progress of an import (counters advance once per merged chunk)"""
+    _own_account(account_id, user)
+    batch = await _get_import(db, account_id, batch_id)
+    return json_response(batch.to_dict())
+
+@router.get("/{account_id}/imports/{batch_id}/errors")
+async def list_import_errors(
+    account_id: uuid.UUID,
+    batch_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    db: AsyncSession = Depends(get_read_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """Rejected rows of an import, in file order"""
+    _own_account(account_id, user)
+    await _get_import(db, account_id, batch_id)
+    
+    errors = (await db.execute(
+        select(ProductImportError)
+        .where(ProductImportError.batch_id == batch_id)
+        .order_by(ProductImportError.row_number, ProductImportError.field)
+        .offset(offset)
+        .limit(limit)
+    )).scalars().all()
+    
+    return json_response({
+        "batch_id": batch_id,
+        "offset": offset,
+        "limit": limit,
+        "items": [
+            {"row": error.row_number, "code": error.code, "field": error.field, "message": error.message}
+            for error in errors
+        ],
+    })
+
+# ==========================================
+# EXPORT
+# ==========================================
+
+async def export_response(
+    request: Request,
+    account_id: Optional[uuid.UUID],
+    user: TokenClaims,
+    file_format: str,
+    status: Optional[ProductStatus],
+    background: bool
+):
+    """Stream the export, or start a job (202) when it is large or `background` is set"""
+    if background or await product_exporter.needs_job(account_id, status):
+        job = await product_exporter.start(account_id, user.user_id, status, file_format)
+        return json_response(job.to_dict(), status_code=202)
+    
+    strong = request.headers.get("x-consistency", "").lower() == "strong"
+    filename = export_filename(file_format, account_id)
+    return StreamingResponse(
+        product_exporter.inline(account_id, status, file_format, strong),
+        media_type=media_type(file_format),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+async def get_export_job(db: AsyncSession, job_id: str, account_id: Optional[uuid.UUID] = None) -> ProductExport:
+    """Export job by id; sellers only see their own (admins pass account_id=None)"""
+    query = select(ProductExport).where(ProductExport.job_id == job_id)
+    if account_id is not None:
+        query = query.where(ProductExport.account_id == account_id)
+    job = (await db.execute(query)).scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+def export_download(job: ProductExport) -> FileResponse:
+    if job.status != ExportStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Export is {job.status.value}")
+    
+    path = product_exporter.job_path(job)
+    if not path.exists():
+        raise HTTPException(status_code=410, detail="Export file has expired")
+    return FileResponse(
+        path,
+        media_type=media_type(job.file_format),
+        filename=export_filename(job.file_format, job.account_id)
+    )
+
+@router.get("/{account_id}/export")
+async def export_inventory(
+    request: Request,
+    account_id: uuid.UUID,
+    file_format: str = Query("csv", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    status: Optional[ProductStatus] = Query(None, description="Filter by status (default: all)"),
+    background: bool = Query(False, description="Always run as a background job"),
+    user: TokenClaims = Depends(require_module())
+):
+    """Export the whole inventory (streamed; background job past EXPORT_INLINE_MAX_ROWS)"""
+    _own_account(account_id, user)
+    return await export_response(request, account_id, user, file_format, status, background)
+
+@router.get("/{account_id}/exports/{job_id}")
+async def get_export(
+    account_id: uuid.UUID,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """Status of a background export"""
+    _own_account(account_id, user)
+    job = await get_export_job(db, job_id, account_id)
+    return json_response(job.to_dict())
+
+@router.get("/{account_id}/exports/{job_id}/download")
+async def download_export(
+    account_id: uuid.UUID,
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    user: TokenClaims = Depends(require_module())
+):
+    """File of a completed background export"""
+    _own_account(account_id, user)
+    return export_download(await get_export_job(db, job_id, account_id))
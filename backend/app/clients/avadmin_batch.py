@@ -0,0 +1,72 @@
+# ========================================
+# STOCKTECH - AvAdmin Batch Loader
+# ========================================
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+BatchFn = Callable[[List[str]], Awaitable[Dict[str, Any]]]
+
+class BatchLoader:
+    """
+    DataLoader-style batching: keys requested within one event-loop tick
+    are resolved by a single call to `batch_fn`
+    """
+    
+    def __init__(self, batch_fn: BatchFn, max_batch_size: int = 100):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def load(self, key: str) -> Awaitable[Any]:
+        """Queue a key; the result (or per-key exception) resolves the future"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        
+        if not self._scheduled:
+            # Runs after every callback already queued for this tick
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+    
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        
+        keys = list(pending)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+            task = asyncio.ensure_future(self._run(chunk))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, chunk: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            try:
+                results = await self.batch_fn(list(chunk))
+            except Exception as e:
+                results = {key: e for key in chunk}
+            
+            for key, futures in chunk.items():
+                value = results.get(key)
+                for future in futures:
+                    if future.done():
+                        continue  # Caller was cancelled
+                    if isinstance(value, Exception):
+                        future.set_exception(value)
+                    else:
+                        future.set_result(value)
+        except BaseException as e:
+            # Cancelled (e.g. shutdown) mid-batch: never leave callers waiting
+            for futures in chunk.values():
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+            raise
@@ -0,0 +1,206 @@
+# ========================================
+# STOCKTECH - AvAdmin Lookup Cache
+# ========================================
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import orjson
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.logger import logger
+from ..core.metrics import avadmin_cache_requests
+
+CacheKey = Tuple[str, ...]
+Loader = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+_MISSING = object()
+_NEGATIVE = object()  # Cached 404
+
+# ==========================================
+# REDIS TIER (shared across workers)
+# ==========================================
+
+class RedisLookupTier:
+    """Second cache tier storing raw AvAdmin payloads as JSON"""
+    
+    PREFIX = "stocktech:avadmin:"
+    
+    def __init__(self, url: str, password: Optional[str] = None):
+        import redis.asyncio as aioredis
+        
+        self._redis = aioredis.from_url(url, password=password)
+    
+    @classmethod
+    def _name(cls, key: CacheKey) -> str:
+        return cls.PREFIX + ":".join(key)
+    
+    async def get(self, key: CacheKey) -> Any:
+        raw = await self._redis.get(self._name(key))
+        if raw is None:
+            return _MISSING
+        value = orjson.loads(raw)
+        return _NEGATIVE if value is None else value
+    
+    async def set(self, key: CacheKey, value: Any, ttl_seconds: float) -> None:
+        payload = orjson.dumps(None if value is _NEGATIVE else value)
+        await self._redis.set(self._name(key), payload, ex=max(1, int(ttl_seconds)))
+    
+    async def delete(self, keys: Iterable[CacheKey]) -> None:
+        names = [self._name(key) for key in keys]
+        if names:
+            await self._redis.delete(*names)
+    
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+# ==========================================
+# LOOKUP CACHE
+# ==========================================
+
+class LookupCache:
+    """
+    Two-tier cache for AvAdmin GET lookups
+    Concurrent misses for the same key share a single upstream request
+    """
+    
+    def __init__(self, max_entries: int, negative_ttl: float, redis_tier: Optional[RedisLookupTier] = None):
+        self.negative_ttl = negative_ttl
+        self._local = TTLCache(ttl_seconds=negative_ttl, max_entries=max_entries, on_evict=self._unlink)
+        self._redis = redis_tier
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        # Tag index for cached keys, pruned with them (so bounded by max_entries)
+        self._tags: Dict[str, Set[CacheKey]] = {}
+        self._key_tags: Dict[CacheKey, Tuple[str, ...]] = {}
+        # In-flight loads (key -> tags) and those an invalidation raced
+        self._loading: Dict[CacheKey, Tuple[str, ...]] = {}
+        self._raced: Set[CacheKey] = set()
+    
+    async def get_or_load(
+        self,
+        key: CacheKey,
+        loader: Loader,
+        ttl_seconds: float,
+        tags: Iterable[str] = ()
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached payload (None for a cached 404) or load it once"""
+        value = self._local.get(key, _MISSING)
+        if value is not _MISSING:
+            avadmin_cache_requests.labels(key[0], "hit").inc()
+            return None if value is _NEGATIVE else value
+        
+        future = self._inflight.get(key)
+        if future is None:
+            tags = tuple(tags)
+            self._loading[key] = tags
+            future = asyncio.ensure_future(self._load(key, loader, ttl_seconds, tags))
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._load_done(key, done))
+        else:
+            avadmin_cache_requests.labels(key[0], "coalesced").inc()
+        
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(future)
+    
+    def _load_done(self, key: CacheKey, future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        self._loading.pop(key, None)
+        self._raced.discard(key)
+        if not future.cancelled():
+            future.exception()  # Retrieved even if every caller gave up waiting
+    
+    async def _load(self, key: CacheKey, loader: Loader, ttl_seconds: float, tags: Tuple[str, ...]) -> Any:
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+            except Exception as e:
+                logger.warning(f"AvAdmin cache Redis read failed: {str(e)}")
+                value = _MISSING
+            if value is not _MISSING:
+                avadmin_cache_requests.labels(key[0], "redis_hit").inc()
+                self._store_local(key, value, ttl_seconds, tags)
+                return None if value is _NEGATIVE else value
+        
+        avadmin_cache_requests.labels(key[0], "miss").inc()
+        data = await loader()  # Errors propagate and are never cached
+        value = _NEGATIVE if data is None else data
+        
+        if self._store_local(key, value, ttl_seconds, tags) and self._redis is not None:
+            try:
+                await self._redis.set(key, value, self._ttl_for(value, ttl_seconds))
+            except Exception as e:
+                logger.warning(f"AvAdmin cache Redis write failed: {str(e)}")
+        return data
+    
+    def _ttl_for(self, value: Any, ttl_seconds: float) -> float:
+        return self.negative_ttl if value is _NEGATIVE else ttl_seconds
+    
+    def _store_local(self, key: CacheKey, value: Any, ttl_seconds: float, tags: Tuple[str, ...]) -> bool:
+        # An invalidation of this key (or its tags) raced the load; the payload may predate it
+        if key in self._raced:
+            return False
+        
+        self._unlink(key)
+        self._local.set(key, value, self._ttl_for(value, ttl_seconds))
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+        return True
+    
+    def _unlink(self, key: CacheKey) -> None:
+        """Remove a key from the tag index (entry expired, evicted or replaced)"""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    # ==========================================
+    # INVALIDATION
+    # ==========================================
+    
+    async def invalidate(self, keys: Iterable[CacheKey] = (), tags: Iterable[str] = ()) -> None:
+        """Drop keys (and every key registered under the tags) from both tiers"""
+        targets = set(keys)
+        tags = set(tags)
+        for tag in tags:
+            targets |= self._tags.pop(tag, set())
+        
+        for key, load_tags in self._loading.items():
+            if key in targets or tags.intersection(load_tags):
+                self._raced.add(key)
+        for key in targets:
+            self._local.delete(key)
+            self._unlink(key)
+        
+        if self._redis is not None and targets:
+            try:
+                await self._redis.delete(targets)
+            except Exception as e:
+                logger.warning(f"AvAdmin cache Redis invalidation failed: {str(e)}")
+    
+    def clear(self) -> None:
+        """Drop the in-process tier (Redis entries expire on their own)"""
+        self._raced.update(self._loading)
+        self._local.clear()
+        self._tags.clear()
+        self._key_tags.clear()
+    
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+
+def create_lookup_cache() -> LookupCache:
+    """Build the cache from settings (Redis tier only when enabled)"""
+    redis_tier = None
+    if settings.avadmin_cache_redis:
+        redis_tier = RedisLookupTier(settings.redis_url, settings.redis_password)
+    
+    return LookupCache(
+        max_entries=settings.avadmin_cache_max_entries,
+        negative_ttl=settings.avadmin_cache_negative_ttl,
+        redis_tier=redis_tier
+    )
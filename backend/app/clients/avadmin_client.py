@@ -3,13 +3,18 @@
 # ========================================
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import httpx
 from pydantic import BaseModel
 from datetime import datetime
 
 from ..core.config import settings
 from ..core.logger import logger
+from ..core.metrics import avadmin_request_retries, usage_deltas_dropped, usage_deltas_reported
+from .avadmin_batch import BatchLoader
+from .avadmin_cache import create_lookup_cache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
 
 # ==========================================
 # RESPONSE MODELS (matching AvAdmin schemas)
@@ -69,6 +74,9 @@ class ModulePermission(BaseModel):
 # AVADMIN HTTP CLIENT
 # ==========================================
 
+class RequestNotSentError(ConnectionError):
+    """The request never reached AvAdmin (no connection), so it is safe to resend"""
+
 class AvAdminClient:
     """
     HTTP Client for communicating with AvAdmin module
@@ -76,59 +84,204 @@ class AvAdminClient:
     """
     
     def __init__(self):
-        self.base_url = settings.AVADMIN_API_URL  # http://avadmin-backend:8000
-        self.timeout = 10.0  # 10 seconds timeout
-        self.max_retries = 3
+        self.base_url = settings.avadmin_api_url  # http://avadmin-backend:8000
+        self.timeout = settings.avadmin_timeout
+        self.max_retries = settings.avadmin_max_retries
+        self.breaker = CircuitBreaker(
+            "avadmin",
+            failure_threshold=settings.avadmin_breaker_failure_threshold,
+            recovery_timeout=settings.avadmin_breaker_recovery_timeout
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = create_lookup_cache()
+        
+        # Per-tick batching of user/account fetches
+        self._user_loader = BatchLoader(
+            lambda ids: self._fetch_many("users", ids), settings.avadmin_batch_max_size
+        )
+        self._account_loader = BatchLoader(
+            lambda ids: self._fetch_many("accounts", ids), settings.avadmin_batch_max_size
+        )
+        self._bulk_unsupported: set = set() if settings.avadmin_bulk_lookups else {"users", "accounts"}
+        self._fallback_semaphore = asyncio.Semaphore(settings.avadmin_batch_fallback_concurrency)
+    
+    # ==========================================
+    # CONNECTION POOL
+    # ==========================================
+    
+    async def open(self) -> None:
+        """Create the pooled HTTP client (called from the app lifespan)"""
+        if self._client is not None:
+            return
+        
+        limits = httpx.Limits(
+            max_connections=settings.avadmin_max_connections,
+            max_keepalive_connections=settings.avadmin_max_keepalive_connections,
+            keepalive_expiry=settings.avadmin_keepalive_expiry
+        )
+        timeout = httpx.Timeout(self.timeout, connect=settings.avadmin_connect_timeout)
+        
+        http2 = settings.avadmin_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("AVADMIN_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+                http2 = False
         
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=limits,
+            timeout=timeout,
+            http2=http2
+        )
+    
+    async def close(self) -> None:
+        """Close pooled connections (called from the app lifespan)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.cache.close()
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Pooled client; opened lazily for scripts that skip the lifespan"""
+        if self._client is None:
+            await self.open()
+        return self._client
+    
     async def _make_request(
         self, 
         method: str, 
         endpoint: str, 
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        budget: Optional[float] = None,
+        max_attempts: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Make HTTP request to AvAdmin with retry logic"""
+        """
+        Make HTTP request to AvAdmin with retry logic
+        All attempts and backoff pauses share one deadline budget
+        """
         
-        url = f"{self.base_url}{endpoint}"
+        client = await self._get_client()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (settings.avadmin_request_budget if budget is None else budget)
         
-        for attempt in range(self.max_retries):
+        attempts = max_attempts or self.max_retries
+        
+        for attempt in range(attempts):
+            self.breaker.before_call()  # Raises CircuitOpenError while open
+            
+            remaining = deadline - loop.time()
+            timeout = httpx.Timeout(
+                min(self.timeout, remaining),
+                connect=min(settings.avadmin_connect_timeout, remaining)
+            )
+            
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        json=data,
-                        params=params
-                    )
-                    
-                    if response.status_code == 200:
-                        return response.json()
-                    elif response.status_code == 404:
-                        logger.warning(f"Resource not found: {endpoint}")
-                        return None
-                    elif response.status_code == 403:
-                        logger.warning(f"Access denied: {endpoint}")
-                        raise PermissionError(f"Access denied to {endpoint}")
-                    else:
-                        response.raise_for_status()
-                        
+                response = await client.request(
+                    method=method,
+                    url=endpoint,
+                    json=data,
+                    params=params,
+                    timeout=timeout
+                )
             except httpx.TimeoutException:
                 logger.warning(f"Timeout on attempt {attempt + 1} for {endpoint}")
-                if attempt == self.max_retries - 1:
-                    raise ConnectionError(f"AvAdmin service timeout after {self.max_retries} attempts")
-                await asyncio.sleep(1)  # Wait 1 second before retry
+                error = ConnectionError(f"AvAdmin service timeout on {endpoint}")
+            except httpx.ConnectError as e:
+                logger.error(f"Connection error on attempt {attempt + 1} for {endpoint}: {str(e)}")
+                error = RequestNotSentError("AvAdmin service is not available")
+            except httpx.TransportError as e:
+                logger.error(f"Connection error on attempt {attempt + 1} for {endpoint}: {str(e)}")
+                error = ConnectionError("AvAdmin service is not available")
+            else:
+                if response.status_code < 500 or response.status_code == 501:
+                    self.breaker.record_success()
+                    return self._handle_response(method, endpoint, response)
                 
-            except httpx.ConnectError:
-                logger.error(f"Connection error on attempt {attempt + 1} for {endpoint}")
-                if attempt == self.max_retries - 1:
-                    raise ConnectionError("AvAdmin service is not available")
-                await asyncio.sleep(2)  # Wait 2 seconds before retry
-                
-            except Exception as e:
-                logger.error(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
-                if attempt == self.max_retries - 1:
-                    raise
-                await asyncio.sleep(1)
+                logger.warning(f"AvAdmin returned {response.status_code} on attempt {attempt + 1} for {endpoint}")
+                error = ConnectionError(f"AvAdmin service error {response.status_code}")
+            
+            self.breaker.record_failure()
+            
+            delay = self._backoff(attempt)
+            if attempt == attempts - 1 or loop.time() + delay >= deadline:
+                raise error
+            
+            avadmin_request_retries.inc()
+            await asyncio.sleep(delay)
+    
+    def _handle_response(self, method: str, endpoint: str, response: httpx.Response) -> Optional[Dict[str, Any]]:
+        """Map a non-5xx response to a payload, None or an exception"""
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 404:
+            logger.warning(f"Resource not found: {endpoint}")
+            return None
+        elif response.status_code in (405, 501):
+            logger.warning(f"Endpoint not supported: {method} {endpoint}")
+            return None
+        elif response.status_code == 403:
+            logger.warning(f"Access denied: {endpoint}")
+            raise PermissionError(f"Access denied to {endpoint}")
+        
+        response.raise_for_status()
+        return response.json() if response.content else {}
+    
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        cap = min(settings.avadmin_backoff_max, settings.avadmin_backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+    
+    async def _cached(
+        self,
+        key: tuple,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        ttl_seconds: float,
+        tags: tuple = ()
+    ) -> Optional[Dict[str, Any]]:
+        """Load through the lookup cache (404s are cached briefly as None)"""
+        if not settings.avadmin_cache_enabled:
+            return await loader()
+        
+        return await self.cache.get_or_load(key, loader, ttl_seconds, tags)
+    
+    # ==========================================
+    # BATCHED LOOKUPS
+    # ==========================================
+    
+    async def _fetch_many(self, kind: str, ids: List[str]) -> Dict[str, Any]:
+        """Resolve one tick's worth of ids; missing ids map to None"""
+        if len(ids) > 1 and kind not in self._bulk_unsupported:
+            data = await self._make_request("POST", f"/api/internal/{kind}/batch", data={"ids": ids})
+            if data is not None:
+                found = {item["id"]: item for item in data.get(kind, [])}
+                return {item_id: found.get(item_id) for item_id in ids}
+            
+            logger.warning(f"AvAdmin has no bulk {kind} endpoint, falling back to parallel fetches")
+            self._bulk_unsupported.add(kind)
+        
+        async def fetch_one(item_id: str):
+            async with self._fallback_semaphore:
+                return await self._make_request("GET", f"/api/internal/{kind}/{item_id}")
+        
+        results = await asyncio.gather(*(fetch_one(item_id) for item_id in ids), return_exceptions=True)
+        return dict(zip(ids, results))
+    
+    # ==========================================
+    # CACHE INVALIDATION
+    # ==========================================
+    
+    async def invalidate_user(self, user_id: str) -> None:
+        """Drop cached user data (call after user changes in AvAdmin)"""
+        await self.cache.invalidate(keys=[("user", user_id)])
+    
+    async def invalidate_account(self, account_id: str, modules: tuple = ("StockTech",)) -> None:
+        """Drop cached account data, limits and module permissions"""
+        keys = [("account", account_id)] + [("permission", account_id, module) for module in modules]
+        await self.cache.invalidate(keys=keys, tags=[f"account:{account_id}"])
     
     # ==========================================
     # USER METHODS
@@ -137,12 +290,22 @@ class AvAdminClient:
     async def get_user(self, user_id: str) -> Optional[UserData]:
         """Get user details by ID"""
         try:
-            data = await self._make_request("GET", f"/api/internal/users/{user_id}")
+            data = await self._cached(
+                ("user", user_id),
+                lambda: self._user_loader.load(user_id),
+                settings.avadmin_cache_user_ttl
+            )
             return UserData(**data) if data else None
         except Exception as e:
             logger.error(f"Failed to get user {user_id}: {str(e)}")
             return None
     
+    async def get_users(self, user_ids: List[str]) -> Dict[str, Optional[UserData]]:
+        """Get several users at once (e.g. buyers/sellers of a transaction list)"""
+        unique_ids = list(dict.fromkeys(user_ids))
+        users = await asyncio.gather(*(self.get_user(user_id) for user_id in unique_ids))
+        return dict(zip(unique_ids, users))
+    
     async def get_user_by_cpf(self, cpf: str) -> Optional[UserData]:
         """Get user by CPF (for authentication)"""
         try:
@@ -172,17 +335,32 @@ class AvAdminClient:
     async def get_account(self, account_id: str) -> Optional[AccountData]:
         """Get account/company details"""
         try:
-            data = await self._make_request("GET", f"/api/internal/accounts/{account_id}")
+            data = await self._cached(
+                ("account", account_id),
+                lambda: self._account_loader.load(account_id),
+                settings.avadmin_cache_account_ttl
+            )
             return AccountData(**data) if data else None
         except Exception as e:
             logger.error(f"Failed to get account {account_id}: {str(e)}")
             return None
     
+    async def get_accounts(self, account_ids: List[str]) -> Dict[str, Optional[AccountData]]:
+        """Get several accounts at once (batched into one bulk request)"""
+        unique_ids = list(dict.fromkeys(account_ids))
+        accounts = await asyncio.gather(*(self.get_account(account_id) for account_id in unique_ids))
+        return dict(zip(unique_ids, accounts))
+    
     async def check_module_permission(self, account_id: str, module: str = "StockTech") -> ModulePermission:
         """Check if account has permission to use module"""
         try:
             params = {"module": module}
-            data = await self._make_request("GET", f"/api/internal/accounts/{account_id}/permissions", params=params)
+            data = await self._cached(
+                ("permission", account_id, module),
+                lambda: self._make_request("GET", f"/api/internal/accounts/{account_id}/permissions", params=params),
+                settings.avadmin_cache_permission_ttl,
+                tags=(f"account:{account_id}",)
+            )
             return ModulePermission(**data) if data else ModulePermission(
                 account_id=account_id,
                 module=module,
@@ -199,14 +377,82 @@ class AvAdminClient:
             )
     
     async def increment_usage_counter(self, account_id: str, counter_type: str) -> bool:
-        """Increment usage counter (products, transactions, etc.)"""
+        """
+        Increment usage counter (products, transactions, etc.)
+        Prefer services.usage.record_usage(), which batches and survives restarts
+        """
         try:
             await self._make_request("POST", f"/api/internal/accounts/{account_id}/usage/{counter_type}")
+            # Cached limits now lag the counter
+            await self.cache.invalidate(keys=[("account", account_id)])
             return True
         except Exception as e:
             logger.error(f"Failed to increment {counter_type} counter for account {account_id}: {str(e)}")
             return False
     
+    async def report_usage(self, deltas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Report aggregated usage deltas ({account_id, counter_type, delta})
+        Single attempt per request, so nothing is applied twice; returns the
+        deltas that were provably not delivered (safe to re-queue)
+        """
+        try:
+            data = await self._make_request("POST", "/api/internal/usage/batch", data={"deltas": deltas}, max_attempts=1)
+        except (CircuitOpenError, RequestNotSentError):
+            return deltas
+        except Exception as e:
+            logger.error(f"Usage report failed, dropping {len(deltas)} deltas: {str(e)}")
+            usage_deltas_dropped.inc(len(deltas))
+            return []
+        
+        if data is not None:
+            usage_deltas_reported.inc(len(deltas))
+            await self.cache.invalidate(keys=[("account", item["account_id"]) for item in deltas])
+            return []
+        
+        # No bulk endpoint: the per-account endpoint increments by one per call
+        undelivered = []
+        for item in deltas:
+            remaining = await self._report_increments(item)
+            if remaining:
+                undelivered.append({**item, "delta": remaining})
+        return undelivered
+    
+    async def _report_increments(self, item: Dict[str, Any]) -> int:
+        """
+        Send one delta as single increments; returns the part that was provably
+        not sent (re-queue it). Unsendable parts are counted as dropped
+        """
+        account_id, counter_type, delta = item["account_id"], item["counter_type"], item["delta"]
+        if delta <= 0:
+            logger.error(f"Cannot report a {counter_type} delta of {delta} for {account_id} one increment at a time")
+            usage_deltas_dropped.inc()
+            return 0
+        
+        sent = 0
+        try:
+            for sent in range(delta):
+                result = await self._make_request(
+                    "POST", f"/api/internal/accounts/{account_id}/usage/{counter_type}", max_attempts=1
+                )
+                if result is None:
+                    # 404/405: unknown account or endpoint, retrying won't help
+                    logger.error(f"Usage endpoint rejected {counter_type} for {account_id}, dropping {delta - sent}")
+                    usage_deltas_dropped.inc()
+                    return 0
+            sent = delta
+            usage_deltas_reported.inc()
+            return 0
+        except (CircuitOpenError, RequestNotSentError):
+            return delta - sent
+        except Exception as e:
+            logger.error(f"Usage report failed for {account_id}, dropping {delta - sent}: {str(e)}")
+            usage_deltas_dropped.inc()
+            return 0
+        finally:
+            if sent:
+                await self.cache.invalidate(keys=[("account", account_id)])
+    
     # ==========================================
     # VALIDATION METHODS
     # ==========================================
@@ -225,14 +471,22 @@ class AvAdminClient:
             logger.error(f"Failed to validate user access {user_id}: {str(e)}")
             return False
     
+    async def get_revocations(self) -> Optional[Dict[str, Any]]:
+        """Revoked token ids and per-user revocation times (None if unavailable)"""
+        try:
+            return await self._make_request("GET", "/api/internal/auth/revocations")
+        except Exception as e:
+            logger.error(f"Failed to fetch token revocations: {str(e)}")
+            return None
+    
     # ==========================================
     # HEALTH CHECK
     # ==========================================
     
-    async def health_check(self) -> bool:
-        """Check if AvAdmin service is healthy"""
+    async def health_check(self, budget: Optional[float] = None) -> bool:
+        """Check if AvAdmin service is healthy (single attempt)"""
         try:
-            data = await self._make_request("GET", "/api/internal/health")
+            data = await self._make_request("GET", "/api/internal/health", budget=budget, max_attempts=1)
             return data.get("status") == "healthy" if data else False
         except Exception as e:
             logger.error(f"AvAdmin health check failed: {str(e)}")
@@ -262,19 +516,22 @@ async def validate_user_module_access(user_id: str, module: str = "StockTech") -
     return await avadmin_client.validate_user_access(user_id, module)
 
 async def can_create_product(account_id: str) -> bool:
-    """Check if account can create more products"""
-    account = await get_account_data(account_id)
-    if not account:
-        return False
+    """
+    Check if account can create more products
+    Advisory only; hold a services.quota.quota_ledger lease around the create
+    """
+    from ..services.quota import QuotaError, quota_ledger
     
-    limits = account.limits
-    return limits.current_products < limits.max_products
+    try:
+        return await quota_ledger.remaining(account_id, "products") > 0
+    except QuotaError:
+        return False
 
 async def can_create_transaction(account_id: str) -> bool:
-    """Check if account can create more transactions"""
-    account = await get_account_data(account_id)
-    if not account:
-        return False
+    """Check if account can create more transactions (see can_create_product)"""
+    from ..services.quota import QuotaError, quota_ledger
     
-    limits = account.limits
-    return limits.current_transactions < limits.max_transactions
\ No newline at end of file
+    try:
+        return await quota_ledger.remaining(account_id, "transactions") > 0
+    except QuotaError:
+        return False
\ No newline at end of file
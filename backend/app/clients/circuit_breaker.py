@@ -0,0 +1,75 @@
+# ========================================
+# STOCKTECH - Circuit Breaker
+# ========================================
+
+import time
+from typing import Optional
+
+from ..core.logger import logger
+from ..core.metrics import circuit_breaker_rejections, circuit_breaker_state
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values for stocktech_circuit_breaker_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    until `recovery_timeout` passes; then lets one probe through (half-open)
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        circuit_breaker_state.labels(name).set(STATE_VALUES[CLOSED])
+    
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless this call may go through"""
+        if self.state == CLOSED:
+            return
+        
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now - self._opened_at < self.recovery_timeout:
+                self._reject()
+            self._set_state(HALF_OPEN)
+        
+        # Half-open: a single probe at a time (a stuck probe is replaced after recovery_timeout)
+        if self._probe_started_at is not None and now - self._probe_started_at < self.recovery_timeout:
+            self._reject()
+        self._probe_started_at = now
+    
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probe_started_at = None
+        if self.state != CLOSED:
+            logger.info(f"Circuit '{self.name}' closed")
+            self._set_state(CLOSED)
+    
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_started_at = None
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures")
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+    
+    def _reject(self) -> None:
+        circuit_breaker_rejections.labels(self.name).inc()
+        raise CircuitOpenError(f"Circuit '{self.name}' is open, failing fast")
+    
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        circuit_breaker_state.labels(self.name).set(STATE_VALUES[state])
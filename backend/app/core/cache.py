@@ -0,0 +1,65 @@
+# ========================================
+# STOCKTECH - In-Process Caches
+# ========================================
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Bounded in-process cache with per-entry expiry
+    Evicts least recently used entries once max_entries is reached
+    `on_evict(key)` runs when an entry expires or is evicted (not on delete/clear)
+    """
+    
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        on_evict: Optional[Callable[[Hashable], None]] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value or `default` if missing/expired"""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            if self.on_evict is not None:
+                self.on_evict(key)
+            return default
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store value (optionally overriding the default TTL)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+    
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
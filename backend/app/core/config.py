@@ -5,7 +5,7 @@
 import os
 from typing import Optional, List
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import AliasChoices, Field
 
 class Settings(BaseSettings):
     """Application settings for StockTech"""
@@ -25,6 +25,30 @@ class Settings(BaseSettings):
     database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
     database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
     database_pool_timeout: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")
+    database_pool_pre_ping: bool = Field(default=True, env="DATABASE_POOL_PRE_PING")
+    
+    # Adaptive pools: skip pre-ping for recently used connections, size the
+    # overflow ceiling from observed demand and the server's max_connections
+    database_pool_adaptive: bool = Field(default=False, env="DATABASE_POOL_ADAPTIVE")
+    database_pool_ping_skip_seconds: float = Field(default=10.0, env="DATABASE_POOL_PING_SKIP_SECONDS")
+    database_pool_sizing_interval_seconds: float = Field(default=30.0, env="DATABASE_POOL_SIZING_INTERVAL_SECONDS")
+    database_pool_headroom: float = Field(default=1.25, env="DATABASE_POOL_HEADROOM")  # x peak demand
+    database_pool_budget_share: float = Field(default=0.8, env="DATABASE_POOL_BUDGET_SHARE")  # Of max_connections
+    
+    # Statement reuse: compiled SQL per engine, asyncpg prepared statements per connection
+    database_query_cache_size: int = Field(default=1200, env="DATABASE_QUERY_CACHE_SIZE")
+    database_prepared_statement_cache_size: int = Field(default=256, env="DATABASE_PREPARED_STATEMENT_CACHE_SIZE")
+    database_pgbouncer_mode: str = Field(default="off", env="DATABASE_PGBOUNCER_MODE")  # off | transaction | prepared
+    
+    # Read replica (catalog and other read-only sessions; unset = primary only)
+    database_replica_url: Optional[str] = Field(
+        default=None,
+        validation_alias=AliasChoices("STOCKTECH_DATABASE_REPLICA_URL", "DATABASE_REPLICA_URL")
+    )
+    database_replica_pool_size: int = Field(default=20, env="DATABASE_REPLICA_POOL_SIZE")
+    database_replica_max_overflow: int = Field(default=10, env="DATABASE_REPLICA_MAX_OVERFLOW")
+    database_replica_max_lag_seconds: float = Field(default=5.0, env="DATABASE_REPLICA_MAX_LAG_SECONDS")  # Else primary
+    read_your_writes_window_seconds: float = Field(default=10.0, env="READ_YOUR_WRITES_WINDOW_SECONDS")
     
     # ========================================
     # REDIS CONFIGURATION
@@ -33,6 +57,22 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     redis_password: Optional[str] = Field(default=None, env="REDIS_PASSWORD")
     
+    # ========================================
+    # ENGAGEMENT COUNTERS (write-behind)
+    # ========================================
+    
+    counter_buffer_backend: str = Field(default="memory", env="COUNTER_BUFFER_BACKEND")  # memory | redis
+    counter_flush_interval_seconds: float = Field(default=2.0, env="COUNTER_FLUSH_INTERVAL_SECONDS")
+    counter_flush_max_pending: int = Field(default=5000, env="COUNTER_FLUSH_MAX_PENDING")  # Max increments at risk
+    counter_flush_batch_size: int = Field(default=1000, env="COUNTER_FLUSH_BATCH_SIZE")  # Rows per UPDATE
+    
+    # ========================================
+    # ACCOUNT QUOTAS (local ledger)
+    # ========================================
+    
+    quota_usage_ttl_seconds: float = Field(default=60.0, env="QUOTA_USAGE_TTL_SECONDS")  # Recount interval
+    quota_lease_ttl_seconds: float = Field(default=30.0, env="QUOTA_LEASE_TTL_SECONDS")  # Abandoned creates
+    
     # ========================================
     # JWT & SECURITY
     # ========================================
@@ -43,6 +83,11 @@ class Settings(BaseSettings):
     )
     jwt_expire_days: int = Field(default=7, env="JWT_EXPIRE_DAYS")
     jwt_algorithm: str = Field(default="HS256", env="JWT_ALGORITHM")
+    jwt_claims_cache_max_entries: int = Field(default=10000, env="JWT_CLAIMS_CACHE_MAX_ENTRIES")
+    jwt_revocation_refresh_seconds: float = Field(default=30.0, env="JWT_REVOCATION_REFRESH_SECONDS")
+    jwt_revocation_retry_seconds: float = Field(default=2.0, env="JWT_REVOCATION_RETRY_SECONDS")  # After a failed load
+    jwt_revocation_max_stale_seconds: float = Field(default=300.0, env="JWT_REVOCATION_MAX_STALE_SECONDS")  # Then 503
+    admin_roles: List[str] = Field(default=["super_admin"], env="ADMIN_ROLES")  # Token roles allowed marketplace-wide tools
     
     # ========================================
     # WHATSAPP MARKETPLACE INTEGRATION
@@ -63,6 +108,41 @@ class Settings(BaseSettings):
         description="AvAdmin backend URL for inter-module communication"
     )
     
+    # Pooled HTTP client (one per worker, opened in the app lifespan)
+    avadmin_timeout: float = Field(default=10.0, env="AVADMIN_TIMEOUT")
+    avadmin_connect_timeout: float = Field(default=3.0, env="AVADMIN_CONNECT_TIMEOUT")
+    avadmin_max_connections: int = Field(default=100, env="AVADMIN_MAX_CONNECTIONS")
+    avadmin_max_keepalive_connections: int = Field(default=20, env="AVADMIN_MAX_KEEPALIVE_CONNECTIONS")
+    avadmin_keepalive_expiry: float = Field(default=30.0, env="AVADMIN_KEEPALIVE_EXPIRY")
+    avadmin_http2: bool = Field(default=False, env="AVADMIN_HTTP2")  # Needs httpx[http2]
+    
+    # Retries share one deadline budget per call; the breaker fails fast during outages
+    avadmin_max_retries: int = Field(default=3, env="AVADMIN_MAX_RETRIES")
+    avadmin_request_budget: float = Field(default=5.0, env="AVADMIN_REQUEST_BUDGET")  # Seconds, all attempts
+    avadmin_backoff_base: float = Field(default=0.1, env="AVADMIN_BACKOFF_BASE")
+    avadmin_backoff_max: float = Field(default=2.0, env="AVADMIN_BACKOFF_MAX")
+    avadmin_breaker_failure_threshold: int = Field(default=5, env="AVADMIN_BREAKER_FAILURE_THRESHOLD")
+    avadmin_breaker_recovery_timeout: float = Field(default=15.0, env="AVADMIN_BREAKER_RECOVERY_TIMEOUT")
+    
+    # Usage counters are reported in batches from the usage_deltas outbox
+    usage_flush_interval_seconds: float = Field(default=10.0, env="USAGE_FLUSH_INTERVAL_SECONDS")
+    usage_flush_max_pending: int = Field(default=1000, env="USAGE_FLUSH_MAX_PENDING")
+    usage_flush_batch_size: int = Field(default=5000, env="USAGE_FLUSH_BATCH_SIZE")
+    
+    # Lookup cache (users, accounts and permissions change rarely)
+    avadmin_cache_enabled: bool = Field(default=True, env="AVADMIN_CACHE_ENABLED")
+    avadmin_cache_max_entries: int = Field(default=10000, env="AVADMIN_CACHE_MAX_ENTRIES")
+    avadmin_cache_user_ttl: float = Field(default=300.0, env="AVADMIN_CACHE_USER_TTL")
+    avadmin_cache_account_ttl: float = Field(default=120.0, env="AVADMIN_CACHE_ACCOUNT_TTL")
+    avadmin_cache_permission_ttl: float = Field(default=60.0, env="AVADMIN_CACHE_PERMISSION_TTL")
+    avadmin_cache_negative_ttl: float = Field(default=15.0, env="AVADMIN_CACHE_NEGATIVE_TTL")  # 404s
+    avadmin_cache_redis: bool = Field(default=False, env="AVADMIN_CACHE_REDIS")  # Share across workers
+    
+    # Batched user/account lookups (one bulk request per event-loop tick)
+    avadmin_bulk_lookups: bool = Field(default=True, env="AVADMIN_BULK_LOOKUPS")
+    avadmin_batch_max_size: int = Field(default=100, env="AVADMIN_BATCH_MAX_SIZE")
+    avadmin_batch_fallback_concurrency: int = Field(default=10, env="AVADMIN_BATCH_FALLBACK_CONCURRENCY")
+    
     # ========================================
     # FILE UPLOAD SETTINGS
     # ========================================
@@ -80,6 +160,17 @@ class Settings(BaseSettings):
     image_quality: int = Field(default=85, env="IMAGE_QUALITY")
     thumbnail_size: int = Field(default=300, env="THUMBNAIL_SIZE")
     
+    # Bulk product imports (CSV/XLSX, parsed in chunks, merged via COPY + ON CONFLICT)
+    import_max_file_size: int = Field(default=52428800, env="IMPORT_MAX_FILE_SIZE")  # 50MB
+    import_max_rows: int = Field(default=100000, env="IMPORT_MAX_ROWS")
+    import_chunk_rows: int = Field(default=5000, env="IMPORT_CHUNK_ROWS")  # Rows per COPY/merge transaction
+    import_workers: int = Field(default=2, env="IMPORT_WORKERS")  # Validation processes per app worker
+    
+    # Catalog exports (streamed from a server-side cursor; large ones run as background jobs)
+    export_fetch_rows: int = Field(default=2000, env="EXPORT_FETCH_ROWS")  # Rows per cursor fetch
+    export_inline_max_rows: int = Field(default=50000, env="EXPORT_INLINE_MAX_ROWS")
+    export_retention_hours: int = Field(default=24, env="EXPORT_RETENTION_HOURS")  # Finished job files
+    
     # ========================================
     # APPLICATION SETTINGS
     # ========================================
@@ -89,6 +180,20 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", env="ENVIRONMENT")
     debug: bool = Field(default=True, env="DEBUG")
     
+    # Serve before database/AvAdmin checks finish (autoscaling); /readyz gates traffic
+    fast_start: bool = Field(default=False, env="FAST_START")
+    startup_report: bool = Field(default=True, env="STARTUP_REPORT")
+    
+    # ========================================
+    # HEALTH PROBES
+    # ========================================
+    
+    health_probe_interval_seconds: float = Field(default=5.0, env="HEALTH_PROBE_INTERVAL_SECONDS")
+    health_probe_timeout_seconds: float = Field(default=2.0, env="HEALTH_PROBE_TIMEOUT_SECONDS")
+    health_stale_after_seconds: float = Field(default=30.0, env="HEALTH_STALE_AFTER_SECONDS")
+    # AvAdmin is probed and reported, but only these dependencies gate /readyz
+    health_critical_dependencies: List[str] = Field(default=["database"], env="HEALTH_CRITICAL_DEPENDENCIES")
+    
     # ========================================
     # CORS SETTINGS
     # ========================================
@@ -120,6 +225,24 @@ class Settings(BaseSettings):
     
     # Search settings
     search_min_chars: int = Field(default=3, env="SEARCH_MIN_CHARS")
+    search_similarity_threshold: float = Field(default=0.3, env="SEARCH_SIMILARITY_THRESHOLD")  # pg_trgm
+    search_suggestion_limit: int = Field(default=5, env="SEARCH_SUGGESTION_LIMIT")
+    
+    # Catalog facets (sidebar counts)
+    facet_price_bands: List[int] = Field(
+        default=[0, 100, 500, 1000, 2500, 5000, 10000],
+        env="FACET_PRICE_BANDS"
+    )  # Band lower bounds in BRL
+    facet_cache_ttl_seconds: int = Field(default=30, env="FACET_CACHE_TTL_SECONDS")
+    facet_cache_max_entries: int = Field(default=2048, env="FACET_CACHE_MAX_ENTRIES")
+    
+    # HTTP response cache (catalog list/detail/search, ETag + 304)
+    response_cache_ttl_seconds: int = Field(default=60, env="RESPONSE_CACHE_TTL_SECONDS")
+    response_cache_max_entries: int = Field(default=5000, env="RESPONSE_CACHE_MAX_ENTRIES")
+    
+    # Category/Brand product_count maintenance (trigger outbox)
+    product_count_flush_interval_seconds: int = Field(default=5, env="PRODUCT_COUNT_FLUSH_INTERVAL_SECONDS")
+    product_count_flush_batch_size: int = Field(default=10000, env="PRODUCT_COUNT_FLUSH_BATCH_SIZE")
     
     # ========================================
     # VALIDATION
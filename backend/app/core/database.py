@@ -2,20 +2,66 @@
 # STOCKTECH - Database Configuration (Local PostgreSQL)
 # ========================================
 
-from typing import AsyncGenerator
+import time
+import uuid
+from typing import AsyncGenerator, Iterable, Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from .cache import TTLCache
 from .config import settings
+from .metrics import database_compiled_cache, database_read_routes, database_replica_lag
+from .pool import InstrumentedPool, PoolSizer, instrument_pool
+
+def statement_cache_args(pgbouncer_mode: str, cache_size: int) -> dict:
+    """
+    asyncpg connect_args for prepared-statement reuse
+    off/prepared: keep `cache_size` prepared statements per connection
+    (prepared = PgBouncer >= 1.21 with max_prepared_statements, which tracks them)
+    transaction: older PgBouncer in transaction mode; never reuse a statement name
+    """
+    if pgbouncer_mode == "transaction":
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": cache_size}
+
+def _create_engine(url: str, role: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    """Instrumented engine; pre-ping runs in the pool listeners (see core.pool)"""
+    created = create_async_engine(
+        url,
+        echo=settings.debug,  # Log SQL queries in debug mode
+        poolclass=InstrumentedPool,
+        pool_logging_name=role,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_pre_ping=False,  # Validated on checkout by instrument_pool
+        query_cache_size=settings.database_query_cache_size,
+        connect_args=statement_cache_args(
+            settings.database_pgbouncer_mode,
+            settings.database_prepared_statement_cache_size
+        ),
+    )
+    instrument_pool(
+        created,
+        role,
+        pre_ping=settings.database_pool_pre_ping,
+        ping_skip_seconds=settings.database_pool_ping_skip_seconds if settings.database_pool_adaptive else 0.0
+    )
+    return created
 
 # Create async engine with local PostgreSQL
-engine: AsyncEngine = create_async_engine(
+engine: AsyncEngine = _create_engine(
     settings.database_url,
-    echo=settings.debug,  # Log SQL queries in debug mode
+    "primary",
     pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    pool_timeout=settings.database_pool_timeout,
-    pool_pre_ping=True,  # Validate connections before use
+    max_overflow=settings.database_max_overflow
 )
 
 # Create async session factory
@@ -27,6 +73,144 @@ AsyncSessionFactory = sessionmaker(
     autocommit=False
 )
 
+# ========================================
+# READ REPLICA
+# ========================================
+
+# Read-only engine; without a configured replica reads share the primary pool
+if settings.database_replica_url:
+    replica_engine: AsyncEngine = _create_engine(
+        settings.database_replica_url,
+        "replica",
+        pool_size=settings.database_replica_pool_size,
+        max_overflow=settings.database_replica_max_overflow
+    )
+else:
+    replica_engine = engine
+
+ReadSessionFactory = sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False
+)
+
+# Model attributes naming the account a written row belongs to
+WRITER_ACCOUNT_ATTRIBUTES = ("account_id", "seller_account_id")
+
+# Replay lag: 0 when every received WAL record is applied (idle primary), but
+# only while the WAL receiver is streaming - a disconnected standby has
+# receive = replay too. Otherwise lag is the age of the last
+# replayed transaction, NULL when unknown (pg_stat_wal_receiver.status needs
+# pg_read_all_stats; without it this falls back to the replay age as well)
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+         AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8
+END
+"""
+
+class ReplicaRouter:
+    """
+    Decides per read-only session whether the replica may serve it
+    Falls back to the primary when the replica is unknown/stale/lagging,
+    or when the requesting account committed a write in the last `window` seconds
+    """
+    
+    def __init__(self, max_lag: float, window: float, stale_after: float):
+        self.max_lag = max_lag
+        self.stale_after = stale_after
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+        self._recent_writes = TTLCache(ttl_seconds=window, max_entries=10000)
+    
+    @property
+    def enabled(self) -> bool:
+        return replica_engine is not engine
+    
+    def record_lag(self, lag: Optional[float]) -> None:
+        """Latest probe result (None = replica unreachable)"""
+        self.lag = lag
+        self.checked_at = time.monotonic()
+        if lag is not None:
+            database_replica_lag.set(lag)
+    
+    def note_writes(self, account_ids: Iterable[str]) -> None:
+        for account_id in account_ids:
+            self._recent_writes.set(account_id, True)
+    
+    def route(self, account_id: Optional[str] = None, strong: bool = False) -> str:
+        """Reason for sending this read to the primary, or "replica" """
+        if not self.enabled:
+            return "no_replica"
+        if strong:
+            return "strong"
+        if self.lag is None or time.monotonic() - self.checked_at > self.stale_after:
+            return "replica_unknown"
+        if self.lag > self.max_lag:
+            return "replica_lag"
+        if account_id and self._recent_writes.get(account_id):
+            return "recent_write"
+        return "replica"
+    
+    def session(self, account_id: Optional[str] = None, strong: bool = False) -> AsyncSession:
+        """New read-only session on the replica or, if unsafe, the primary"""
+        reason = self.route(account_id, strong)
+        target = "replica" if reason == "replica" else "primary"
+        database_read_routes.labels(target, reason).inc()
+        return ReadSessionFactory() if target == "replica" else AsyncSessionFactory()
+
+# Global router instance
+replica_router = ReplicaRouter(
+    max_lag=settings.database_replica_max_lag_seconds,
+    window=settings.read_your_writes_window_seconds,
+    stale_after=settings.health_stale_after_seconds
+)
+
+# Global pool sizer instance (runs only with DATABASE_POOL_ADAPTIVE)
+pool_sizer = PoolSizer(
+    {"primary": engine, "replica": replica_engine} if replica_router.enabled else {"primary": engine},
+    interval=settings.database_pool_sizing_interval_seconds,
+    headroom=settings.database_pool_headroom,
+    budget_share=settings.database_pool_budget_share
+)
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_compiled_cache(conn, cursor, statement, parameters, context, executemany):
+    # cache_hit / cache_miss / caching_disabled / no_cache_key / no_dialect_support
+    if context is not None:
+        database_compiled_cache.labels(context.cache_hit.name.lower()).inc()
+
+def note_account_write(session, account_id) -> None:
+    """
+    Register a write made with Core/raw SQL for read-your-writes routing
+    Applied when `session` commits
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault("written_accounts", set()).add(str(account_id))
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_accounts(session, flush_context):
+    written = session.info.setdefault("written_accounts", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        for attribute in WRITER_ACCOUNT_ATTRIBUTES:
+            value = vars(obj).get(attribute)  # Loaded state only, never triggers a lazy load
+            if value is not None:
+                written.add(str(value))
+
+@event.listens_for(Session, "after_commit")
+def _note_written_accounts(session):
+    written = session.info.pop("written_accounts", None)
+    if written:
+        replica_router.note_writes(written)
+
+@event.listens_for(Session, "after_rollback")
+def _drop_written_accounts(session):
+    session.info.pop("written_accounts", None)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Database session dependency for FastAPI
@@ -46,6 +230,32 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+def _request_account(request: Request) -> Optional[str]:
+    """Account of the bearer token, if any (reads only; auth is enforced elsewhere)"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    
+    from .security import InvalidTokenError, decode_access_token
+    try:
+        return decode_access_token(token).account_id
+    except InvalidTokenError:
+        return None
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session dependency: replica when safe, primary otherwise
+    Sends the caller to the primary right after its own writes (read-your-writes);
+    `X-Consistency: strong` forces the primary
+    """
+    strong = request.headers.get("x-consistency", "").lower() == "strong"
+    async with replica_router.session(_request_account(request), strong) as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
 async def init_database():
     """
     Initialize database connection and test connectivity
@@ -79,13 +289,22 @@ async def close_database():
     Called during application shutdown
     """
     await engine.dispose()
+    if replica_router.enabled:
+        await replica_engine.dispose()
     print("🔌 Disconnected from StockTech PostgreSQL")
 
 # Export for convenience
 __all__ = [
     "engine",
     "AsyncSessionFactory", 
+    "replica_engine",
+    "ReadSessionFactory",
+    "replica_router",
+    "pool_sizer",
     "get_db",
+    "get_read_db",
+    "statement_cache_args",
+    "note_account_write",
     "init_database",
     "close_database"
 ]
\ No newline at end of file
@@ -0,0 +1,61 @@
+# ========================================
+# STOCKTECH - Money Formatting (BRL)
+# ========================================
+
+from typing import Dict, Iterable, List
+
+_COLUMN_SEPARATOR = "\x00"
+
+# Catalog prices repeat a lot (1.999,90...), so formatted strings are cached.
+# A cold cache is slower than formatting directly (~0.7x per value, ~0.9x per
+# column on a 100-price page, see benchmarks/bench_money_format.py); repeat
+# pages are ~8-13x faster. Zeros are never cached: Decimal("-0") == 0 would
+# share a slot with 0, but formats as "R$ -0,00".
+_CACHE_MAX_ENTRIES = 16384
+_brl_cache: Dict[object, str] = {}
+
+def _remember(value, text: str) -> None:
+    if len(_brl_cache) >= _CACHE_MAX_ENTRIES:
+        _brl_cache.clear()
+    _brl_cache[value] = text
+
+def _swap_separators(text: str) -> str:
+    """Swap US separators for BRL ones: 8,500.00 -> 8.500,00"""
+    return text.replace(",", "X").replace(".", ",").replace("X", ".")
+
+def format_brl(value) -> str:
+    """Return formatted price: R$ 8.500,00"""
+    text = _brl_cache.get(value) if value else None
+    if text is None:
+        text = "R$ " + _swap_separators(f"{value:,.2f}")
+        if value:
+            _remember(value, text)
+    return text
+
+def format_brl_column(values: Iterable) -> List[str]:
+    """
+    Format a whole column of prices
+    Cache misses have their separators swapped in one pass over the joined column
+    """
+    formatted = []
+    misses = []
+    for value in values:
+        text = _brl_cache.get(value) if value else None
+        if text is None:
+            misses.append((len(formatted), value))
+        formatted.append(text)
+    
+    if misses:
+        joined = _COLUMN_SEPARATOR.join(f"{value:,.2f}" for _, value in misses)
+        parts = _swap_separators(joined).split(_COLUMN_SEPARATOR)
+        for (index, value), part in zip(misses, parts):
+            text = "R$ " + part
+            formatted[index] = text
+            if value:
+                _remember(value, text)
+    
+    return formatted
+
+def clear_format_cache() -> None:
+    """Forget cached formatted values"""
+    _brl_cache.clear()
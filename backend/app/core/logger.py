@@ -0,0 +1,17 @@
+# ========================================
+# STOCKTECH - Logging
+# ========================================
+
+import logging
+
+from .config import settings
+
+# Shared application logger (library loggers such as httpx keep their defaults)
+logger = logging.getLogger("stocktech")
+
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    logger.propagate = False
@@ -0,0 +1,221 @@
+# ========================================
+# STOCKTECH - Prometheus Metrics
+# ========================================
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# ==========================================
+# ENGAGEMENT COUNTERS (write-behind buffer)
+# ==========================================
+
+counter_buffer_pending = Gauge(
+    "stocktech_counter_buffer_pending_increments",
+    "View/contact/favorite increments buffered and not yet written to PostgreSQL"
+)
+
+counter_buffer_flush_lag = Gauge(
+    "stocktech_counter_buffer_flush_lag_seconds",
+    "Age of the oldest buffered increment (0 when the buffer is empty)"
+)
+
+counter_buffer_flushed_rows = Counter(
+    "stocktech_counter_buffer_flushed_rows_total",
+    "Product rows updated by counter buffer flushes"
+)
+
+counter_buffer_flush_failures = Counter(
+    "stocktech_counter_buffer_flush_failures_total",
+    "Counter buffer flushes that failed and were retried"
+)
+
+# ==========================================
+# AVADMIN CLIENT
+# ==========================================
+
+avadmin_cache_requests = Counter(
+    "stocktech_avadmin_cache_requests_total",
+    "AvAdmin lookups by cache outcome (hit, redis_hit, coalesced, miss)",
+    ["lookup", "result"]
+)
+
+avadmin_request_retries = Counter(
+    "stocktech_avadmin_request_retries_total",
+    "AvAdmin request attempts retried after a timeout, connection error or 5xx"
+)
+
+usage_deltas_reported = Counter(
+    "stocktech_usage_deltas_reported_total",
+    "Aggregated usage deltas delivered to AvAdmin"
+)
+
+usage_deltas_dropped = Counter(
+    "stocktech_usage_deltas_dropped_total",
+    "Usage deltas dropped after an ambiguous delivery failure (at-most-once)"
+)
+
+usage_outbox_pending = Gauge(
+    "stocktech_usage_outbox_pending",
+    "Usage increments recorded by this worker since its last flush"
+)
+
+auth_avadmin_fallbacks = Counter(
+    "stocktech_auth_avadmin_fallbacks_total",
+    "Authorization checks answered by AvAdmin instead of token claims",
+    ["reason"]
+)
+
+auth_revocation_list_age = Gauge(
+    "stocktech_auth_revocation_list_age_seconds",
+    "Time since the token revocation list last loaded from AvAdmin (since startup if never)"
+)
+
+# ==========================================
+# CIRCUIT BREAKERS
+# ==========================================
+
+circuit_breaker_state = Gauge(
+    "stocktech_circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["name"]
+)
+
+circuit_breaker_rejections = Counter(
+    "stocktech_circuit_breaker_rejections_total",
+    "Calls failed fast because the circuit was open",
+    ["name"]
+)
+
+# ==========================================
+# HEALTH PROBES
+# ==========================================
+
+dependency_probe_duration = Histogram(
+    "stocktech_dependency_probe_duration_seconds",
+    "Latency of background health probes per dependency",
+    ["dependency"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+dependency_up = Gauge(
+    "stocktech_dependency_up",
+    "Whether the latest health probe of a dependency succeeded",
+    ["dependency"]
+)
+
+# ==========================================
+# READ REPLICA ROUTING
+# ==========================================
+
+database_replica_lag = Gauge(
+    "stocktech_database_replica_lag_seconds",
+    "Replay lag of the read replica at the latest probe"
+)
+
+database_read_routes = Counter(
+    "stocktech_database_read_routes_total",
+    "Read-only sessions by target and reason",
+    ["target", "reason"]
+)
+
+# ==========================================
+# DATABASE CONNECTION POOLS
+# ==========================================
+
+database_pool_checkout_seconds = Histogram(
+    "stocktech_database_pool_checkout_seconds",
+    "Time to obtain a pooled connection (queue wait, connect and pre-ping)",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0, 30.0)
+)
+
+database_pool_pre_ping_seconds = Histogram(
+    "stocktech_database_pool_pre_ping_seconds",
+    "Duration of connection pre-pings on checkout",
+    ["pool"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1.0)
+)
+
+database_pool_pre_pings_skipped = Counter(
+    "stocktech_database_pool_pre_pings_skipped_total",
+    "Checkouts that skipped the pre-ping (fresh or recently used connection)",
+    ["pool"]
+)
+
+database_pool_in_use = Gauge(
+    "stocktech_database_pool_in_use_connections",
+    "Connections currently checked out",
+    ["pool"]
+)
+
+database_pool_overflow = Gauge(
+    "stocktech_database_pool_overflow_connections",
+    "Connections open beyond pool_size",
+    ["pool"]
+)
+
+database_pool_connections_limit = Gauge(
+    "stocktech_database_pool_connections_limit",
+    "pool_size plus the current overflow ceiling",
+    ["pool"]
+)
+
+database_pool_demand_peak = Gauge(
+    "stocktech_database_pool_demand_peak",
+    "Peak connections in use plus waiters over the last sizing interval",
+    ["pool"]
+)
+
+database_pool_timeouts = Counter(
+    "stocktech_database_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["pool"]
+)
+
+database_pool_invalidations = Counter(
+    "stocktech_database_pool_invalidations_total",
+    "Pooled connections invalidated (failed pre-ping, disconnects)",
+    ["pool"]
+)
+
+database_compiled_cache = Counter(
+    "stocktech_database_compiled_cache_total",
+    "Statements executed by SQLAlchemy compiled-cache outcome",
+    ["result"]
+)
+
+# ==========================================
+# PRODUCT IMPORTS
+# ==========================================
+
+product_import_rows = Counter(
+    "stocktech_product_import_rows_total",
+    "Spreadsheet rows imported, by outcome",
+    ["result"]  # inserted / updated / error
+)
+
+product_import_stage_seconds = Histogram(
+    "stocktech_product_import_stage_seconds",
+    "Time per import chunk and stage (validate in the process pool, COPY + merge)",
+    ["stage"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# ==========================================
+# CATALOG EXPORTS
+# ==========================================
+
+product_exports = Counter(
+    "stocktech_product_exports_total",
+    "Catalog exports started",
+    ["mode"]  # inline (streamed response) / background (job file)
+)
+
+product_export_rows = Counter(
+    "stocktech_product_export_rows_total",
+    "Rows written by catalog exports",
+    ["format"]
+)
+
+def render_metrics() -> tuple:
+    """Return (body, content_type) for the /metrics endpoint"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,187 @@
+# ========================================
+# STOCKTECH - Connection Pool Instrumentation
+# ========================================
+
+import asyncio
+import math
+import os
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .metrics import (
+    database_pool_checkout_seconds,
+    database_pool_connections_limit,
+    database_pool_demand_peak,
+    database_pool_in_use,
+    database_pool_invalidations,
+    database_pool_overflow,
+    database_pool_pre_ping_seconds,
+    database_pool_pre_pings_skipped,
+    database_pool_timeouts,
+)
+
+# Connections from all StockTech workers on one server, by role
+POOL_BUDGET_SQL = """
+SELECT
+    current_setting('max_connections')::int
+        - current_setting('superuser_reserved_connections')::int AS max_connections,
+    count(*) FILTER (WHERE application_name NOT LIKE :prefix) AS others,
+    count(DISTINCT application_name) FILTER (WHERE application_name LIKE :prefix) AS workers
+FROM pg_stat_activity
+"""
+
+def application_name(role: str) -> str:
+    """
+    Per-worker application_name; lets the sizer count workers in pg_stat_activity
+    Evaluated per connection (see instrument_pool), so workers forked after a
+    preloaded import report their own pid
+    """
+    return f"stocktech-{role}:{os.getpid()}"
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times checkouts and tracks peak demand
+    (connections in use plus callers waiting for one)
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.role = self._orig_logging_name or "primary"
+        self.waiting = 0
+        self.peak_demand = 0
+    
+    def connect(self):
+        self.waiting += 1
+        self.peak_demand = max(self.peak_demand, self.checkedout() + self.waiting)
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            database_pool_timeouts.labels(self.role).inc()
+            raise
+        finally:
+            self.waiting -= 1
+            database_pool_checkout_seconds.labels(self.role).observe(time.perf_counter() - start)
+    
+    def take_peak_demand(self) -> int:
+        """Peak since the previous call (resets to current demand)"""
+        peak = self.peak_demand
+        self.peak_demand = self.checkedout() + self.waiting
+        return peak
+    
+    def connection_limit(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+    
+    def set_connection_limit(self, limit: int) -> None:
+        """Adjust the overflow ceiling; idle extras close as they are returned"""
+        if self._max_overflow == -1:
+            return  # Unbounded pool
+        self._max_overflow = max(limit - self.size(), 0)
+        database_pool_connections_limit.labels(self.role).set(self.connection_limit())
+
+def instrument_pool(engine: AsyncEngine, role: str, pre_ping: bool, ping_skip_seconds: float = 0.0) -> None:
+    """
+    Pool event listeners: application_name, in-use/overflow gauges, invalidations
+    and a timed pre-ping
+    Replaces the engine's own pool_pre_ping; connections used successfully within
+    `ping_skip_seconds` (adaptive mode) or just opened are not pinged
+    """
+    sync_engine = engine.sync_engine
+    
+    def update_gauges(returning: int = 0) -> None:
+        pool = sync_engine.pool
+        database_pool_in_use.labels(role).set(max(pool.checkedout() - returning, 0))
+        database_pool_overflow.labels(role).set(max(pool.overflow(), 0))
+    
+    @event.listens_for(sync_engine, "do_connect")
+    def on_do_connect(dialect, connection_record, cargs, cparams):
+        cparams["server_settings"] = {
+            **cparams.get("server_settings", {}),
+            "application_name": application_name(role),
+        }
+    
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["validated_at"] = time.monotonic()
+        connection_record.info["fresh"] = True
+    
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        info = connection_record.info
+        fresh = info.pop("fresh", False)
+        recently_used = time.monotonic() - info.get("validated_at", 0.0) <= ping_skip_seconds
+        
+        if pre_ping and (fresh or recently_used):
+            database_pool_pre_pings_skipped.labels(role).inc()
+        elif pre_ping:
+            start = time.perf_counter()
+            try:
+                sync_engine.dialect.do_ping(dbapi_connection)
+            except Exception as e:
+                raise exc.DisconnectionError(f"pre-ping failed: {e}")  # Pool reconnects and retries
+            finally:
+                database_pool_pre_ping_seconds.labels(role).observe(time.perf_counter() - start)
+            info["validated_at"] = time.monotonic()
+        update_gauges()
+    
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        if dbapi_connection is not None and ping_skip_seconds:
+            connection_record.info["validated_at"] = time.monotonic()
+        update_gauges(returning=1)  # Fires before the connection is back in the queue
+    
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        database_pool_invalidations.labels(role).inc()
+    
+    pool = sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        database_pool_connections_limit.labels(role).set(pool.connection_limit())
+
+class PoolSizer:
+    """
+    Adaptive mode: resizes each pool's connection limit every `interval` seconds
+    Target = peak demand x headroom, never below pool_size and never above this
+    worker's share of the server's max_connections (split across the StockTech
+    workers visible in pg_stat_activity)
+    """
+    
+    def __init__(self, engines: Dict[str, AsyncEngine], interval: float, headroom: float, budget_share: float):
+        self.engines = engines
+        self.interval = interval
+        self.headroom = headroom
+        self.budget_share = budget_share
+        self.last: Dict[str, Dict[str, Any]] = {}
+    
+    async def _budget(self, role: str, engine: AsyncEngine) -> int:
+        """Connections this worker may hold on the engine's server"""
+        async with engine.connect() as conn:
+            row = (await conn.execute(text(POOL_BUDGET_SQL), {"prefix": f"stocktech-{role}:%"})).one()
+        available = (row.max_connections - row.others) * self.budget_share
+        return max(int(available // max(row.workers, 1)), 1)
+    
+    async def resize(self, role: str, engine: AsyncEngine) -> None:
+        pool = engine.sync_engine.pool
+        if not isinstance(pool, InstrumentedPool):
+            return
+        
+        peak = pool.take_peak_demand()
+        database_pool_demand_peak.labels(role).set(peak)
+        budget = await self._budget(role, engine)
+        target = min(max(math.ceil(peak * self.headroom), pool.size()), budget)
+        pool.set_connection_limit(target)
+        self.last[role] = {"peak_demand": peak, "budget": budget, "limit": pool.connection_limit()}
+    
+    async def run(self) -> None:
+        """Background task: resize every pool on an interval"""
+        while True:
+            await asyncio.sleep(self.interval)
+            for role, engine in self.engines.items():
+                try:
+                    await self.resize(role, engine)
+                except Exception as e:
+                    print(f"⚠️  Pool sizing for {role} failed: {str(e)[:100]}")
@@ -0,0 +1,89 @@
+# ========================================
+# STOCKTECH - JWT Verification
+# ========================================
+
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import FrozenSet, Iterable, Optional
+
+from .cache import TTLCache
+from .config import settings
+
+class InvalidTokenError(Exception):
+    """Token is malformed, has a bad signature or has expired"""
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Verified access-token claims (tokens are issued by AvAdmin with the shared secret)"""
+    user_id: str
+    account_id: Optional[str]
+    role: Optional[str]
+    modules: Optional[FrozenSet[str]]  # None when the token embeds no permissions
+    jti: Optional[str]
+    issued_at: float
+    expires_at: float
+
+# Verified claims by token digest, so repeat requests skip the HMAC check
+_claims_cache = TTLCache(ttl_seconds=300, max_entries=settings.jwt_claims_cache_max_entries)
+
+def create_access_token(
+    user_id: str,
+    account_id: Optional[str] = None,
+    modules: Optional[Iterable[str]] = ("StockTech",),
+    role: Optional[str] = None,
+    expires_delta: Optional[timedelta] = None
+) -> str:
+    """Issue a token in AvAdmin's format (seeds, benchmarks and local tooling)"""
+    from jose import jwt
+    
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": str(user_id),
+        "iat": now,
+        "exp": now + (expires_delta or timedelta(days=settings.jwt_expire_days)),
+        "jti": uuid.uuid4().hex,
+    }
+    if account_id is not None:
+        payload["account_id"] = str(account_id)
+    if modules is not None:
+        payload["modules"] = list(modules)
+    if role is not None:
+        payload["role"] = role
+    return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+
+def decode_access_token(token: str) -> TokenClaims:
+    """Verify signature and expiry locally; raises InvalidTokenError"""
+    digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    claims = _claims_cache.get(digest)
+    if claims is not None:
+        if claims.expires_at <= time.time():
+            _claims_cache.delete(digest)
+            raise InvalidTokenError("Token has expired")
+        return claims
+    
+    # Imported on first use; python-jose pulls in the cryptography backend
+    from jose import JWTError, jwt
+    
+    try:
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError as e:
+        raise InvalidTokenError(str(e))
+    
+    if not payload.get("sub") or "exp" not in payload:
+        raise InvalidTokenError("Token is missing required claims")
+    
+    modules = payload.get("modules")
+    claims = TokenClaims(
+        user_id=str(payload["sub"]),
+        account_id=payload.get("account_id"),
+        role=payload.get("role"),
+        modules=frozenset(modules) if modules is not None else None,
+        jti=payload.get("jti"),
+        issued_at=float(payload.get("iat", 0)),
+        expires_at=float(payload["exp"])
+    )
+    _claims_cache.set(digest, claims, min(_claims_cache.ttl_seconds, claims.expires_at - time.time()))
+    return claims
@@ -0,0 +1,47 @@
+# ========================================
+# STOCKTECH - Startup Timing
+# ========================================
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+class StartupTimer:
+    """Wall time per startup phase (imports, init, deferred checks)"""
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready_at: Optional[float] = None
+        self.phases: List[Dict[str, Any]] = []
+    
+    @contextmanager
+    def phase(self, name: str, background: bool = False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "name": name,
+                "ms": round((time.perf_counter() - start) * 1000, 1),
+                "background": background,
+            })
+    
+    def mark_serving(self) -> None:
+        """Lifespan startup finished; the app accepts traffic from here"""
+        self.ready_at = time.perf_counter()
+    
+    def report(self) -> Dict[str, Any]:
+        serving_ms = None
+        if self.ready_at is not None:
+            serving_ms = round((self.ready_at - self.started_at) * 1000, 1)
+        return {"time_to_serve_ms": serving_ms, "phases": list(self.phases)}
+    
+    def print_report(self) -> None:
+        report = self.report()
+        print(f"⏱️  Serving after {report['time_to_serve_ms']} ms")
+        for phase in report["phases"]:
+            suffix = " (background)" if phase["background"] else ""
+            print(f"   {phase['name']:<24} {phase['ms']:>9.1f} ms{suffix}")
+
+# Global timer instance (created on first import, i.e. at the top of app.main)
+startup_timer = StartupTimer()
@@ -2,12 +2,51 @@
 # STOCKTECH - FastAPI Main Application
 # ========================================
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+import asyncio
 
-from .core.config import settings
-from .core.database import init_database, close_database
+from .core.startup import startup_timer
+
+with startup_timer.phase("import fastapi"):
+    from fastapi import FastAPI, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from contextlib import asynccontextmanager
+
+with startup_timer.phase("import core"):
+    from .core.config import settings
+    from .core.database import init_database, close_database, pool_sizer
+    from .core.metrics import render_metrics
+
+with startup_timer.phase("import routers"):
+    from .api import admin_router, catalog_router, inventory_router
+
+with startup_timer.phase("import services"):
+    from .services.counters import product_count_flush_loop
+    from .services.engagement import counter_buffer
+    from .services.usage import usage_reporter
+    from .services.health import health_prober
+    from .services.imports import product_importer
+    from .services.exports import product_exporter
+    from .services.serializers import json_response
+    from .clients.avadmin_client import avadmin_client
+
+async def deferred_startup_checks():
+    """Fast-start mode: connectivity checks run after the app starts serving"""
+    with startup_timer.phase("database check", background=True):
+        try:
+            await init_database()
+        except Exception:
+            pass  # Already reported; /readyz stays 503 until a probe passes
+    
+    with startup_timer.phase("first health probe", background=True):
+        await report_avadmin_probe()
+
+async def report_avadmin_probe():
+    """Run a probe round (seeds /readyz) and report AvAdmin connectivity"""
+    results = await health_prober.probe_all()
+    if results["avadmin"].healthy:
+        print("✅ AvAdmin communication OK")
+    else:
+        print(f"⚠️  AvAdmin communication failed: {results['avadmin'].error or 'unhealthy'}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,24 +59,71 @@ async def lifespan(app: FastAPI):
     print(f"🌍 Environment: {settings.environment}")
     print(f"🔗 AvAdmin API: {settings.avadmin_api_url}")
     
-    # Initialize database
-    await init_database()
+    checks_task = None
+    if settings.fast_start:
+        # Serve immediately; /readyz reports 503 until the deferred checks pass
+        print("⚡ Fast start: deferring database and AvAdmin checks")
+        checks_task = asyncio.create_task(deferred_startup_checks())
+    else:
+        # Initialize database
+        with startup_timer.phase("database check"):
+            await init_database()
     
-    # Test AvAdmin communication
-    try:
-        from .clients.avadmin_client import avadmin_client
-        is_healthy = await avladmin_client.health_check()
-        if is_healthy:
-            print("✅ AvAdmin communication OK")
-        else:
-            print("⚠️  AvAdmin communication failed")
-    except Exception as e:
-        print(f"⚠️  AvAdmin communication error: {str(e)[:100]}")
+    # Fold Category/Brand product_count deltas in the background
+    counts_task = asyncio.create_task(product_count_flush_loop())
+    
+    # Write-behind view/contact/favorite counters
+    counters_task = asyncio.create_task(counter_buffer.run())
+    
+    # Pooled AvAdmin client (one per worker)
+    with startup_timer.phase("avadmin client"):
+        await avadmin_client.open()
+    
+    # Batched usage-counter reporting from the usage_deltas outbox
+    usage_task = asyncio.create_task(usage_reporter.run())
+    
+    # Test AvAdmin communication (first probe round seeds /readyz)
+    if not settings.fast_start:
+        with startup_timer.phase("first health probe"):
+            await report_avadmin_probe()
+    
+    # Keep probing in the background; health endpoints answer from memory
+    health_task = asyncio.create_task(health_prober.run())
+    
+    # Adaptive pools: overflow ceiling follows demand and the server budget
+    sizing_task = None
+    if settings.database_pool_adaptive:
+        sizing_task = asyncio.create_task(pool_sizer.run())
+    
+    startup_timer.mark_serving()
+    if settings.startup_report:
+        startup_timer.print_report()
     
     yield
     
     # Shutdown
     print(f"🛑 Shutting down {settings.app_name}")
+    counts_task.cancel()
+    counters_task.cancel()
+    usage_task.cancel()
+    health_task.cancel()
+    tasks = [counts_task, counters_task, usage_task, health_task]
+    for task in (checks_task, sizing_task):
+        if task is not None:
+            task.cancel()
+            tasks.append(task)
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await product_importer.close()
+    await product_exporter.close()
+    try:
+        await counter_buffer.close()
+    except Exception as e:
+        print(f"⚠️  Final counter flush failed: {str(e)[:100]}")
+    try:
+        await usage_reporter.close()
+    except Exception as e:
+        print(f"⚠️  Final usage report failed: {str(e)[:100]}")
+    await avadmin_client.close()
     await close_database()
 
 # Create FastAPI application
@@ -58,23 +144,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Basic health check
+# API routers
+app.include_router(catalog_router)
+app.include_router(inventory_router)
+app.include_router(admin_router)
+
+# Health checks (answered from the background prober, no I/O per hit)
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    try:
-        from .clients.avadmin_client import avladmin_client
-        avadmin_healthy = await avladmin_client.health_check()
-    except:
-        avadmin_healthy = False
-    
-    return {
+    return json_response({
         "status": "healthy",
         "service": settings.app_name,
         "version": settings.app_version,
         "environment": settings.environment,
-        "avladmin_connection": "ok" if avladmin_healthy else "failed"
-    }
+        "avladmin_connection": "ok" if health_prober.is_healthy("avadmin") else "failed"
+    })
+
+@app.get("/livez", include_in_schema=False)
+async def livez():
+    """Liveness: the event loop is serving requests"""
+    return Response(content=b'{"status":"alive"}', media_type="application/json")
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: critical dependencies passed their latest probe"""
+    snapshot = health_prober.snapshot()
+    return json_response(snapshot, status_code=200 if snapshot["status"] == "ready" else 503)
+
+@app.get("/startupz", include_in_schema=False)
+async def startupz():
+    """Startup timing report (per phase, including deferred checks)"""
+    return json_response(startup_timer.report())
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 @app.get("/")
 async def root():
@@ -86,7 +193,7 @@ async def root():
         "docs": "/docs",
         "health": "/health",
         "catalog": "/api/catalog",
-        "avladmin_integration": settings.avladmin_api_url
+        "avladmin_integration": settings.avadmin_api_url
     }
 
 if __name__ == "__main__":
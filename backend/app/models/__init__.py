@@ -6,6 +6,9 @@ from .base import Base
 from .product import Product, ProductStatus, ProductCondition
 from .category import Category, Brand
 from .transaction import Transaction, TransactionStatus, TransactionType
+from .outbox import CounterFlush, ProductCountDelta, UsageDelta
+from .imports import ImportStatus, ProductImport, ProductImportError
+from .exports import ExportStatus, ProductExport
 
 # Export all models for easy importing
 __all__ = [
@@ -25,6 +28,20 @@ __all__ = [
     "Transaction",
     "TransactionStatus",
     "TransactionType",
+    
+    # Outbox models
+    "ProductCountDelta",
+    "UsageDelta",
+    "CounterFlush",
+    
+    # Import models
+    "ImportStatus",
+    "ProductImport",
+    "ProductImportError",
+    
+    # Export models
+    "ExportStatus",
+    "ProductExport",
 ]
 
 # Model registry for migrations and other tools
@@ -33,4 +50,10 @@ MODELS = [
     Brand,
     Product,
     Transaction,
+    ProductCountDelta,
+    UsageDelta,
+    CounterFlush,
+    ProductImport,
+    ProductImportError,
+    ProductExport,
 ]
\ No newline at end of file
@@ -4,7 +4,7 @@
 
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, String, Text, Integer
+from sqlalchemy import Boolean, Column, String, Text, Integer, func, select
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -52,16 +52,20 @@ class Category(Base):
         """Check if this is a parent category"""
         return self.parent_id is None
     
-    def update_product_count(self, db_session):
-        """Update cached product count"""
+    async def update_product_count(self, db_session):
+        """
+        Recount this category's active products
+        Normally kept current by the product_count_deltas triggers
+        """
         from .product import Product, ProductStatus
         
-        count = db_session.query(Product).filter(
-            Product.category_id == self.id,
-            Product.status == ProductStatus.ACTIVE
-        ).count()
-        
-        self.product_count = count
+        result = await db_session.execute(
+            select(func.count(Product.id)).where(
+                Product.category_id == self.id,
+                Product.status == ProductStatus.ACTIVE
+            )
+        )
+        self.product_count = result.scalar_one()
 
 class Brand(Base):
     """
@@ -101,13 +105,17 @@ class Brand(Base):
     def __repr__(self):
         return f"<Brand {self.name}>"
     
-    def update_product_count(self, db_session):
-        """Update cached product count"""
+    async def update_product_count(self, db_session):
+        """
+        Recount this brand's active products
+        Normally kept current by the product_count_deltas triggers
+        """
         from .product import Product, ProductStatus
         
-        count = db_session.query(Product).filter(
-            Product.brand_id == self.id,
-            Product.status == ProductStatus.ACTIVE
-        ).count()
-        
-        self.product_count = count
\ No newline at end of file
+        result = await db_session.execute(
+            select(func.count(Product.id)).where(
+                Product.brand_id == self.id,
+                Product.status == ProductStatus.ACTIVE
+            )
+        )
+        self.product_count = result.scalar_one()
\ No newline at end of file
@@ -0,0 +1,55 @@
+# ========================================
+# STOCKTECH - Product Export Models (Background Jobs)
+# ========================================
+
+import enum
+
+from sqlalchemy import BigInteger, Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+
+class ExportStatus(str, enum.Enum):
+    """Lifecycle of a background export"""
+    PENDING = "pending"        # Queued
+    RUNNING = "running"        # Streaming rows to the file
+    COMPLETED = "completed"    # File ready for download
+    FAILED = "failed"          # Stopped early (query error, shutdown)
+
+class ProductExport(Base):
+    """
+    Export too large to stream inline; the file is written under
+    UPLOAD_PATH/exports and kept for EXPORT_RETENTION_HOURS
+    """
+    __tablename__ = "product_exports"
+    
+    job_id = Column(String(50), unique=True, nullable=False, index=True)
+    account_id = Column(UUID(as_uuid=True), nullable=True, index=True)  # None = whole marketplace
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    
+    file_format = Column(String(10), nullable=False)     # 'csv', 'xlsx' or 'ndjson'
+    product_status = Column(String(20), nullable=True)   # Status filter, None = all
+    status = Column(Enum(ExportStatus), default=ExportStatus.PENDING, nullable=False)
+    
+    row_count = Column(Integer, default=0, nullable=False)
+    file_size = Column(BigInteger, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<ProductExport {self.job_id} {self.status.value}>"
+    
+    def to_dict(self):
+        """Job payload for the export API"""
+        return {
+            "job_id": self.job_id,
+            "format": self.file_format,
+            "product_status": self.product_status,
+            "status": self.status.value,
+            "row_count": self.row_count,
+            "file_size": self.file_size,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
@@ -0,0 +1,77 @@
+# ========================================
+# STOCKTECH - Product Import Models (Bulk Upload)
+# ========================================
+
+import enum
+
+from sqlalchemy import Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from .base import Base
+
+class ImportStatus(str, enum.Enum):
+    """Lifecycle of a spreadsheet import"""
+    PENDING = "pending"        # Uploaded, not started
+    RUNNING = "running"        # Chunks being merged
+    COMPLETED = "completed"    # Every chunk merged (rows may still have errors)
+    FAILED = "failed"          # Stopped early (quota, unreadable file, shutdown)
+
+class ProductImport(Base):
+    """
+    One uploaded CSV/XLSX file; batch_id is stamped on Product.import_batch_id
+    Progress counters are updated in the same transaction as each merged chunk
+    """
+    __tablename__ = "product_imports"
+
+    batch_id = Column(String(50), unique=True, nullable=False, index=True)
+    account_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+
+    filename = Column(String(255), nullable=False)
+    file_format = Column(String(10), nullable=False)     # 'csv' or 'xlsx'
+    status = Column(Enum(ImportStatus), default=ImportStatus.PENDING, nullable=False)
+
+    # Progress (total_rows is an estimate until the import finishes)
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, default=0, nullable=False)
+    inserted_rows = Column(Integer, default=0, nullable=False)
+    updated_rows = Column(Integer, default=0, nullable=False)
+    error_rows = Column(Integer, default=0, nullable=False)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(Text, nullable=True)                  # Why the import failed
+
+    def __repr__(self):
+        return f"<ProductImport {self.batch_id} {self.status.value}>"
+
+    def to_dict(self):
+        """Progress payload for the inventory API"""
+        return {
+            "batch_id": self.batch_id,
+            "filename": self.filename,
+            "format": self.file_format,
+            "status": self.status.value,
+            "total_rows": self.total_rows,
+            "processed_rows": self.processed_rows,
+            "inserted_rows": self.inserted_rows,
+            "updated_rows": self.updated_rows,
+            "error_rows": self.error_rows,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+class ProductImportError(Base):
+    """A spreadsheet row that was rejected (row_number is 1-based, header = 1)"""
+    __tablename__ = "product_import_errors"
+
+    batch_id = Column(String(50), nullable=False, index=True)
+    row_number = Column(Integer, nullable=False)
+    code = Column(String(50), nullable=True)
+    field = Column(String(50), nullable=True)
+    message = Column(String(500), nullable=False)
+
+    def __repr__(self):
+        return f"<ProductImportError {self.batch_id}#{self.row_number}: {self.message}>"
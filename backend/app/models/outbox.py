@@ -0,0 +1,63 @@
+# ========================================
+# STOCKTECH - Outbox Models (Deferred Deltas)
+# ========================================
+
+import uuid
+
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+class ProductCountDelta(Base):
+    """
+    Pending change to Category/Brand.product_count
+    Written by the products_count_deltas_*_trg triggers, folded by
+    services.counters.apply_product_count_deltas()
+    """
+    __tablename__ = "product_count_deltas"
+    
+    # Rows are inserted by triggers, so the id needs a server default
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid()
+    )
+    
+    entity_type = Column(String(10), nullable=False)    # 'category' or 'brand'
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    delta = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<ProductCountDelta {self.entity_type}:{self.entity_id} {self.delta:+d}>"
+
+
+class UsageDelta(Base):
+    """
+    Pending AvAdmin usage increment, written in the same transaction as the
+    product/transaction it counts and reported by services.usage.UsageReporter
+    """
+    __tablename__ = "usage_deltas"
+    
+    account_id = Column(UUID(as_uuid=True), nullable=False)
+    counter_type = Column(String(30), nullable=False)    # 'products', 'transactions', ...
+    delta = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<UsageDelta {self.account_id}:{self.counter_type} {self.delta:+d}>"
+
+
+class CounterFlush(Base):
+    """
+    Engagement counter batch already applied, written in the same
+    transaction as its UPDATEs so services.engagement.CounterBuffer can tell
+    a retried batch (commit succeeded, Redis ack failed) from a new one
+    """
+    __tablename__ = "counter_flushes"
+    
+    # id is the flush id stamped on the batch; created_at drives pruning
+    
+    def __repr__(self):
+        return f"<CounterFlush {self.id}>"
@@ -6,10 +6,11 @@ import enum
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, Integer, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Boolean, Column, Enum, ForeignKey, Index, Integer, Numeric, String, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 
+from ..core.formatting import format_brl
 from .base import Base
 
 class ProductStatus(str, enum.Enum):
@@ -129,6 +130,24 @@ class Product(Base):
     is_imported = Column(Boolean, default=False, nullable=False)         # Bulk imported
     import_batch_id = Column(String(50), nullable=True, index=True)      # Import batch reference
     
+    # Full-text search (maintained by trigger products_search_vector_trg)
+    search_vector = Column(
+        TSVECTOR,
+        nullable=True,
+        comment="Maintained by trigger products_search_vector_trg"
+    )
+    
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_products_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_products_code_trgm", "code", postgresql_using="gist", postgresql_ops={"code": "gist_trgm_ops"}),
+        # Keyset pagination: (created_at, id) and (price, id) orderings
+        Index("ix_products_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_products_status_price_id", "status", "price", "id"),
+        Index("ix_products_account_created_at_id", "account_id", "created_at", "id"),
+        Index("ix_products_account_price_id", "account_id", "price", "id"),
+    )
+    
     # Relationships (will be defined after all models are loaded)
     # category = relationship("Category", back_populates="products")
     # brand = relationship("Brand", back_populates="products")  
@@ -140,12 +159,12 @@ class Product(Base):
     @property
     def price_formatted(self) -> str:
         """Return formatted price: R$ 8.500,00"""
-        return f"R$ {self.price:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return format_brl(self.price)
     
     @property
     def is_on_sale(self) -> bool:
         """Check if product has discount"""
-        return self.original_price and self.original_price > self.price
+        return bool(self.original_price and self.original_price > self.price)
     
     @property
     def discount_percentage(self) -> float:
@@ -194,11 +213,11 @@ class Product(Base):
         return first_image.get("thumbnail", first_image.get("url"))
     
     def increment_view_count(self):
-        """Increment view counter"""
+        """Increment view counter (request paths use services.engagement.counter_buffer)"""
         self.view_count += 1
     
     def increment_contact_count(self):
-        """Increment contact counter (WhatsApp clicks)"""
+        """Increment contact counter (request paths use services.engagement.counter_buffer)"""
         self.contact_count += 1
     
     def add_to_favorites(self):
@@ -220,7 +239,10 @@ class Product(Base):
             self.stock_quantity = max(0, self.stock_quantity - quantity)
     
     def reserve_stock(self, quantity: int) -> bool:
-        """Reserve stock for transaction (returns success)"""
+        """
+        Reserve stock on a loaded instance (returns success)
+        Not safe under concurrent buyers: use services.stock.reserve_stock()
+        """
         if self.stock_quantity >= quantity:
             self.stock_quantity -= quantity
             if self.stock_quantity == 0:
@@ -229,7 +251,7 @@ class Product(Base):
         return False
     
     def release_stock(self, quantity: int):
-        """Release reserved stock"""
+        """Release reserved stock (concurrent paths use services.stock.release_stock())"""
         self.stock_quantity += quantity
         if self.status == ProductStatus.OUT_OF_STOCK and self.stock_quantity > 0:
             self.status = ProductStatus.ACTIVE
@@ -250,17 +272,22 @@ class Product(Base):
         return message
     
     def get_search_vector(self) -> str:
-        """Get searchable text for full-text search"""
+        """Get searchable text (mirrors the stored search_vector document)"""
         parts = [
             self.name,
-            self.description or "",
             self.code,
-            " ".join(self.specifications.values()) if self.specifications else "",
+            self.keywords or "",
+            self.description or "",
+            " ".join(str(value) for value in self.specifications.values()) if self.specifications else "",
         ]
         return " ".join(str(part) for part in parts if part)
     
-    def to_marketplace_dict(self) -> Dict:
-        """Convert to dictionary for marketplace API"""
+    def to_marketplace_dict(
+        self,
+        category_name: Optional[str] = None,
+        brand_name: Optional[str] = None
+    ) -> Dict:
+        """Convert to dictionary for marketplace API (names resolved by the caller)"""
         return {
             "id": str(self.id),
             "code": self.code,
@@ -279,8 +306,8 @@ class Product(Base):
             "thumbnail": self.thumbnail_url,
             "images": self.images,
             "specifications": self.specifications,
-            "category": self.category.name if self.category else None,
-            "brand": self.brand.name if self.brand else None,
+            "category": category_name,
+            "brand": brand_name,
             "view_count": self.view_count,
             "allows_negotiation": self.allows_negotiation,
             "created_at": self.created_at.isoformat(),
@@ -11,6 +11,7 @@ from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, Num
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 
+from ..core.formatting import format_brl
 from .base import Base
 
 class TransactionStatus(str, enum.Enum):
@@ -129,12 +130,12 @@ class Transaction(Base):
     @property
     def total_formatted(self) -> str:
         """Return formatted total: R$ 8.500,00"""
-        return f"R$ {self.total_amount:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return format_brl(self.total_amount)
     
     @property
     def unit_price_formatted(self) -> str:
         """Return formatted unit price: R$ 8.500,00"""
-        return f"R$ {self.unit_price:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return format_brl(self.unit_price)
     
     @property
     def is_completed(self) -> bool:
@@ -15,6 +15,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sqlalchemy import select
 from app.core.database import AsyncSessionFactory
+from app.services.counters import reconcile_product_counts
 from app.models import (
     Category, Brand, Product,
     ProductStatus, ProductCondition
@@ -384,35 +385,14 @@ Capa de silicone original Apple para iPhone 15 Pro Max.
             raise
 
 async def update_counters():
-    """Update category and brand product counters"""
+    """Update category and brand product counters (single set-based recount)"""
     
     async with AsyncSessionFactory() as db:
         try:
-            # Update category counters
-            categories = await db.execute(select(Category))
-            for category in categories.scalars().all():
-                count_result = await db.execute(
-                    select(Product).where(
-                        Product.category_id == category.id,
-                        Product.status == ProductStatus.ACTIVE
-                    )
-                )
-                category.product_count = len(count_result.scalars().all())
-                print(f"📊 Categoria {category.name}: {category.product_count} produtos")
-            
-            # Update brand counters  
-            brands = await db.execute(select(Brand))
-            for brand in brands.scalars().all():
-                count_result = await db.execute(
-                    select(Product).where(
-                        Product.brand_id == brand.id,
-                        Product.status == ProductStatus.ACTIVE
-                    )
-                )
-                brand.product_count = len(count_result.scalars().all())
-                print(f"🏷️  Marca {brand.name}: {brand.product_count} produtos")
-            
+            stats = await reconcile_product_counts(db)
             await db.commit()
+            print(f"📊 Categorias atualizadas: {stats['categories']}")
+            print(f"🏷️  Marcas atualizadas: {stats['brands']}")
             print("✅ Contadores atualizados")
             
         except Exception as e:
@@ -0,0 +1,3 @@
+# ========================================
+# STOCKTECH - Services Package
+# ========================================
@@ -0,0 +1,107 @@
+# ========================================
+# STOCKTECH - Authorization (local claims + AvAdmin fallback)
+# ========================================
+
+import asyncio
+import time
+from typing import Dict, Optional, Set
+
+from ..clients.avadmin_client import avadmin_client
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.logger import logger
+from ..core.metrics import auth_avadmin_fallbacks, auth_revocation_list_age
+from ..core.security import TokenClaims
+
+class RevocationList:
+    """
+    Cached copy of AvAdmin's revocations, refreshed in the background
+    `jtis` are revoked tokens; `users` maps user_id -> epoch before which
+    that user's tokens carry stale permissions
+    Fails closed: until the first load succeeds, or once the copy is older
+    than `max_stale_seconds`, the list is unavailable and requests get 503.
+    Failed loads are retried every `retry_seconds`.
+    """
+    
+    def __init__(self, refresh_seconds: float, retry_seconds: float, max_stale_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self._jtis: Set[str] = set()
+        self._users: Dict[str, float] = {}
+        self._created_at = time.monotonic()
+        self._attempted_at: Optional[float] = None
+        self._loaded_at: Optional[float] = None  # Last successful load
+        self._failing = False
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+        auth_revocation_list_age.set_function(lambda: self.age_seconds)
+    
+    @property
+    def age_seconds(self) -> float:
+        """Time since the last successful load (since startup if none yet)"""
+        return time.monotonic() - (self._created_at if self._loaded_at is None else self._loaded_at)
+    
+    @property
+    def available(self) -> bool:
+        return self._loaded_at is not None and self.age_seconds <= self.max_stale_seconds
+    
+    async def ensure_fresh(self) -> None:
+        """Block only while nothing has loaded yet; later refreshes run behind requests"""
+        interval = self.retry_seconds if self._failing else self.refresh_seconds
+        if self._attempted_at is None or time.monotonic() - self._attempted_at >= interval:
+            self._refresh_once()
+        if self._loaded_at is None and not self._refresh_task.done():
+            # Shielded so a cancelled request doesn't cancel the shared load
+            await asyncio.shield(self._refresh_task)
+    
+    def _refresh_once(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self.refresh())
+        return self._refresh_task
+    
+    async def refresh(self) -> None:
+        data = await avadmin_client.get_revocations()
+        self._attempted_at = time.monotonic()
+        self._failing = data is None
+        if data is not None:
+            self._jtis = set(data.get("jtis", []))
+            self._users = {user_id: float(ts) for user_id, ts in data.get("users", {}).items()}
+            self._loaded_at = self._attempted_at
+        # On failure keep the previous list and retry after retry_seconds
+    
+    def is_revoked(self, claims: TokenClaims) -> bool:
+        return claims.jti is not None and claims.jti in self._jtis
+    
+    def is_stale(self, claims: TokenClaims) -> bool:
+        revoked_before = self._users.get(claims.user_id)
+        return revoked_before is not None and claims.issued_at < revoked_before
+
+# Fallback answers for tokens without embedded permissions
+_access_cache = TTLCache(ttl_seconds=settings.avadmin_cache_permission_ttl, max_entries=10000)
+
+async def has_module_access(claims: TokenClaims, module: str = "StockTech") -> bool:
+    """Answer from the token claims; ask AvAdmin only when they can't be trusted or are absent"""
+    if revocation_list.is_stale(claims):
+        # Permissions changed after the token was issued: always ask live
+        auth_avadmin_fallbacks.labels("stale").inc()
+        return await avadmin_client.validate_user_access(claims.user_id, module)
+    
+    if claims.modules is not None:
+        return module in claims.modules
+    
+    key = (claims.user_id, module)
+    allowed = _access_cache.get(key)
+    if allowed is None:
+        auth_avadmin_fallbacks.labels("no_claims").inc()
+        allowed = await avadmin_client.validate_user_access(claims.user_id, module)
+        _access_cache.set(key, allowed)
+        logger.debug(f"Token for {claims.user_id} has no module claims, asked AvAdmin")
+    return allowed
+
+# Global revocation list instance
+revocation_list = RevocationList(
+    refresh_seconds=settings.jwt_revocation_refresh_seconds,
+    retry_seconds=settings.jwt_revocation_retry_seconds,
+    max_stale_seconds=settings.jwt_revocation_max_stale_seconds
+)
@@ -0,0 +1,60 @@
+# ========================================
+# STOCKTECH - Catalog Listings
+# ========================================
+
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Product, ProductStatus
+from .pagination import apply_keyset, encode_cursor
+
+async def list_products(
+    db: AsyncSession,
+    sort: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[ProductStatus] = ProductStatus.ACTIVE,
+    account_id: Optional[uuid.UUID] = None,
+    category_id: Optional[uuid.UUID] = None,
+    brand_id: Optional[uuid.UUID] = None
+) -> Tuple[List[Product], Optional[str]]:
+    """
+    Keyset-paginated product listing
+    Returns (products, next_cursor); next_cursor is None on the last page
+    """
+    stmt = select(Product)
+    
+    if status is not None:
+        stmt = stmt.where(Product.status == status)
+    if account_id is not None:
+        stmt = stmt.where(Product.account_id == account_id)
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if brand_id is not None:
+        stmt = stmt.where(Product.brand_id == brand_id)
+    
+    result = await db.execute(apply_keyset(stmt, sort, cursor, limit))
+    products = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(sort, products[-1])
+    
+    return products, next_cursor
+
+# Statuses a buyer can open from a link (drafts and hidden products 404)
+VISIBLE_STATUSES = (ProductStatus.ACTIVE, ProductStatus.OUT_OF_STOCK, ProductStatus.RESERVED)
+
+async def get_product(db: AsyncSession, product_id: uuid.UUID) -> Optional[Product]:
+    """Single product visible to buyers"""
+    result = await db.execute(
+        select(Product).where(
+            Product.id == product_id,
+            Product.status.in_(VISIBLE_STATUSES)
+        )
+    )
+    return result.scalar_one_or_none()
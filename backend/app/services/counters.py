@@ -0,0 +1,120 @@
+# ========================================
+# STOCKTECH - Category/Brand Product Counters
+# ========================================
+
+import asyncio
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory
+
+# Drain a batch of pending deltas and fold them into the cached counts.
+# SKIP LOCKED lets several workers run this concurrently without blocking.
+APPLY_DELTAS_SQL = text("""
+    WITH drained AS (
+        DELETE FROM product_count_deltas
+        WHERE id IN (
+            SELECT id FROM product_count_deltas
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING entity_type, entity_id, delta
+    ),
+    totals AS (
+        SELECT entity_type, entity_id, sum(delta) AS delta
+        FROM drained
+        GROUP BY entity_type, entity_id
+    ),
+    updated_categories AS (
+        UPDATE categories AS c
+        SET product_count = GREATEST(c.product_count + t.delta, 0)
+        FROM totals AS t
+        WHERE t.entity_type = 'category' AND c.id = t.entity_id
+        RETURNING c.id
+    ),
+    updated_brands AS (
+        UPDATE brands AS b
+        SET product_count = GREATEST(b.product_count + t.delta, 0)
+        FROM totals AS t
+        WHERE t.entity_type = 'brand' AND b.id = t.entity_id
+        RETURNING b.id
+    )
+    SELECT
+        (SELECT count(*) FROM drained) AS deltas,
+        (SELECT count(*) FROM updated_categories) AS categories,
+        (SELECT count(*) FROM updated_brands) AS brands
+""")
+
+# Full recount in one statement. Deltas visible to this snapshot are already
+# reflected in the recount, so they are discarded in the same statement.
+RECONCILE_SQL = text("""
+    WITH category_counts AS (
+        SELECT category_id, count(*) AS total
+        FROM products
+        WHERE status = 'ACTIVE' AND category_id IS NOT NULL
+        GROUP BY category_id
+    ),
+    brand_counts AS (
+        SELECT brand_id, count(*) AS total
+        FROM products
+        WHERE status = 'ACTIVE' AND brand_id IS NOT NULL
+        GROUP BY brand_id
+    ),
+    discarded AS (
+        DELETE FROM product_count_deltas
+        RETURNING id
+    ),
+    updated_categories AS (
+        UPDATE categories AS c
+        SET product_count = coalesce(cc.total, 0)
+        FROM categories AS c2
+        LEFT JOIN category_counts AS cc ON cc.category_id = c2.id
+        WHERE c.id = c2.id AND c.product_count IS DISTINCT FROM coalesce(cc.total, 0)
+        RETURNING c.id
+    ),
+    updated_brands AS (
+        UPDATE brands AS b
+        SET product_count = coalesce(bc.total, 0)
+        FROM brands AS b2
+        LEFT JOIN brand_counts AS bc ON bc.brand_id = b2.id
+        WHERE b.id = b2.id AND b.product_count IS DISTINCT FROM coalesce(bc.total, 0)
+        RETURNING b.id
+    )
+    SELECT
+        (SELECT count(*) FROM discarded) AS deltas,
+        (SELECT count(*) FROM updated_categories) AS categories,
+        (SELECT count(*) FROM updated_brands) AS brands
+""")
+
+async def apply_product_count_deltas(db: AsyncSession, batch_size: int = 10000) -> Dict[str, int]:
+    """Fold up to `batch_size` pending deltas into product_count (caller commits)"""
+    result = await db.execute(APPLY_DELTAS_SQL, {"batch_size": batch_size})
+    return dict(result.mappings().one())
+
+async def reconcile_product_counts(db: AsyncSession) -> Dict[str, int]:
+    """Recompute every Category/Brand product_count from products (caller commits)"""
+    result = await db.execute(RECONCILE_SQL)
+    return dict(result.mappings().one())
+
+async def product_count_flush_loop(interval_seconds: float = None):
+    """Background task: periodically apply pending product_count deltas"""
+    interval = interval_seconds or settings.product_count_flush_interval_seconds
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionFactory() as db:
+                # Keep draining while full batches come back
+                while True:
+                    stats = await apply_product_count_deltas(db, settings.product_count_flush_batch_size)
+                    await db.commit()
+                    if stats["deltas"] < settings.product_count_flush_batch_size:
+                        break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Product count flush failed: {str(e)[:100]}")
@@ -0,0 +1,323 @@
+# ========================================
+# STOCKTECH - Engagement Counters (Write-Behind Buffer)
+# ========================================
+#
+# Product views, WhatsApp clicks and favorites are buffered (in memory or in
+# Redis) and written in batched UPDATE ... FROM (VALUES ...) statements, so a
+# popular listing no longer takes a row lock per page view.
+#
+# Loss bound: with the memory backend a crash loses at most
+# settings.counter_flush_max_pending increments (a flush is forced once that
+# many are buffered). The Redis backend survives worker crashes, and each
+# batch carries a flush id recorded in counter_flushes in the same
+# transaction, so a batch whose ack failed after the commit is not applied
+# twice on retry.
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, column, delete, func, text, update, values
+from sqlalchemy.dialects.postgresql import UUID, insert
+
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory
+from ..core.metrics import (
+    counter_buffer_flush_failures,
+    counter_buffer_flush_lag,
+    counter_buffer_flushed_rows,
+    counter_buffer_pending,
+)
+from ..models import CounterFlush, Product
+
+# Buffered field -> Product column
+COUNTER_FIELDS = ("view_count", "contact_count", "favorite_count")
+
+DeltaKey = Tuple[uuid.UUID, str]
+
+# Applied flush ids are kept this long; a batch retried later than this
+# would be applied again
+FLUSH_ID_RETENTION = "1 day"
+
+# ==========================================
+# STORES
+# ==========================================
+
+class MemoryCounterStore:
+    """Per-worker in-memory deltas"""
+    
+    # Nothing survives the process, so there is nothing to replay
+    flush_id = None
+    
+    def __init__(self):
+        self._deltas: Dict[DeltaKey, int] = defaultdict(int)
+    
+    async def add(self, product_id: uuid.UUID, field: str, amount: int) -> None:
+        self._deltas[(product_id, field)] += amount
+    
+    async def drain(self) -> Dict[DeltaKey, int]:
+        deltas, self._deltas = self._deltas, defaultdict(int)
+        return dict(deltas)
+    
+    async def ack(self) -> None:
+        pass
+    
+    async def restore(self, deltas: Dict[DeltaKey, int]) -> None:
+        for key, amount in deltas.items():
+            self._deltas[key] += amount
+    
+    async def close(self) -> None:
+        pass
+
+class RedisCounterStore:
+    """
+    Deltas shared by all workers in a Redis hash
+    A flush renames the hash and only deletes it after the DB commit, so a
+    failed flush is retried (by any worker) on the next cycle. The renamed
+    hash is stamped with a flush id that stays the same across retries.
+    """
+    
+    PENDING_KEY = "stocktech:counters:pending"
+    FLUSHING_KEY = "stocktech:counters:flushing"
+    LOCK_KEY = "stocktech:counters:flush-lock"
+    FLUSH_ID_FIELD = "flush_id"  # Counter fields are "<product_id>:<field>"
+    
+    def __init__(self, url: str, password: Optional[str] = None):
+        import redis.asyncio as aioredis
+        
+        self._redis = aioredis.from_url(url, password=password, decode_responses=True)
+        self._lock = None
+        self.flush_id: Optional[uuid.UUID] = None
+    
+    async def add(self, product_id: uuid.UUID, field: str, amount: int) -> None:
+        await self._redis.hincrby(self.PENDING_KEY, f"{product_id}:{field}", amount)
+    
+    async def drain(self) -> Optional[Dict[DeltaKey, int]]:
+        """Deltas to flush; None while another worker holds the flush lock"""
+        from redis.exceptions import ResponseError
+        
+        lock = self._redis.lock(self.LOCK_KEY, timeout=60)
+        if not await lock.acquire(blocking=False):
+            return None
+        self._lock = lock
+        
+        # Leftovers from a failed flush go first
+        if not await self._redis.exists(self.FLUSHING_KEY):
+            try:
+                await self._redis.rename(self.PENDING_KEY, self.FLUSHING_KEY)
+            except ResponseError:
+                await self._release()
+                return {}  # Nothing pending
+        
+        # Kept by a retried batch (also covers a crash right after the rename)
+        await self._redis.hsetnx(self.FLUSHING_KEY, self.FLUSH_ID_FIELD, str(uuid.uuid4()))
+        raw = await self._redis.hgetall(self.FLUSHING_KEY)
+        self.flush_id = uuid.UUID(raw.pop(self.FLUSH_ID_FIELD))
+        deltas = {}
+        for key, amount in raw.items():
+            product_id, field = key.rsplit(":", 1)
+            deltas[(uuid.UUID(product_id), field)] = int(amount)
+        return deltas
+    
+    async def ack(self) -> None:
+        try:
+            await self._redis.delete(self.FLUSHING_KEY)
+        finally:
+            await self._release()
+    
+    async def restore(self, deltas: Dict[DeltaKey, int]) -> None:
+        # The flushing hash is kept and retried next cycle
+        await self._release()
+    
+    async def close(self) -> None:
+        await self._redis.aclose()
+    
+    async def _release(self) -> None:
+        self.flush_id = None
+        if self._lock is not None:
+            try:
+                await self._lock.release()
+            except Exception:
+                pass  # Lock expired; the next flush re-acquires it
+            self._lock = None
+
+# ==========================================
+# BUFFER
+# ==========================================
+
+class CounterBuffer:
+    """Aggregates counter increments and flushes them in batches"""
+    
+    def __init__(
+        self,
+        store,
+        flush_interval: float,
+        max_pending: int,
+        batch_size: int
+    ):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        
+        self._pending = 0
+        self._oldest_pending_at: Optional[float] = None
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        
+        counter_buffer_flush_lag.set_function(lambda: self.flush_lag_seconds)
+        counter_buffer_pending.set_function(lambda: self._pending)
+    
+    @property
+    def flush_lag_seconds(self) -> float:
+        """Age of the oldest unflushed increment"""
+        if self._oldest_pending_at is None:
+            return 0.0
+        return time.monotonic() - self._oldest_pending_at
+    
+    async def increment(self, product_id: uuid.UUID, field: str, amount: int = 1) -> None:
+        """Buffer an increment (negative amounts allowed, e.g. unfavorite)"""
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown counter field: {field}")
+        
+        await self.store.add(product_id, field, amount)
+        self._pending += abs(amount)
+        if self._oldest_pending_at is None:
+            self._oldest_pending_at = time.monotonic()
+        
+        if self._pending >= self.max_pending:
+            self._flush_requested.set()
+    
+    async def record_view(self, product_id: uuid.UUID) -> None:
+        await self.increment(product_id, "view_count")
+    
+    async def record_contact(self, product_id: uuid.UUID) -> None:
+        await self.increment(product_id, "contact_count")
+    
+    async def record_favorite(self, product_id: uuid.UUID, added: bool = True) -> None:
+        await self.increment(product_id, "favorite_count", 1 if added else -1)
+    
+    def _build_update(self, rows: List[tuple]):
+        """UPDATE products ... FROM (VALUES (id, views, contacts, favorites), ...)"""
+        deltas = values(
+            column("id", UUID(as_uuid=True)),
+            column("views", Integer),
+            column("contacts", Integer),
+            column("favorites", Integer),
+            name="deltas"
+        ).data(rows)
+        
+        return (
+            update(Product)
+            .values(
+                view_count=Product.view_count + deltas.c.views,
+                contact_count=Product.contact_count + deltas.c.contacts,
+                favorite_count=func.greatest(Product.favorite_count + deltas.c.favorites, 0),
+                # Counters are not content changes: keep updated_at (and ETags) as is
+                updated_at=Product.updated_at
+            )
+            .where(Product.id == deltas.c.id)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _requeue(self, oldest: Optional[float], pending: int) -> None:
+        """Put back the gauge state taken by a flush that did not write"""
+        self._pending += pending
+        if oldest is not None:
+            self._oldest_pending_at = min(oldest, self._oldest_pending_at or oldest)
+    
+    async def _claim(self, db, flush_id: Optional[uuid.UUID]) -> bool:
+        """Record the flush id; False if this batch was already applied"""
+        if flush_id is None:
+            return True
+        await db.execute(
+            delete(CounterFlush)
+            .where(CounterFlush.created_at < func.now() - text(f"interval '{FLUSH_ID_RETENTION}'"))
+        )
+        claimed = await db.execute(
+            insert(CounterFlush)
+            .values(id=flush_id)
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(CounterFlush.id)
+        )
+        return claimed.first() is not None
+    
+    async def flush(self) -> int:
+        """Write buffered deltas to PostgreSQL; returns product rows updated"""
+        async with self._flush_lock:
+            oldest, pending = self._oldest_pending_at, self._pending
+            self._oldest_pending_at, self._pending = None, 0
+            deltas = await self.store.drain()
+            if deltas is None:  # Another worker is flushing; ours are still pending
+                self._requeue(oldest, pending)
+                return 0
+            if not deltas:
+                return 0
+            
+            per_product: Dict[uuid.UUID, List[int]] = defaultdict(lambda: [0, 0, 0])
+            for (product_id, field), amount in deltas.items():
+                per_product[product_id][COUNTER_FIELDS.index(field)] += amount
+            
+            # Sorted ids give a stable lock order across concurrent flushes
+            rows = [
+                (product_id, *amounts)
+                for product_id, amounts in sorted(per_product.items())
+                if any(amounts)
+            ]
+            
+            try:
+                async with AsyncSessionFactory() as db:
+                    applied = await self._claim(db, self.store.flush_id)
+                    if applied:
+                        for start in range(0, len(rows), self.batch_size):
+                            await db.execute(self._build_update(rows[start:start + self.batch_size]))
+                    await db.commit()
+            except Exception:
+                await self.store.restore(deltas)
+                self._requeue(oldest, pending)
+                counter_buffer_flush_failures.inc()
+                raise
+            
+            await self.store.ack()
+            if not applied:
+                return 0  # Committed earlier; only the ack was missing
+            counter_buffer_flushed_rows.inc(len(rows))
+            return len(rows)
+    
+    async def run(self) -> None:
+        """Background task: flush every interval or as soon as max_pending is hit"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Counter buffer flush failed: {str(e)[:100]}")
+    
+    async def close(self) -> None:
+        """Final flush on shutdown"""
+        try:
+            await self.flush()
+        finally:
+            await self.store.close()
+
+def _create_store():
+    if settings.counter_buffer_backend == "redis":
+        return RedisCounterStore(settings.redis_url, settings.redis_password)
+    return MemoryCounterStore()
+
+# Global buffer instance
+counter_buffer = CounterBuffer(
+    store=_create_store(),
+    flush_interval=settings.counter_flush_interval_seconds,
+    max_pending=settings.counter_flush_max_pending,
+    batch_size=settings.counter_flush_batch_size
+)
@@ -0,0 +1,427 @@
+# ========================================
+# STOCKTECH - Catalog Export (CSV/XLSX/NDJSON)
+# ========================================
+#
+# Rows come from a server-side cursor (EXPORT_FETCH_ROWS per fetch) as plain
+# column tuples - no ORM objects, no identity map - and each batch goes
+# through an incremental encoder straight to the response or job file, so
+# worker memory stays flat whatever the row count. Column names match the
+# import headers, so an export can be edited and imported back (formula-like
+# CSV text is escaped with a leading ', which the importer strips).
+
+import asyncio
+import csv
+import enum
+import io
+import re
+import time
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory, replica_router
+from ..core.metrics import product_export_rows, product_exports
+from ..models import Brand, Category, Product, ProductStatus
+from ..models.exports import ExportStatus, ProductExport
+from .import_rows import FORMULA_PREFIXES
+from .serializers import dumps
+
+# (header, column); headers follow import_rows.FIELD_ALIASES
+EXPORT_COLUMNS = (
+    ("code", Product.code),
+    ("name", Product.name),
+    ("description", Product.description),
+    ("price", Product.price),
+    ("original_price", Product.original_price),
+    ("cost_price", Product.cost_price),
+    ("stock_quantity", Product.stock_quantity),
+    ("min_stock_alert", Product.min_stock_alert),
+    ("condition", Product.condition),
+    ("status", Product.status),
+    ("category", Category.name),
+    ("brand", Brand.name),
+    ("keywords", Product.keywords),
+    ("weight_kg", Product.weight_kg),
+    ("dimensions", Product.dimensions),
+    ("allows_negotiation", Product.allows_negotiation),
+    ("min_negotiation_price", Product.min_negotiation_price),
+    ("created_at", Product.created_at),
+    ("updated_at", Product.updated_at),
+)
+
+# Marketplace-wide exports also say whose product each row is
+MARKETPLACE_COLUMNS = (("account_id", Product.account_id),) + EXPORT_COLUMNS
+
+def _filters(account_id: Optional[uuid.UUID], product_status: Optional[ProductStatus]) -> list:
+    filters = []
+    if account_id is not None:
+        filters.append(Product.account_id == account_id)
+    if product_status is not None:
+        filters.append(Product.status == product_status)
+    return filters
+
+def export_statement(account_id: Optional[uuid.UUID], product_status: Optional[ProductStatus]):
+    """Rows in creation order (ix_products_account_created_at_id for sellers)"""
+    columns = EXPORT_COLUMNS if account_id is not None else MARKETPLACE_COLUMNS
+    return (
+        select(*[column.label(header) for header, column in columns])
+        .select_from(Product)
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(Brand, Brand.id == Product.brand_id)
+        .where(*_filters(account_id, product_status))
+        .order_by(Product.created_at, Product.id)
+    )
+
+async def count_rows(db: AsyncSession, account_id: Optional[uuid.UUID], product_status: Optional[ProductStatus], cap: int) -> int:
+    """Matching rows, counted only up to cap + 1 (enough to pick inline vs background)"""
+    capped = select(literal(1)).select_from(Product).where(*_filters(account_id, product_status)).limit(cap + 1)
+    return (await db.execute(select(func.count()).select_from(capped.subquery()))).scalar_one()
+
+# ==========================================
+# ENCODERS
+# ==========================================
+
+def _plain(value: Any) -> Any:
+    """Cell value for CSV/XLSX: enums by value, UUIDs and datetimes as text"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (uuid.UUID, datetime)):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    return value
+
+def _inert(value: Any) -> Any:
+    """CSV cell value; text that would run as a formula gets a leading '"""
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+class CsvEncoder:
+    """UTF-8 with BOM, so Excel opens accents correctly"""
+    media_type = "text/csv; charset=utf-8"
+    
+    def __init__(self, headers: Sequence[str]):
+        self.headers = headers
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+    
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+    
+    def start(self) -> bytes:
+        self._writer.writerow(self.headers)
+        return b"\xef\xbb\xbf" + self._drain()
+    
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        for row in rows:
+            self._writer.writerow([
+                ("true" if value else "false") if isinstance(value, bool) else _inert(value)
+                for value in row
+            ])
+        return self._drain()
+    
+    def finish(self) -> bytes:
+        return b""
+
+class NdjsonEncoder:
+    """One JSON object per line (same value encoding as the API)"""
+    media_type = "application/x-ndjson"
+    
+    def __init__(self, headers: Sequence[str]):
+        self.headers = headers
+    
+    def start(self) -> bytes:
+        return b""
+    
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return b"".join(dumps(dict(zip(self.headers, row))) + b"\n" for row in rows)
+    
+    def finish(self) -> bytes:
+        return b""
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable stream collecting zip output; ZipFile then writes data descriptors"""
+    
+    def __init__(self):
+        self._data = bytearray()
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._data += data
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Produtos" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+# Characters XML 1.0 does not allow (would make Excel reject the file)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+class XlsxEncoder:
+    """
+    Minimal streaming XLSX: one sheet of inline strings and numbers, zipped
+    as it goes (openpyxl's write-only mode only produces bytes on save)
+    """
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    
+    def __init__(self, headers: Sequence[str]):
+        self.headers = headers
+        self._sink = _ZipSink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = None
+    
+    @staticmethod
+    def _cell(value: Any) -> str:
+        if value is None:
+            return "<c/>"
+        if isinstance(value, bool):
+            return f'<c t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float, Decimal)):
+            return f"<c><v>{value}</v></c>"
+        text = escape(_XML_INVALID.sub("", str(_plain(value))))  # Inline strings are never formulas
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+    
+    def _rows_xml(self, rows) -> bytes:
+        return "".join(
+            "<row>" + "".join(self._cell(value) for value in row) + "</row>"
+            for row in rows
+        ).encode("utf-8")
+    
+    def start(self) -> bytes:
+        for name, content in XLSX_PARTS.items():
+            self._zip.writestr(name, content)
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w")
+        self._sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self._sheet.write(self._rows_xml([self.headers]))
+        return self._sink.drain()
+    
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        self._sheet.write(self._rows_xml(rows))
+        return self._sink.drain()
+    
+    def finish(self) -> bytes:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.drain()
+
+ENCODERS = {
+    "csv": CsvEncoder,
+    "xlsx": XlsxEncoder,
+    "ndjson": NdjsonEncoder,
+}
+
+EXPORT_FORMAT_PATTERN = "^(" + "|".join(ENCODERS) + ")$"
+
+def media_type(file_format: str) -> str:
+    return ENCODERS[file_format].media_type
+
+def export_filename(file_format: str, account_id: Optional[uuid.UUID] = None) -> str:
+    scope = "produtos" if account_id is not None else "marketplace"
+    return f"{scope}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{file_format}"
+
+# ==========================================
+# EXPORTER
+# ==========================================
+
+class ProductExporter:
+    """Streams exports inline or, past `inline_max_rows`, writes them in background jobs"""
+    
+    def __init__(self, fetch_rows: int, inline_max_rows: int, retention_hours: float, export_dir: Path):
+        self.fetch_rows = fetch_rows
+        self.inline_max_rows = inline_max_rows
+        self.retention_seconds = retention_hours * 3600
+        self.export_dir = export_dir
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    async def needs_job(self, account_id: Optional[uuid.UUID], product_status: Optional[ProductStatus]) -> bool:
+        async with replica_router.session(str(account_id) if account_id else None) as db:
+            return await count_rows(db, account_id, product_status, self.inline_max_rows) > self.inline_max_rows
+    
+    def inline(
+        self,
+        account_id: Optional[uuid.UUID],
+        product_status: Optional[ProductStatus],
+        file_format: str,
+        strong: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Body for a StreamingResponse"""
+        product_exports.labels("inline").inc()
+        return self.stream(account_id, product_status, file_format, strong)
+    
+    async def stream(
+        self,
+        account_id: Optional[uuid.UUID],
+        product_status: Optional[ProductStatus],
+        file_format: str,
+        strong: bool = False,
+        progress: Optional[dict] = None
+    ) -> AsyncIterator[bytes]:
+        """Encoded export, one chunk per cursor fetch (read replica when safe)"""
+        statement = export_statement(account_id, product_status).execution_options(yield_per=self.fetch_rows)
+        encoder = ENCODERS[file_format]([column.name for column in statement.selected_columns])
+        rows_metric = product_export_rows.labels(file_format)
+        
+        yield encoder.start()
+        async with replica_router.session(str(account_id) if account_id else None, strong) as db:
+            result = await db.stream(statement)
+            async for rows in result.partitions():
+                # Encoding a batch is CPU work; keep it off the event loop
+                yield await asyncio.to_thread(encoder.encode, rows)
+                rows_metric.inc(len(rows))
+                if progress is not None:
+                    progress["row_count"] += len(rows)
+        yield await asyncio.to_thread(encoder.finish)
+    
+    # ==========================================
+    # BACKGROUND JOBS
+    # ==========================================
+    
+    def job_path(self, job: ProductExport) -> Path:
+        return self.export_dir / f"{job.job_id}.{job.file_format}"
+    
+    def _purge_expired(self) -> None:
+        """Delete job files older than the retention window"""
+        cutoff = time.time() - self.retention_seconds
+        for path in self.export_dir.glob("EXP-*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+    
+    async def start(
+        self,
+        account_id: Optional[uuid.UUID],
+        user_id: str,
+        product_status: Optional[ProductStatus],
+        file_format: str
+    ) -> ProductExport:
+        """Record the job and schedule it"""
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._purge_expired)
+        
+        job = ProductExport(
+            job_id=f"EXP-{uuid.uuid4().hex[:16].upper()}",
+            account_id=account_id,
+            user_id=uuid.UUID(user_id),
+            file_format=file_format,
+            product_status=product_status.value if product_status else None,
+            status=ExportStatus.PENDING,
+            row_count=0
+        )
+        async with AsyncSessionFactory() as db:
+            db.add(job)
+            await db.commit()
+        
+        task = asyncio.create_task(self.run(job, product_status))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        product_exports.labels("background").inc()
+        return job
+    
+    async def _set_status(self, job_id: str, **values) -> None:
+        try:
+            async with AsyncSessionFactory() as db:
+                await db.execute(
+                    update(ProductExport)
+                    .where(ProductExport.job_id == job_id)
+                    .values(**values, updated_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+        except Exception as e:
+            print(f"⚠️  Recording export {job_id} status failed: {str(e)[:100]}")
+    
+    async def run(self, job: ProductExport, product_status: Optional[ProductStatus]) -> None:
+        """Background task: stream the export into UPLOAD_PATH/exports"""
+        path = self.job_path(job)
+        partial = path.with_suffix(path.suffix + ".part")
+        progress = {"row_count": 0}
+        await self._set_status(job.job_id, status=ExportStatus.RUNNING, started_at=datetime.now(timezone.utc))
+        try:
+            with open(partial, "wb") as target:
+                async for chunk in self.stream(job.account_id, product_status, job.file_format, progress=progress):
+                    await asyncio.to_thread(target.write, chunk)
+            partial.replace(path)
+            await self._set_status(
+                job.job_id,
+                status=ExportStatus.COMPLETED,
+                row_count=progress["row_count"],
+                file_size=path.stat().st_size,
+                finished_at=datetime.now(timezone.utc)
+            )
+        except asyncio.CancelledError:
+            partial.unlink(missing_ok=True)
+            await self._set_status(
+                job.job_id, status=ExportStatus.FAILED, error="Interrupted by shutdown", finished_at=datetime.now(timezone.utc)
+            )
+            raise
+        except Exception as e:
+            partial.unlink(missing_ok=True)
+            print(f"⚠️  Product export {job.job_id} failed: {str(e)[:100]}")
+            await self._set_status(
+                job.job_id, status=ExportStatus.FAILED, error=str(e)[:500], finished_at=datetime.now(timezone.utc)
+            )
+    
+    async def close(self) -> None:
+        """Cancel running jobs (marked failed)"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Global product exporter instance
+product_exporter = ProductExporter(
+    fetch_rows=settings.export_fetch_rows,
+    inline_max_rows=settings.export_inline_max_rows,
+    retention_hours=settings.export_retention_hours,
+    export_dir=Path(settings.upload_path) / "exports"
+)
@@ -0,0 +1,143 @@
+# ========================================
+# STOCKTECH - Catalog Facets (Sidebar Counts)
+# ========================================
+
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, literal_column, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models import Brand, Category, Product, ProductCondition, ProductStatus
+
+@dataclass(frozen=True)
+class FacetFilters:
+    """Current catalog filter set (hashable: doubles as the cache signature)"""
+    category_id: Optional[uuid.UUID] = None
+    brand_id: Optional[uuid.UUID] = None
+    condition: Optional[ProductCondition] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+
+# GROUPING() bitmask over (category_id, brand_id, condition, price_band):
+# a bit is set when that column is rolled up in the row's grouping set
+_CATEGORY_SET = 0b0111
+_BRAND_SET = 0b1011
+_CONDITION_SET = 0b1101
+_PRICE_BAND_SET = 0b1110
+_TOTAL_SET = 0b1111
+
+_facet_cache = TTLCache(
+    ttl_seconds=settings.facet_cache_ttl_seconds,
+    max_entries=settings.facet_cache_max_entries
+)
+
+def _price_band_expression(bounds: List[int]):
+    """
+    width_bucket() over the configured band bounds
+    Inlined (not bound) so GROUP BY and SELECT share the exact same expression
+    """
+    array_sql = "ARRAY[" + ",".join(str(int(bound)) for bound in bounds) + "]::numeric[]"
+    return func.width_bucket(Product.price, literal_column(array_sql))
+
+def _band_range(bucket: int, bounds: List[int]) -> Dict:
+    """Map a width_bucket index back to {"min": .., "max": ..}"""
+    if bucket <= 0:
+        return {"min": None, "max": bounds[0]}
+    if bucket >= len(bounds):
+        return {"min": bounds[-1], "max": None}
+    return {"min": bounds[bucket - 1], "max": bounds[bucket]}
+
+def _build_facet_query(filters: FacetFilters, bounds: List[int]):
+    band = _price_band_expression(bounds)
+    grouping_id = func.grouping(Product.category_id, Product.brand_id, Product.condition, band)
+    
+    stmt = (
+        select(
+            grouping_id.label("grouping_id"),
+            Product.category_id,
+            Category.name,
+            Product.brand_id,
+            Brand.name,
+            Product.condition,
+            band.label("price_band"),
+            func.count().label("count")
+        )
+        .select_from(Product)
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(Brand, Brand.id == Product.brand_id)
+        .where(Product.status == ProductStatus.ACTIVE)
+        .group_by(func.grouping_sets(
+            tuple_(Product.category_id, Category.name),
+            tuple_(Product.brand_id, Brand.name),
+            tuple_(Product.condition),
+            tuple_(band),
+            tuple_()
+        ))
+    )
+    
+    if filters.category_id is not None:
+        stmt = stmt.where(Product.category_id == filters.category_id)
+    if filters.brand_id is not None:
+        stmt = stmt.where(Product.brand_id == filters.brand_id)
+    if filters.condition is not None:
+        stmt = stmt.where(Product.condition == filters.condition)
+    if filters.min_price is not None:
+        stmt = stmt.where(Product.price >= filters.min_price)
+    if filters.max_price is not None:
+        stmt = stmt.where(Product.price <= filters.max_price)
+    
+    return stmt
+
+async def compute_facets(db: AsyncSession, filters: FacetFilters) -> Dict:
+    """Compute every facet for the filter set in a single grouped query"""
+    bounds = sorted(settings.facet_price_bands)
+    result = await db.execute(_build_facet_query(filters, bounds))
+    
+    facets = {
+        "total": 0,
+        "categories": [],
+        "brands": [],
+        "conditions": [],
+        "price_bands": [],
+    }
+    
+    for grouping_id, category_id, category_name, brand_id, brand_name, condition, band, count in result.all():
+        if grouping_id == _CATEGORY_SET:
+            facets["categories"].append({
+                "id": str(category_id) if category_id else None,
+                "name": category_name,
+                "count": count
+            })
+        elif grouping_id == _BRAND_SET:
+            facets["brands"].append({
+                "id": str(brand_id) if brand_id else None,
+                "name": brand_name,
+                "count": count
+            })
+        elif grouping_id == _CONDITION_SET:
+            facets["conditions"].append({"value": condition.value, "count": count})
+        elif grouping_id == _PRICE_BAND_SET:
+            facets["price_bands"].append({**_band_range(band, bounds), "bucket": band, "count": count})
+        elif grouping_id == _TOTAL_SET:
+            facets["total"] = count
+    
+    for key in ("categories", "brands", "conditions"):
+        facets[key].sort(key=lambda item: item["count"], reverse=True)
+    facets["price_bands"].sort(key=lambda item: item["bucket"])
+    
+    return facets
+
+async def get_facets(db: AsyncSession, filters: FacetFilters) -> Dict:
+    """Facets for the filter set, cached per signature for facet_cache_ttl_seconds"""
+    cached = _facet_cache.get(filters)
+    if cached is not None:
+        return cached
+    
+    facets = await compute_facets(db, filters)
+    _facet_cache.set(filters, facets)
+    return facets
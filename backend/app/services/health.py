@@ -0,0 +1,143 @@
+# ========================================
+# STOCKTECH - Background Health Prober
+# ========================================
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from ..clients.avadmin_client import avadmin_client
+from ..core.config import settings
+from ..core.database import REPLICA_LAG_SQL, engine, replica_engine, replica_router
+from ..core.metrics import dependency_probe_duration, dependency_up
+from ..core.pool import InstrumentedPool
+
+@dataclass
+class ProbeResult:
+    """Outcome of the latest probe of one dependency"""
+    healthy: bool
+    latency_ms: float
+    checked_at: float
+    error: Optional[str] = None
+
+async def probe_database() -> bool:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    return True
+
+async def probe_avadmin() -> bool:
+    return await avadmin_client.health_check(budget=settings.health_probe_timeout_seconds)
+
+async def probe_replica() -> bool:
+    """Reachable and within the lag budget; feeds the read router either way"""
+    try:
+        async with replica_engine.connect() as conn:
+            lag = (await conn.execute(text(REPLICA_LAG_SQL))).scalar()
+    except BaseException:  # Includes the prober's timeout cancellation
+        replica_router.record_lag(None)
+        raise
+    if lag is None:  # Receiver down and nothing replayed yet
+        replica_router.record_lag(None)
+        raise RuntimeError("replica lag unknown")
+    lag = float(lag)
+    replica_router.record_lag(lag)
+    if lag > replica_router.max_lag:
+        raise RuntimeError(f"replica lag {lag:.1f}s")
+    return True
+
+def _pool_stats(target=engine) -> Dict[str, Any]:
+    pool = target.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}  # NullPool and friends keep no connections
+    stats = {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
+    if isinstance(pool, InstrumentedPool):
+        stats.update(limit=pool.connection_limit(), waiting=pool.waiting)
+    return stats
+
+class HealthProber:
+    """
+    Probes dependencies on an interval so health endpoints answer from memory
+    Only `critical` dependencies affect readiness
+    """
+    
+    def __init__(self, interval: float, timeout: float, stale_after: float, critical: List[str]):
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.critical = critical
+        self.probes: Dict[str, Callable[[], Awaitable[bool]]] = {
+            "database": probe_database,
+            "avadmin": probe_avadmin,
+        }
+        if replica_router.enabled:
+            self.probes["replica"] = probe_replica
+        self.results: Dict[str, ProbeResult] = {}
+    
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[bool]]) -> None:
+        start = time.perf_counter()
+        error = None
+        try:
+            healthy = bool(await asyncio.wait_for(probe(), timeout=self.timeout))
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timeout after {self.timeout}s"
+        except Exception as e:
+            healthy, error = False, str(e)[:200]
+        latency = time.perf_counter() - start
+        
+        dependency_probe_duration.labels(name).observe(latency)
+        dependency_up.labels(name).set(1 if healthy else 0)
+        self.results[name] = ProbeResult(healthy, round(latency * 1000, 2), time.time(), error)
+    
+    async def probe_all(self) -> Dict[str, ProbeResult]:
+        await asyncio.gather(*(self._probe(name, probe) for name, probe in self.probes.items()))
+        return self.results
+    
+    async def run(self) -> None:
+        """Background task: re-probe every `interval` seconds"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe_all()
+    
+    def is_healthy(self, name: str) -> bool:
+        """Latest probe succeeded and is recent enough to trust"""
+        result = self.results.get(name)
+        return (
+            result is not None
+            and result.healthy
+            and time.time() - result.checked_at <= self.stale_after
+        )
+    
+    def is_ready(self) -> bool:
+        return all(self.is_healthy(name) for name in self.critical)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Readiness plus per-dependency details (no I/O)"""
+        snapshot = {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "dependencies": {
+                name: {
+                    "healthy": self.is_healthy(name),
+                    "critical": name in self.critical,
+                    "latency_ms": result.latency_ms,
+                    "checked_at": result.checked_at,
+                    "error": result.error,
+                }
+                for name, result in self.results.items()
+            },
+            "database_pool": _pool_stats(),
+        }
+        if replica_router.enabled:
+            snapshot["replica_pool"] = _pool_stats(replica_engine)
+            snapshot["replica_lag_seconds"] = replica_router.lag
+        return snapshot
+
+# Global prober instance
+health_prober = HealthProber(
+    interval=settings.health_probe_interval_seconds,
+    timeout=settings.health_probe_timeout_seconds,
+    stale_after=settings.health_stale_after_seconds,
+    critical=settings.health_critical_dependencies
+)
@@ -0,0 +1,385 @@
+# ========================================
+# STOCKTECH - Import Rows (Spreadsheet Parsing and Validation)
+# ========================================
+#
+# Readers stream (row_number, cells) tuples from CSV or XLSX files without
+# loading the whole sheet; validate_rows() turns a chunk of them into
+# staging records plus per-row errors. validate_rows runs in the importer's
+# process pool, so this module keeps its imports light.
+
+import codecs
+import csv
+import itertools
+import re
+import unicodedata
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.product import ProductCondition, ProductStatus
+
+Row = Tuple[int, Sequence[Any]]              # (1-based row number, cells)
+RowError = Tuple[int, Optional[str], Optional[str], str]  # (row, code, field, message)
+
+class ImportFileError(ValueError):
+    """The file itself cannot be imported (format, header, size)"""
+
+# ==========================================
+# COLUMNS
+# ==========================================
+
+# Spreadsheet field -> accepted header spellings (normalized, see _normalize)
+FIELD_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "code": ("code", "codigo", "sku"),
+    "name": ("name", "nome", "produto"),
+    "description": ("description", "descricao"),
+    "price": ("price", "preco", "preco_venda"),
+    "original_price": ("original_price", "preco_original", "preco_de"),
+    "cost_price": ("cost_price", "preco_custo", "custo"),
+    "stock_quantity": ("stock_quantity", "stock", "estoque", "quantidade"),
+    "min_stock_alert": ("min_stock_alert", "estoque_minimo"),
+    "condition": ("condition", "condicao"),
+    "status": ("status", "situacao"),
+    "category": ("category", "categoria"),
+    "brand": ("brand", "marca"),
+    "keywords": ("keywords", "palavras_chave"),
+    "weight_kg": ("weight_kg", "peso_kg", "peso"),
+    "dimensions": ("dimensions", "dimensoes"),
+    "allows_negotiation": ("allows_negotiation", "aceita_negociacao"),
+    "min_negotiation_price": ("min_negotiation_price", "preco_minimo"),
+}
+
+REQUIRED_FIELDS = ("code", "name", "price")
+
+# Staging record layout: row_number, then one products column per field
+STAGING_COLUMNS = (
+    "row_number", "code", "name", "description", "price", "original_price", "cost_price",
+    "stock_quantity", "min_stock_alert", "condition", "status", "category_id", "brand_id",
+    "keywords", "weight_kg", "dimensions", "allows_negotiation", "min_negotiation_price",
+)
+
+# products column written by each spreadsheet field
+FIELD_COLUMNS = {field: field for field in FIELD_ALIASES}
+FIELD_COLUMNS.update(category="category_id", brand="brand_id")
+
+CONDITION_ALIASES = {
+    "novo": ProductCondition.NEW,
+    "usado_excelente": ProductCondition.USED_EXCELLENT,
+    "usado_bom": ProductCondition.USED_GOOD,
+    "usado_regular": ProductCondition.USED_FAIR,
+    "recondicionado": ProductCondition.REFURBISHED,
+}
+
+# Imports may only create/hide listings; reserved/out-of-stock are set by sales
+# and are ignored on import (so an edited export can be imported back)
+SALES_STATUSES = {ProductStatus.RESERVED.name, ProductStatus.OUT_OF_STOCK.name}
+STATUS_ALIASES = {
+    "draft": ProductStatus.DRAFT,
+    "rascunho": ProductStatus.DRAFT,
+    "active": ProductStatus.ACTIVE,
+    "ativo": ProductStatus.ACTIVE,
+    "inactive": ProductStatus.INACTIVE,
+    "inativo": ProductStatus.INACTIVE,
+}
+
+TRUE_VALUES = {"1", "true", "sim", "s", "yes", "y", "x"}
+FALSE_VALUES = {"0", "false", "nao", "n", "no"}
+
+MAX_PRICE = Decimal("99999999.99")  # Numeric(10, 2)
+MAX_WEIGHT = Decimal("99999.999")   # Numeric(8, 3)
+CENTS = Decimal("0.01")
+GRAMS = Decimal("0.001")
+
+# Text starting with these is a formula to Excel/LibreOffice; CSV exports
+# prefix such cells with ' and imports drop it again
+FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+THOUSANDS_GROUPED = re.compile(r"^-?\d{1,3}(\.\d{3})+$")  # 1.500 / 12.345.678
+
+def _normalize(value: Any) -> str:
+    """Lowercase, strip accents and use _ between words ("Preço Venda" -> "preco_venda")"""
+    text = unicodedata.normalize("NFKD", str(value)).encode("ascii", "ignore").decode()
+    return "_".join(text.lower().replace("-", " ").split())
+
+def resolve_header(cells: Sequence[Any]) -> Dict[str, int]:
+    """Map spreadsheet fields to column positions; unknown columns are ignored"""
+    aliases = {alias: field for field, names in FIELD_ALIASES.items() for alias in names}
+    header: Dict[str, int] = {}
+    for position, cell in enumerate(cells):
+        field = aliases.get(_normalize(cell)) if cell is not None else None
+        if field and field not in header:
+            header[field] = position
+    
+    missing = [field for field in REQUIRED_FIELDS if field not in header]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+    return header
+
+def taxonomy_key(value: Any) -> str:
+    """Lookup key for category/brand cells (matches slug or name)"""
+    return _normalize(value).replace("_", "-")
+
+# ==========================================
+# READERS
+# ==========================================
+
+def _csv_rows(path: str) -> Iterator[Row]:
+    with open(path, "rb") as raw:
+        sample = raw.read(65536)
+    try:
+        sample.decode("utf-8")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the sample boundary is still UTF-8
+        encoding = "utf-8-sig" if e.start >= len(sample) - 3 else "cp1252"  # Excel "CSV (separado por vírgulas)"
+    
+    first_line = sample.decode(encoding, "ignore").splitlines()[0] if sample else ""
+    delimiter = max(",;\t", key=first_line.count)
+    
+    with codecs.open(path, "r", encoding=encoding, errors="replace") as handle:
+        for row_number, cells in enumerate(csv.reader(handle, delimiter=delimiter), start=1):
+            yield row_number, cells
+
+def _xlsx_rows(path: str) -> Iterator[Row]:
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row_number, cells in enumerate(workbook.active.iter_rows(values_only=True), start=1):
+            yield row_number, cells
+    finally:
+        workbook.close()
+
+READERS: Dict[str, Callable[[str], Iterator[Row]]] = {
+    "csv": _csv_rows,
+    "xlsx": _xlsx_rows,
+}
+
+def open_rows(path: str, file_format: str) -> Tuple[Dict[str, int], Iterator[Row]]:
+    """Read the header row; returns (header, iterator over the data rows)"""
+    rows = READERS[file_format](path)
+    try:
+        _, header_cells = next(rows)
+    except StopIteration:
+        raise ImportFileError("The file is empty")
+    except Exception as e:
+        raise ImportFileError(f"Unreadable {file_format} file: {str(e)[:200]}") from e
+    return resolve_header(header_cells), rows
+
+def estimate_rows(path: str, file_format: str) -> Optional[int]:
+    """Data rows, cheaply (line count for CSV, sheet dimension for XLSX)"""
+    if file_format == "csv":
+        with open(path, "rb") as raw:
+            lines = sum(block.count(b"\n") for block in iter(lambda: raw.read(1 << 20), b""))
+        return max(lines - 1, 0)
+    
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    try:
+        max_row = workbook.active.max_row
+    finally:
+        workbook.close()
+    return max(max_row - 1, 0) if max_row else None
+
+def take_chunk(rows: Iterator[Row], size: int) -> List[Row]:
+    """Next `size` rows (fewer at the end of the file); runs in a thread"""
+    return list(itertools.islice(rows, size))
+
+# ==========================================
+# VALIDATION (process pool)
+# ==========================================
+
+class _Invalid(ValueError):
+    pass
+
+def _text(value: Any, max_length: Optional[int] = None) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # XLSX numeric codes: 123.0 -> "123"
+    text = str(value).strip()
+    if len(text) > 1 and text[0] == "'" and text[1] in FORMULA_PREFIXES:
+        text = text[1:]
+    if not text:
+        return None
+    if max_length and len(text) > max_length:
+        raise _Invalid(f"Longer than {max_length} characters")
+    return text
+
+def _decimal(value: Any, grouped: bool = False) -> Optional[Decimal]:
+    """
+    Number cell; "1.234,56" and "1234.56" both work. With `grouped` (money and
+    quantities) "1.500" is the BRL thousands grouping, 1500; weights keep the
+    decimal point, as exported (1.500 kg)
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return Decimal(str(value))
+    text = _text(value)
+    if text is None:
+        return None
+    
+    text = text.replace("R$", "").replace(" ", "")
+    if "," in text:
+        text = text.replace(".", "").replace(",", ".")  # 1.234,56 -> 1234.56
+    elif grouped and THOUSANDS_GROUPED.match(text):
+        text = text.replace(".", "")                    # 1.500 -> 1500
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        raise _Invalid(f"Not a number: {value}")
+    if not number.is_finite():
+        raise _Invalid(f"Not a number: {value}")
+    return number
+
+def _money(value: Any) -> Optional[Decimal]:
+    number = _decimal(value, grouped=True)
+    if number is None:
+        return None
+    if number < 0 or number > MAX_PRICE:
+        raise _Invalid(f"Must be between 0 and {MAX_PRICE}")
+    return number.quantize(CENTS)
+
+def _weight(value: Any) -> Optional[Decimal]:
+    number = _decimal(value)
+    if number is None:
+        return None
+    if number < 0 or number > MAX_WEIGHT:
+        raise _Invalid(f"Must be between 0 and {MAX_WEIGHT}")
+    return number.quantize(GRAMS)
+
+def _quantity(value: Any) -> Optional[int]:
+    number = _decimal(value, grouped=True)
+    if number is None:
+        return None
+    if number != number.to_integral_value() or number < 0 or number > 2147483647:
+        raise _Invalid(f"Must be a whole number >= 0: {value}")
+    return int(number)
+
+def _boolean(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    text = _text(value)
+    if text is None:
+        return None
+    key = _normalize(text)
+    if key in TRUE_VALUES:
+        return True
+    if key in FALSE_VALUES:
+        return False
+    raise _Invalid(f"Expected sim/não: {value}")
+
+def _choice(aliases: Dict[str, Any], enum_type) -> Callable[[Any], Optional[str]]:
+    """Parser for enum cells: values, names or Portuguese aliases -> enum name"""
+    lookup = {**{member.value: member for member in enum_type}, **aliases}
+    
+    def parse(value: Any) -> Optional[str]:
+        text = _text(value)
+        if text is None:
+            return None
+        member = lookup.get(_normalize(text))
+        if member is None:
+            raise _Invalid(f"Unknown value: {value}")
+        return member.name  # PostgreSQL enum labels are the member names
+    
+    return parse
+
+_condition = _choice(CONDITION_ALIASES, ProductCondition)
+_any_status = _choice(STATUS_ALIASES, ProductStatus)
+
+def _status(value: Any) -> Optional[str]:
+    """Sales-managed statuses stage NULL: the current (or default) status stays"""
+    status = _any_status(value)
+    return None if status in SALES_STATUSES else status
+
+# Blank cells stage NULL: new products get INSERT_DEFAULTS, existing ones keep their value
+PARSERS: Dict[str, Callable[[Any], Any]] = {
+    "code": lambda value: (_text(value, 20) or "").upper() or None,
+    "name": lambda value: _text(value, 200),
+    "description": _text,
+    "price": _money,
+    "original_price": _money,
+    "cost_price": _money,
+    "stock_quantity": _quantity,
+    "min_stock_alert": _quantity,
+    "condition": _condition,
+    "status": _status,
+    "keywords": lambda value: _text(value, 500),
+    "weight_kg": _weight,
+    "dimensions": lambda value: _text(value, 50),
+    "allows_negotiation": _boolean,
+    "min_negotiation_price": _money,
+}
+
+# products column -> SQL default for new products when the cell is blank or absent
+INSERT_DEFAULTS = {
+    "stock_quantity": "0",
+    "min_stock_alert": "5",
+    "condition": f"'{ProductCondition.NEW.name}'",
+    "status": f"'{ProductStatus.DRAFT.name}'",
+    "allows_negotiation": "true",
+}
+
+def validate_rows(
+    rows: List[Row],
+    header: Dict[str, int],
+    categories: Dict[str, uuid.UUID],
+    brands: Dict[str, uuid.UUID]
+) -> Tuple[List[tuple], List[RowError]]:
+    """
+    Parse a chunk into staging records (STAGING_COLUMNS order) and row errors
+    Blank rows are skipped; a row with any error is rejected as a whole
+    """
+    records: List[tuple] = []
+    errors: List[RowError] = []
+    taxonomies = {"category": categories, "brand": brands}
+    
+    for row_number, cells in rows:
+        if all(cell is None or str(cell).strip() == "" for cell in cells):
+            continue
+        
+        def cell(field: str) -> Any:
+            position = header.get(field)
+            return cells[position] if position is not None and position < len(cells) else None
+        
+        values: Dict[str, Any] = {}
+        row_errors: List[Tuple[str, str]] = []
+        for field, parse in PARSERS.items():
+            try:
+                values[field] = parse(cell(field))
+            except (_Invalid, ValueError) as e:
+                row_errors.append((field, str(e)))
+        
+        for field, lookup in taxonomies.items():
+            raw = _text(cell(field))
+            values[field] = None
+            if raw is not None:
+                values[field] = lookup.get(taxonomy_key(raw))
+                if values[field] is None:
+                    row_errors.append((field, f"Unknown {field}: {raw}"))
+        
+        for field in REQUIRED_FIELDS:
+            if field in values and values[field] is None:
+                row_errors.append((field, "Required"))
+        if values.get("price") is not None and values["price"] <= 0:
+            row_errors.append(("price", "Must be greater than zero"))
+        if (
+            values.get("min_negotiation_price") is not None
+            and values.get("price") is not None
+            and values["min_negotiation_price"] > values["price"]
+        ):
+            row_errors.append(("min_negotiation_price", "Above the price"))
+        
+        code = values.get("code") or _text(cell("code"))
+        if row_errors:
+            errors.extend((row_number, code, field, message[:500]) for field, message in row_errors)
+            continue
+        
+        records.append((
+            row_number, values["code"], values["name"], values["description"], values["price"],
+            values["original_price"], values["cost_price"], values["stock_quantity"],
+            values["min_stock_alert"], values["condition"], values["status"], values["category"],
+            values["brand"], values["keywords"], values["weight_kg"], values["dimensions"],
+            values["allows_negotiation"], values["min_negotiation_price"],
+        ))
+    
+    return records, errors
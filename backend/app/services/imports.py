@@ -0,0 +1,408 @@
+# ========================================
+# STOCKTECH - Bulk Product Import (CSV/XLSX)
+# ========================================
+#
+# Pipeline per uploaded file (one background task per import):
+#   1. Rows are read in chunks of IMPORT_CHUNK_ROWS (openpyxl read-only mode
+#      for XLSX), so memory stays bounded by chunk size x workers in flight
+#   2. Each chunk is validated in a process pool (validate_rows)
+#   3. Valid rows are COPYed into a temporary staging table and merged into
+#      products by code (UPDATE of the account's products, then INSERT of new
+#      codes), in one transaction per chunk together with its row errors and
+#      the batch progress counters
+
+import asyncio
+import multiprocessing
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory, note_account_write
+from ..core.metrics import product_import_rows, product_import_stage_seconds
+from ..models.category import Brand, Category
+from ..models.imports import ImportStatus, ProductImport
+from .import_rows import (
+    FIELD_COLUMNS,
+    INSERT_DEFAULTS,
+    STAGING_COLUMNS,
+    ImportFileError,
+    RowError,
+    estimate_rows,
+    open_rows,
+    take_chunk,
+    taxonomy_key,
+    validate_rows,
+)
+from .quota import QuotaExceededError, quota_ledger
+from .response_cache import mark_products_changed
+
+IMPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+# Dropped at commit, so it never outlives the chunk's transaction (PgBouncer-safe)
+CREATE_STAGING_SQL = text("""
+    CREATE TEMP TABLE product_import_staging (
+        row_number integer NOT NULL,
+        code varchar(20) NOT NULL,
+        name varchar(200) NOT NULL,
+        description text,
+        price numeric(10, 2) NOT NULL,
+        original_price numeric(10, 2),
+        cost_price numeric(10, 2),
+        stock_quantity integer,
+        min_stock_alert integer,
+        condition text,
+        status text,
+        category_id uuid,
+        brand_id uuid,
+        keywords varchar(500),
+        weight_kg numeric(8, 3),
+        dimensions varchar(50),
+        allows_negotiation boolean,
+        min_negotiation_price numeric(10, 2)
+    ) ON COMMIT DROP
+""")
+
+# Codes in the chunk that would create products (quota)
+COUNT_NEW_CODES_SQL = text("""
+    SELECT count(*) FROM product_import_staging s
+    WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.code = s.code)
+""")
+
+MERGE_COLUMNS = STAGING_COLUMNS[1:]
+
+# Existing products of this account; blank cells (NULL) keep the current value
+UPDATE_SQL = """
+    UPDATE products AS p SET
+        {updates}
+    FROM product_import_staging s
+    WHERE p.code = s.code AND p.account_id = :account_id
+    RETURNING p.id, p.code
+"""
+
+# New codes; blank cells get INSERT_DEFAULTS. A code inserted concurrently by
+# another account is skipped here and reported as taken
+INSERT_SQL = """
+    INSERT INTO products (
+        id, account_id, user_id, {columns},
+        specifications, images, is_featured, shipping_required,
+        view_count, contact_count, favorite_count, is_imported, import_batch_id,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), :account_id, :user_id, {values},
+        '{{}}'::jsonb, '[]'::jsonb, false, true,
+        0, 0, 0, true, :batch_id,
+        now(), now()
+    FROM product_import_staging s
+    WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.code = s.code)
+    ON CONFLICT (code) DO NOTHING
+    RETURNING id, code
+"""
+
+ERROR_COLUMNS = ("id", "batch_id", "row_number", "code", "field", "message")
+
+ENUM_CASTS = {"condition": "productcondition", "status": "productstatus"}
+
+def _cast(column: str, expression: str) -> str:
+    return f"({expression})::{ENUM_CASTS[column]}" if column in ENUM_CASTS else expression
+
+def merge_sql(header_fields: Set[str]) -> tuple:
+    """(update, insert) statements for a file's columns (absent columns keep their current values)"""
+    values = ", ".join(
+        _cast(column, f"COALESCE(s.{column}, {INSERT_DEFAULTS[column]})" if column in INSERT_DEFAULTS else f"s.{column}")
+        for column in MERGE_COLUMNS
+    )
+    updates = [
+        f"{column} = COALESCE({_cast(column, f's.{column}')}, p.{column})"
+        for field, column in FIELD_COLUMNS.items()
+        if field in header_fields and field != "code"
+    ]
+    updates += ["import_batch_id = :batch_id", "updated_at = now()"]
+    return (
+        text(UPDATE_SQL.format(updates=",\n        ".join(updates))),
+        text(INSERT_SQL.format(columns=", ".join(MERGE_COLUMNS), values=values)),
+    )
+
+async def load_taxonomies(db: AsyncSession) -> tuple:
+    """Category and brand ids keyed by slug and by name (see taxonomy_key)"""
+    lookups = []
+    for model in (Category, Brand):
+        rows = (await db.execute(select(model.id, model.slug, model.name).where(model.is_active))).all()
+        lookup = {}
+        for row in rows:
+            lookup[taxonomy_key(row.name)] = row.id
+            lookup[taxonomy_key(row.slug)] = row.id
+        lookups.append(lookup)
+    return tuple(lookups)
+
+def _copy_upload(source, path: Path, limit: int) -> int:
+    """Stream an upload to disk; raises ImportFileError past `limit` bytes"""
+    size = 0
+    with open(path, "wb") as target:
+        while block := source.read(1 << 20):
+            size += len(block)
+            if size > limit:
+                raise ImportFileError(f"File larger than {limit // (1024 * 1024)}MB")
+            target.write(block)
+    return size
+
+class ProductImporter:
+    """Runs bulk imports in background tasks; validation goes to a process pool"""
+    
+    def __init__(self, workers: int, chunk_rows: int, max_rows: int, max_file_size: int, upload_dir: Path):
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        self.max_rows = max_rows
+        self.max_file_size = max_file_size
+        self.upload_dir = upload_dir
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+    
+    # ==========================================
+    # UPLOAD
+    # ==========================================
+    
+    async def save_upload(self, file: UploadFile, batch_id: str) -> tuple:
+        """Store the upload under UPLOAD_PATH/imports; returns (path, format)"""
+        file_format = IMPORT_FORMATS.get(Path(file.filename or "").suffix.lower())
+        if file_format is None:
+            raise ImportFileError("Only .csv and .xlsx files can be imported")
+        
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        path = self.upload_dir / f"{batch_id}.{file_format}"
+        try:
+            await asyncio.to_thread(_copy_upload, file.file, path, self.max_file_size)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return path, file_format
+    
+    async def start(self, db: AsyncSession, file: UploadFile, account_id: str, user_id: str) -> ProductImport:
+        """Save the file, record the batch and schedule it"""
+        batch_id = f"IMP-{uuid.uuid4().hex[:16].upper()}"
+        path, file_format = await self.save_upload(file, batch_id)
+        
+        batch = ProductImport(
+            batch_id=batch_id,
+            account_id=uuid.UUID(account_id),
+            user_id=uuid.UUID(user_id),
+            filename=(file.filename or path.name)[:255],
+            file_format=file_format,
+            status=ImportStatus.PENDING,
+            processed_rows=0,
+            inserted_rows=0,
+            updated_rows=0,
+            error_rows=0
+        )
+        db.add(batch)
+        try:
+            await db.commit()
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        
+        task = asyncio.create_task(self.run(batch_id, path, file_format, account_id, user_id))
+        self._tasks[batch_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(batch_id, None))
+        return batch
+    
+    # ==========================================
+    # PIPELINE
+    # ==========================================
+    
+    async def _set_progress(self, db: AsyncSession, batch_id: str, **values) -> None:
+        await db.execute(
+            update(ProductImport)
+            .where(ProductImport.batch_id == batch_id)
+            .values(**values, updated_at=datetime.now(timezone.utc))
+        )
+    
+    async def _write_errors(self, driver, batch_id: str, errors: Sequence[RowError]) -> None:
+        await driver.copy_records_to_table(
+            "product_import_errors",
+            records=[
+                (uuid.uuid4(), batch_id, row_number, (code or "")[:50] or None, field, message)
+                for row_number, code, field, message in errors
+            ],
+            columns=ERROR_COLUMNS
+        )
+    
+    async def _merge(
+        self,
+        batch_id: str,
+        account_id: str,
+        user_id: str,
+        statements: tuple,
+        records: List[tuple],
+        errors: List[RowError],
+        progress: dict
+    ) -> None:
+        """COPY a validated chunk into staging and merge it, with its errors and progress"""
+        start = time.perf_counter()
+        async with AsyncSessionFactory() as db:
+            lease = None
+            try:
+                inserted = updated = 0
+                if records:
+                    await db.execute(CREATE_STAGING_SQL)
+                    driver = (await (await db.connection()).get_raw_connection()).driver_connection
+                    await driver.copy_records_to_table("product_import_staging", records=records, columns=STAGING_COLUMNS)
+                    
+                    new_codes = (await db.execute(COUNT_NEW_CODES_SQL)).scalar_one()
+                    if new_codes:
+                        lease = await quota_ledger.acquire(db, account_id, "products", new_codes)
+                    
+                    params = {"account_id": uuid.UUID(account_id), "user_id": uuid.UUID(user_id), "batch_id": batch_id}
+                    update_sql, insert_sql = statements
+                    merged = (await db.execute(update_sql, params)).all()
+                    updated = len(merged)
+                    new_rows = (await db.execute(insert_sql, params)).all()
+                    inserted = len(new_rows)
+                    merged += new_rows
+                    
+                    # Codes that already belong to another account are left untouched
+                    merged_codes = {row.code for row in merged}
+                    errors.extend(
+                        (record[0], record[1], "code", "Code already used by another account")
+                        for record in records if record[1] not in merged_codes
+                    )
+                    mark_products_changed(db, [row.id for row in merged])
+                    if lease is not None:
+                        lease.amount = inserted
+                        quota_ledger.commit(db, lease)
+                        lease = None
+                
+                if errors:
+                    driver = (await (await db.connection()).get_raw_connection()).driver_connection
+                    await self._write_errors(driver, batch_id, errors)
+                
+                progress["inserted_rows"] += inserted
+                progress["updated_rows"] += updated
+                progress["error_rows"] += len({error[0] for error in errors})
+                await self._set_progress(db, batch_id, **progress)
+                note_account_write(db, account_id)
+                await db.commit()
+            except BaseException:
+                if lease is not None:
+                    quota_ledger.release(lease)
+                await db.rollback()
+                raise
+        
+        product_import_rows.labels("inserted").inc(inserted)
+        product_import_rows.labels("updated").inc(updated)
+        product_import_rows.labels("error").inc(len({error[0] for error in errors}))
+        product_import_stage_seconds.labels("merge").observe(time.perf_counter() - start)
+    
+    async def _validate(self, chunk, header, categories, brands):
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), validate_rows, chunk, header, categories, brands)
+        finally:
+            product_import_stage_seconds.labels("validate").observe(time.perf_counter() - start)
+    
+    async def run(self, batch_id: str, path: Path, file_format: str, account_id: str, user_id: str) -> None:
+        """Background task: stream, validate and merge the file chunk by chunk"""
+        progress = {"processed_rows": 0, "inserted_rows": 0, "updated_rows": 0, "error_rows": 0}
+        pending: Deque[Tuple[int, asyncio.Future]] = deque()  # (chunk rows, validation)
+        seen_codes: Dict[str, int] = {}  # code -> first row, duplicates in the file are errors
+        rows = None
+        try:
+            async with AsyncSessionFactory() as db:
+                categories, brands = await load_taxonomies(db)
+                total_rows = await asyncio.to_thread(estimate_rows, str(path), file_format)
+                await self._set_progress(
+                    db, batch_id, status=ImportStatus.RUNNING, total_rows=total_rows, started_at=datetime.now(timezone.utc)
+                )
+                await db.commit()
+            
+            header, rows = await asyncio.to_thread(open_rows, str(path), file_format)
+            statements = merge_sql(set(header))
+            exhausted = False
+            while True:
+                # Read ahead while the pool validates, at most `workers` chunks in flight
+                while not exhausted and len(pending) < self.workers:
+                    chunk = await asyncio.to_thread(take_chunk, rows, self.chunk_rows)
+                    if not chunk:
+                        exhausted = True
+                        break
+                    if chunk[-1][0] - 1 > self.max_rows:
+                        raise ImportFileError(f"More than {self.max_rows} rows")
+                    pending.append((len(chunk), asyncio.ensure_future(self._validate(chunk, header, categories, brands))))
+                if not pending:
+                    break
+                
+                chunk_size, validation = pending.popleft()
+                records, errors = await validation
+                unique = []
+                for record in records:
+                    first_row = seen_codes.setdefault(record[1], record[0])
+                    if first_row == record[0]:
+                        unique.append(record)
+                    else:
+                        errors.append((record[0], record[1], "code", f"Duplicate of row {first_row}"))
+                
+                progress["processed_rows"] += chunk_size
+                await self._merge(batch_id, account_id, user_id, statements, unique, errors, progress)
+            
+            await self._finish(batch_id, account_id, ImportStatus.COMPLETED, total_rows=progress["processed_rows"])
+        except asyncio.CancelledError:
+            await self._finish(batch_id, account_id, ImportStatus.FAILED, error="Interrupted by shutdown")
+            raise
+        except (ImportFileError, QuotaExceededError) as e:
+            await self._finish(batch_id, account_id, ImportStatus.FAILED, error=str(e))
+        except Exception as e:
+            print(f"⚠️  Product import {batch_id} failed: {str(e)[:100]}")
+            await self._finish(batch_id, account_id, ImportStatus.FAILED, error=f"Internal error: {str(e)[:200]}")
+        finally:
+            for _, validation in pending:
+                validation.cancel()
+            if rows is not None:
+                try:
+                    rows.close()
+                except ValueError:
+                    pass  # Still running in a cancelled read thread; closed when collected
+            path.unlink(missing_ok=True)
+    
+    async def _finish(self, batch_id: str, account_id: str, status: ImportStatus, **values) -> None:
+        try:
+            async with AsyncSessionFactory() as db:
+                await self._set_progress(db, batch_id, status=status, finished_at=datetime.now(timezone.utc), **values)
+                note_account_write(db, account_id)
+                await db.commit()
+        except Exception as e:
+            print(f"⚠️  Recording import {batch_id} status failed: {str(e)[:100]}")
+    
+    async def close(self) -> None:
+        """Cancel running imports (marked failed) and stop the process pool"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+# Global product importer instance
+product_importer = ProductImporter(
+    workers=max(settings.import_workers, 1),
+    chunk_rows=settings.import_chunk_rows,
+    max_rows=settings.import_max_rows,
+    max_file_size=settings.import_max_file_size,
+    upload_dir=Path(settings.upload_path) / "imports"
+)
@@ -0,0 +1,82 @@
+# ========================================
+# STOCKTECH - Keyset (Cursor) Pagination
+# ========================================
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+from ..models import Product
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to another sort"""
+
+@dataclass(frozen=True)
+class KeysetSort:
+    """An ordering on (column, id) with the codecs for its cursor value"""
+    column: Any
+    descending: bool
+    dump: Callable[[Any], str]
+    load: Callable[[str], Any]
+
+# Every ordering ends on Product.id so ties never skip or repeat rows
+SORTS: Dict[str, KeysetSort] = {
+    "newest": KeysetSort(Product.created_at, True, datetime.isoformat, datetime.fromisoformat),
+    "oldest": KeysetSort(Product.created_at, False, datetime.isoformat, datetime.fromisoformat),
+    "price_asc": KeysetSort(Product.price, False, str, Decimal),
+    "price_desc": KeysetSort(Product.price, True, str, Decimal),
+}
+
+def encode_cursor(sort: str, row: Product) -> str:
+    """Build the opaque cursor pointing just after `row`"""
+    keyset = SORTS[sort]
+    payload = {
+        "s": sort,
+        "v": keyset.dump(getattr(row, keyset.column.key)),
+        "id": str(row.id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(sort: str, cursor: str) -> tuple:
+    """Return the (value, id) position encoded in a cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort:
+            raise InvalidCursorError("Cursor does not match the requested sort")
+        return SORTS[sort].load(payload["v"]), uuid.UUID(payload["id"])
+    except InvalidCursorError:
+        raise
+    except (binascii.Error, InvalidOperation, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+def apply_keyset(stmt: Select, sort: str, cursor: Optional[str], limit: int) -> Select:
+    """
+    Order `stmt` by the sort keyset and seek past `cursor`
+    Fetches limit + 1 rows so the caller can tell if there is a next page
+    """
+    keyset = SORTS[sort]
+    
+    if cursor:
+        value, last_id = decode_cursor(sort, cursor)
+        position = tuple_(keyset.column, Product.id)
+        if keyset.descending:
+            stmt = stmt.where(position < tuple_(value, last_id))
+        else:
+            stmt = stmt.where(position > tuple_(value, last_id))
+    
+    if keyset.descending:
+        stmt = stmt.order_by(keyset.column.desc(), Product.id.desc())
+    else:
+        stmt = stmt.order_by(keyset.column.asc(), Product.id.asc())
+    
+    return stmt.limit(limit + 1)
@@ -0,0 +1,194 @@
+# ========================================
+# STOCKTECH - Account Quota Ledger
+# ========================================
+
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..clients.avadmin_client import avadmin_client
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory
+from ..models.product import Product
+from ..models.transaction import Transaction
+from .usage import record_usage
+
+QuotaKey = Tuple[str, str]  # (account_id, kind)
+
+# Session.info key: leases committed in the session's transaction
+_LEASES_KEY = "quota_leases"
+
+# kind -> (AccountLimits field, column counted in our own tables)
+# Transactions are charged to the buyer account that opens them
+QUOTA_KINDS = {
+    "products": ("max_products", Product.account_id),
+    "transactions": ("max_transactions", Transaction.buyer_account_id),
+}
+
+class QuotaError(Exception):
+    """Quota cannot be granted"""
+
+class QuotaExceededError(QuotaError):
+    def __init__(self, account_id: str, kind: str, limit: int):
+        self.account_id = account_id
+        self.kind = kind
+        self.limit = limit
+        super().__init__(f"Account {account_id} reached its {kind} limit ({limit})")
+
+@dataclass
+class QuotaLease:
+    """Capacity held for a create that hasn't committed yet"""
+    account_id: str
+    kind: str
+    amount: int
+    expires_at: float
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+class QuotaLedger:
+    """
+    Quota accounting: limits come from the cached AvAdmin account, usage from
+    our own tables, and in-flight creates hold leases. Cached usage only serves
+    remaining() estimates; acquire() always recounts under an advisory lock
+    """
+    
+    def __init__(self, usage_ttl: float, lease_ttl: float):
+        self.lease_ttl = lease_ttl
+        # Values are one-item lists so commits can bump them without resetting the TTL
+        self._usage = TTLCache(ttl_seconds=usage_ttl, max_entries=10000)
+        self._leases: Dict[QuotaKey, Dict[uuid.UUID, QuotaLease]] = {}
+    
+    # ==========================================
+    # LIMITS AND USAGE
+    # ==========================================
+    
+    async def _limit(self, account_id: str, kind: str) -> int:
+        account = await avadmin_client.get_account(account_id)
+        if account is None:
+            raise QuotaError(f"Limits for account {account_id} are unavailable")
+        return getattr(account.limits, QUOTA_KINDS[kind][0])
+    
+    async def _count(self, db: AsyncSession, account_id: str, kind: str) -> int:
+        column = QUOTA_KINDS[kind][1]
+        result = await db.execute(select(func.count()).where(column == uuid.UUID(account_id)))
+        return result.scalar_one()
+    
+    async def _used(self, db: Optional[AsyncSession], account_id: str, kind: str) -> list:
+        key = (account_id, kind)
+        used = self._usage.get(key)
+        if used is None:
+            if db is None:
+                async with AsyncSessionFactory() as session:
+                    used = [await self._count(session, account_id, kind)]
+            else:
+                used = [await self._count(db, account_id, kind)]
+            self._usage.set(key, used)
+        return used
+    
+    def _leased(self, key: QuotaKey) -> int:
+        leases = self._leases.get(key)
+        if not leases:
+            return 0
+        
+        now = time.monotonic()
+        for lease_id in [lease.id for lease in leases.values() if lease.expires_at <= now]:
+            del leases[lease_id]  # Abandoned create
+        return sum(lease.amount for lease in leases.values())
+    
+    async def remaining(self, account_id: str, kind: str, db: Optional[AsyncSession] = None) -> int:
+        """Capacity left after committed usage and active leases"""
+        account_id = str(account_id)
+        limit = await self._limit(account_id, kind)
+        used = await self._used(db, account_id, kind)
+        return limit - used[0] - self._leased((account_id, kind))
+    
+    # ==========================================
+    # LEASES
+    # ==========================================
+    
+    async def acquire(self, db: AsyncSession, account_id: str, kind: str, amount: int = 1) -> QuotaLease:
+        """
+        Reserve `amount` units or raise QuotaExceededError
+        Takes an advisory lock held until `db` commits and recounts under it,
+        so creates for one account are serialized across workers (the cached
+        usage is per worker and may miss other workers' creates)
+        """
+        account_id = str(account_id)
+        key = (account_id, kind)
+        limit = await self._limit(account_id, kind)
+        
+        lock_key = func.hashtextextended(f"quota:{kind}:{account_id}", 0)
+        await db.execute(select(func.pg_advisory_xact_lock(lock_key)))
+        used = await self._count(db, account_id, kind)
+        self._usage.set(key, [used])
+        remaining = limit - used - self._leased(key)
+        
+        if amount > remaining:
+            raise QuotaExceededError(account_id, kind, limit)
+        
+        lease = QuotaLease(account_id, kind, amount, time.monotonic() + self.lease_ttl)
+        self._leases.setdefault(key, {})[lease.id] = lease
+        return lease
+    
+    def release(self, lease: QuotaLease) -> None:
+        """Give the capacity back (create failed)"""
+        self._leases.get((lease.account_id, lease.kind), {}).pop(lease.id, None)
+    
+    def commit(self, db: AsyncSession, lease: QuotaLease) -> None:
+        """
+        Queue the AvAdmin usage report in `db`; the caller must then commit `db`
+        The lease turns into cached usage when `db` commits (released on rollback)
+        """
+        sync_session = getattr(db, "sync_session", db)
+        sync_session.info.setdefault(_LEASES_KEY, []).append(lease)
+        record_usage(db, uuid.UUID(lease.account_id), lease.kind, lease.amount)
+    
+    def _settle(self, leases: List[QuotaLease], committed: bool) -> None:
+        for lease in leases:
+            self.release(lease)
+            used = self._usage.get((lease.account_id, lease.kind))
+            if committed and used is not None:
+                used[0] += lease.amount
+    
+    @asynccontextmanager
+    async def lease(self, db: AsyncSession, account_id: str, kind: str, amount: int = 1):
+        """
+        Hold quota around a create; released on error
+        Commit `db` after the block: usage is only counted once it commits
+        """
+        lease = await self.acquire(db, account_id, kind, amount)
+        try:
+            yield lease
+        except BaseException:
+            self.release(lease)
+            raise
+        self.commit(db, lease)
+    
+    def forget(self, account_id: str) -> None:
+        """Drop cached usage (e.g. after bulk deletes)"""
+        for kind in QUOTA_KINDS:
+            self._usage.delete((str(account_id), kind))
+
+# Global ledger instance
+quota_ledger = QuotaLedger(
+    usage_ttl=settings.quota_usage_ttl_seconds,
+    lease_ttl=settings.quota_lease_ttl_seconds
+)
+
+@event.listens_for(Session, "after_commit")
+def _settle_committed_leases(session):
+    leases = session.info.pop(_LEASES_KEY, None)
+    if leases:
+        quota_ledger._settle(leases, committed=True)
+
+@event.listens_for(Session, "after_rollback")
+def _settle_rolled_back_leases(session):
+    leases = session.info.pop(_LEASES_KEY, None)
+    if leases:
+        quota_ledger._settle(leases, committed=False)
@@ -0,0 +1,191 @@
+# ========================================
+# STOCKTECH - HTTP Response Cache (ETag / 304)
+# ========================================
+#
+# Catalog responses are cached as encoded bytes, keyed by the endpoint and its
+# validated parameters, so repeat anonymous browsing never reaches PostgreSQL.
+# Weak ETags are derived from the newest updated_at (and ids) of the rows
+# behind a response plus the category/brand names in it (renaming a category
+# does not touch its products); view/contact counters do not bump updated_at
+# and are not part of the validator.
+#
+# Entries are invalidated on commit of any session that wrote a Product,
+# Category or Brand. The cache is per worker: other workers converge within
+# settings.response_cache_ttl_seconds.
+
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..models import Brand, Category, Product
+from .serializers import clear_name_cache
+
+PRODUCTS_TAG = "products"              # Every listing/search response
+_ALL = "*"                             # Category/brand writes drop everything
+_PENDING_KEY = "response_cache_invalidations"
+
+def product_tag(product_id: uuid.UUID) -> str:
+    """Tag of the detail response of one product"""
+    return f"product:{product_id}"
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: bytes
+    tags: Tuple[str, ...] = ()
+    generation: int = 0                # Invalidation generation when the fill started
+
+class ResponseCache:
+    """
+    Encoded responses indexed by key, invalidated by tag
+    Invalidation records the generation per tag and entries are checked on
+    read, so there is no tag -> keys index to prune. Tags invalidated more
+    than a TTL ago are forgotten (every entry filled before then has expired).
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._generation = 0
+        self._floor = 0                # Fills started before this generation are dropped
+        self._invalidated: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()  # tag -> (generation, at)
+    
+    @property
+    def generation(self) -> int:
+        """Read before querying; pass to put() so fills racing an invalidation are dropped"""
+        return self._generation
+    
+    def _stale(self, tags: Iterable[str], generation: int) -> bool:
+        if generation < self._floor:
+            return True
+        return any(self._invalidated.get(tag, (-1, 0.0))[0] > generation for tag in tags)
+    
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None and self._stale(entry.tags, entry.generation):
+            self._entries.delete(key)
+            return None
+        return entry
+    
+    def put(self, key: Hashable, body: bytes, etag: str, tags: Iterable[str], generation: int) -> CachedResponse:
+        """Cache a response filled since `generation` (not stored if it went stale meanwhile)"""
+        entry = CachedResponse(etag=etag, body=body, tags=tuple(tags), generation=generation)
+        if not self._stale(entry.tags, generation):
+            self._entries.set(key, entry)
+        return entry
+    
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Make every entry carrying one of the tags stale"""
+        tags = set(tags)
+        if _ALL in tags:
+            self.clear()
+            return
+        
+        self._generation += 1
+        now = time.monotonic()
+        for tag in tags:
+            self._invalidated.pop(tag, None)
+            self._invalidated[tag] = (self._generation, now)
+        
+        # Oldest first; an entry filled before `at` expired by `at + ttl`
+        while self._invalidated:
+            tag, (generation, at) = next(iter(self._invalidated.items()))
+            if now - at <= self.ttl_seconds:
+                break
+            del self._invalidated[tag]
+            self._floor = max(self._floor, generation)  # Fills older than this are too slow to trust
+    
+    def clear(self) -> None:
+        self._generation += 1
+        self._floor = self._generation
+        self._entries.clear()
+        self._invalidated.clear()
+
+# Global cache instance
+response_cache = ResponseCache(
+    ttl_seconds=settings.response_cache_ttl_seconds,
+    max_entries=settings.response_cache_max_entries
+)
+
+# ==========================================
+# ETAGS AND RESPONSES
+# ==========================================
+
+def compute_etag(key: Hashable, products: Sequence[Product], items: Sequence[Dict] = ()) -> str:
+    """
+    Weak ETag from the request key, row ids, newest updated_at and the
+    category/brand names of the serialized `items`
+    Weak because view/contact counters in the body may differ between fills
+    """
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=16)
+    latest = max((product.updated_at for product in products), default=None)
+    digest.update(latest.isoformat().encode() if latest else b"-")
+    for product in products:
+        digest.update(product.id.bytes)
+    for item in items:
+        digest.update(repr((item.get("category"), item.get("brand"))).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def send_cached(request: Request, entry: CachedResponse) -> Response:
+    """200 with the cached body, or 304 when the client already has it"""
+    headers = {"ETag": entry.etag, "Cache-Control": "public, no-cache"}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+# ==========================================
+# INVALIDATION HOOKS
+# ==========================================
+
+def mark_products_changed(session, product_ids: Iterable[uuid.UUID]) -> None:
+    """
+    Register product changes made with Core/raw SQL (e.g. stock reservations)
+    Invalidation happens when `session` commits
+    """
+    sync_session = getattr(session, "sync_session", session)
+    pending = sync_session.info.setdefault(_PENDING_KEY, set())
+    pending.add(PRODUCTS_TAG)
+    pending.update(product_tag(product_id) for product_id in product_ids)
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Product):
+            pending.add(PRODUCTS_TAG)
+            if instance.id is not None:
+                pending.add(product_tag(instance.id))
+        elif isinstance(instance, (Category, Brand)):
+            pending.add(_ALL)
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        clear_name_cache()
+    response_cache.invalidate(pending)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,154 @@
+# ========================================
+# STOCKTECH - Catalog Search (PostgreSQL Full-Text + Trigram)
+# ========================================
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models import Product, ProductStatus
+
+# Must match the configuration used by products_search_vector_update()
+SEARCH_CONFIG = "portuguese"
+
+# (product, rank)
+SearchHit = Tuple[Product, float]
+
+def build_tsquery(term: str):
+    """Build a tsquery from user input (supports "quoted phrases", OR and -exclusions)"""
+    return func.websearch_to_tsquery(
+        cast(SEARCH_CONFIG, REGCONFIG),
+        func.unaccent(term)
+    )
+
+async def search_products(
+    db: AsyncSession,
+    term: str,
+    limit: int,
+    offset: int = 0
+) -> List[SearchHit]:
+    """
+    Ranked full-text search over active products
+    Uses the GIN index on products.search_vector
+    """
+    tsquery = build_tsquery(term)
+    rank = cast(func.ts_rank_cd(Product.search_vector, tsquery), Float).label("rank")
+    
+    stmt = (
+        select(Product, rank)
+        .where(
+            Product.search_vector.bool_op("@@")(tsquery),
+            Product.status == ProductStatus.ACTIVE
+        )
+        .order_by(rank.desc(), Product.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+# ==========================================
+# FUZZY (TRIGRAM) LOOKUP
+# ==========================================
+
+_CODE_SEPARATORS = re.compile(r"[\s\-_.]+")
+
+def normalize_code(term: str) -> str:
+    """Normalize a typed product code (e.g. "st 12345-a" becomes ST12345A)"""
+    return _CODE_SEPARATORS.sub("", term).upper()
+
+async def _apply_similarity_threshold(db: AsyncSession, threshold: float) -> None:
+    """Set pg_trgm thresholds for the current transaction only"""
+    value = str(threshold)
+    await db.execute(select(
+        func.set_config("pg_trgm.similarity_threshold", value, True),
+        func.set_config("pg_trgm.word_similarity_threshold", value, True)
+    ))
+
+async def fuzzy_search_products(
+    db: AsyncSession,
+    term: str,
+    limit: int,
+    offset: int = 0,
+    threshold: Optional[float] = None
+) -> List[SearchHit]:
+    """
+    Typo-tolerant lookup by product name or code
+    Uses the trigram indexes ix_products_name_trgm / ix_products_code_trgm
+    """
+    await _apply_similarity_threshold(
+        db, settings.search_similarity_threshold if threshold is None else threshold
+    )
+    code_term = normalize_code(term)
+    rank = func.greatest(
+        func.similarity(Product.name, term),
+        func.similarity(Product.code, code_term)
+    ).label("rank")
+    
+    stmt = (
+        select(Product, rank)
+        .where(
+            or_(Product.name.op("%")(term), Product.code.op("%")(code_term)),
+            Product.status == ProductStatus.ACTIVE
+        )
+        .order_by(rank.desc(), Product.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    
+    result = await db.execute(stmt)
+    return [tuple(row) for row in result.all()]
+
+async def suggest_terms(
+    db: AsyncSession,
+    term: str,
+    limit: Optional[int] = None,
+    threshold: Optional[float] = None
+) -> List[Dict]:
+    """
+    "Did you mean" suggestions: closest product names and codes
+    Returns [{"text": "iPhone 15 Pro Max", "type": "name", "score": 0.72}, ...]
+    """
+    limit = limit or settings.search_suggestion_limit
+    await _apply_similarity_threshold(
+        db, settings.search_similarity_threshold if threshold is None else threshold
+    )
+    
+    # Names: word similarity so "iphnoe 15" still finds "Apple iPhone 15 Pro Max"
+    name_score = func.max(func.word_similarity(term, Product.name)).label("score")
+    names = await db.execute(
+        select(Product.name, name_score)
+        .where(
+            literal(term).op("<%")(Product.name),
+            Product.status == ProductStatus.ACTIVE
+        )
+        .group_by(Product.name)
+        .order_by(name_score.desc())
+        .limit(limit)
+    )
+    
+    # Codes: KNN ordering over the GiST index
+    code_term = normalize_code(term)
+    code_score = func.similarity(Product.code, code_term).label("score")
+    codes = await db.execute(
+        select(Product.code, code_score)
+        .where(
+            Product.code.op("%")(code_term),
+            Product.status == ProductStatus.ACTIVE
+        )
+        .order_by(Product.code.op("<->")(code_term))
+        .limit(limit)
+    )
+    
+    suggestions = [
+        {"text": text, "type": "name", "score": float(score)} for text, score in names.all()
+    ] + [
+        {"text": text, "type": "code", "score": float(score)} for text, score in codes.all()
+    ]
+    suggestions.sort(key=lambda item: item["score"], reverse=True)
+    return suggestions[:limit]
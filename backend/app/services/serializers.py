@@ -0,0 +1,169 @@
+# ========================================
+# STOCKTECH - Marketplace Serialization (Bulk)
+# ========================================
+#
+# List endpoints serialize whole pages at once: category/brand names are
+# resolved with one batched lookup (and cached briefly, they rarely change),
+# per-item derived fields are computed in a single pass, and the payload is
+# encoded straight to bytes with orjson.
+
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from fastapi import Response
+from sqlalchemy import any_, bindparam, literal, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.cache import TTLCache
+from ..core.formatting import format_brl, format_brl_column
+from ..models import Brand, Category, Product
+
+NameMap = Dict[uuid.UUID, str]
+
+# ("category" | "brand", id) -> name
+_name_cache = TTLCache(ttl_seconds=60, max_entries=20000)
+
+def clear_name_cache() -> None:
+    """Forget cached category/brand names (called when either table is written)"""
+    _name_cache.clear()
+
+def _orjson_default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(payload: Any) -> bytes:
+    """Encode a response payload to JSON bytes"""
+    return orjson.dumps(payload, default=_orjson_default)
+
+def json_response(payload: Any, status_code: int = 200) -> Response:
+    """Send a payload already encoded by dumps()"""
+    return Response(content=dumps(payload), status_code=status_code, media_type="application/json")
+
+def _any_id(ids: Iterable[uuid.UUID]):
+    """
+    `= ANY($1::uuid[])` instead of IN (...): one SQL string for any number of ids,
+    so the prepared statement is reused across pages
+    """
+    return any_(bindparam(None, list(ids), type_=ARRAY(UUID(as_uuid=True))))
+
+async def load_taxonomy_names(
+    db: AsyncSession,
+    products: Iterable[Product]
+) -> Tuple[NameMap, NameMap]:
+    """Category and brand names for a page of products (one query for cache misses)"""
+    category_names: NameMap = {}
+    brand_names: NameMap = {}
+    missing_categories = set()
+    missing_brands = set()
+    
+    for product in products:
+        for kind, entity_id, names, missing in (
+            ("category", product.category_id, category_names, missing_categories),
+            ("brand", product.brand_id, brand_names, missing_brands),
+        ):
+            if entity_id is None or entity_id in names:
+                continue
+            name = _name_cache.get((kind, entity_id))
+            if name is None:
+                missing.add(entity_id)
+            else:
+                names[entity_id] = name
+    
+    if missing_categories or missing_brands:
+        lookups = []
+        if missing_categories:
+            lookups.append(
+                select(literal("category").label("kind"), Category.id, Category.name)
+                .where(Category.id == _any_id(missing_categories))
+            )
+        if missing_brands:
+            lookups.append(
+                select(literal("brand").label("kind"), Brand.id, Brand.name)
+                .where(Brand.id == _any_id(missing_brands))
+            )
+        
+        stmt = lookups[0] if len(lookups) == 1 else union_all(*lookups)
+        result = await db.execute(stmt)
+        for kind, entity_id, name in result.all():
+            _name_cache.set((kind, entity_id), name)
+            (category_names if kind == "category" else brand_names)[entity_id] = name
+    
+    return category_names, brand_names
+
+def _image_urls(images: Optional[list]) -> Tuple[Optional[str], Optional[str]]:
+    """(primary_image_url, thumbnail_url) in one pass over the images"""
+    if not images:
+        return None, None
+    
+    chosen = images[0]
+    for image in images:
+        if image.get("is_primary", False):
+            chosen = image
+            break
+    
+    url = chosen.get("url")
+    return url, chosen.get("thumbnail", url)
+
+def marketplace_item(
+    product: Product,
+    category_name: Optional[str] = None,
+    brand_name: Optional[str] = None,
+    price_formatted: Optional[str] = None
+) -> Dict:
+    """Same shape as Product.to_marketplace_dict(), each derived field computed once"""
+    price = product.price
+    original_price = product.original_price
+    on_sale = bool(original_price and original_price > price)
+    primary_image, thumbnail = _image_urls(product.images)
+    
+    return {
+        "id": str(product.id),
+        "code": product.code,
+        "name": product.name,
+        "description": product.description,
+        "price": float(price),
+        "price_formatted": price_formatted or format_brl(price),
+        "original_price": float(original_price) if original_price else None,
+        "is_on_sale": on_sale,
+        "discount_percentage": float((original_price - price) / original_price * 100) if on_sale else 0.0,
+        "condition": product.condition.value,
+        "status": product.status.value,
+        "is_in_stock": product.stock_quantity > 0,
+        "stock_quantity": product.stock_quantity,
+        "primary_image": primary_image,
+        "thumbnail": thumbnail,
+        "images": product.images,
+        "specifications": product.specifications,
+        "category": category_name,
+        "brand": brand_name,
+        "view_count": product.view_count,
+        "allows_negotiation": product.allows_negotiation,
+        "created_at": product.created_at.isoformat(),
+        "updated_at": product.updated_at.isoformat(),
+    }
+
+def marketplace_items(
+    products: Sequence[Product],
+    category_names: NameMap,
+    brand_names: NameMap
+) -> List[Dict]:
+    """Serialize a page of products with pre-resolved names"""
+    prices_formatted = format_brl_column(product.price for product in products)
+    return [
+        marketplace_item(
+            product,
+            category_names.get(product.category_id),
+            brand_names.get(product.brand_id),
+            price_formatted
+        )
+        for product, price_formatted in zip(products, prices_formatted)
+    ]
+
+async def serialize_marketplace(db: AsyncSession, products: Sequence[Product]) -> List[Dict]:
+    """Resolve names for the whole page in one lookup and serialize it"""
+    category_names, brand_names = await load_taxonomy_names(db, products)
+    return marketplace_items(products, category_names, brand_names)
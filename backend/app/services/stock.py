@@ -0,0 +1,155 @@
+# ========================================
+# STOCKTECH - Stock Reservation (Atomic SQL)
+# ========================================
+#
+# Reservations are a single conditional UPDATE ... WHERE stock_quantity >= :q
+# RETURNING, so concurrent buyers can never oversell and no SELECT ... FOR
+# UPDATE round trip is needed. The OUT_OF_STOCK flip happens in the same
+# statement.
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping
+
+from sqlalchemy import Integer, case, column, literal, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Product, ProductStatus
+from .response_cache import mark_products_changed
+
+@dataclass
+class StockLine:
+    """Stock left on a product after a reservation/release"""
+    product_id: uuid.UUID
+    quantity: int
+    remaining: int
+    status: ProductStatus
+
+@dataclass
+class ReservationResult:
+    """Outcome of reserve_stock(); `failed` lists products without enough stock"""
+    success: bool
+    lines: List[StockLine] = field(default_factory=list)
+    failed: List[uuid.UUID] = field(default_factory=list)
+
+class _PartialReservation(Exception):
+    """Internal: rolls back the savepoint of an all-or-nothing reservation"""
+
+def _merge_quantities(items: Mapping[uuid.UUID, int]) -> Dict[uuid.UUID, int]:
+    merged: Dict[uuid.UUID, int] = defaultdict(int)
+    for product_id, quantity in dict(items).items():
+        if quantity <= 0:
+            raise ValueError("Quantities must be positive")
+        merged[product_id] += quantity
+    return dict(merged)
+
+def _request_values(quantities: Dict[uuid.UUID, int]):
+    return values(
+        column("id", UUID(as_uuid=True)),
+        column("qty", Integer),
+        name="req"
+    ).data(sorted(quantities.items()))
+
+def _status(status: ProductStatus):
+    """CASE result bound as the column's enum type (a bare member sends its lowercase value)"""
+    return literal(status, Product.status.type)
+
+def _reserve_statement(quantities: Dict[uuid.UUID, int]):
+    """UPDATE products ... FROM (VALUES ...) WHERE stock_quantity >= qty RETURNING"""
+    req = _request_values(quantities)
+    remaining = Product.stock_quantity - req.c.qty
+    
+    stmt = (
+        update(Product)
+        .values(
+            stock_quantity=remaining,
+            status=case(
+                (remaining == 0, _status(ProductStatus.OUT_OF_STOCK)),
+                else_=Product.status
+            )
+        )
+        .where(
+            Product.id == req.c.id,
+            Product.stock_quantity >= req.c.qty,
+            Product.status == ProductStatus.ACTIVE
+        )
+        .returning(Product.id, req.c.qty, Product.stock_quantity, Product.status)
+        .execution_options(synchronize_session=False)
+    )
+    
+    if len(quantities) > 1:
+        # Multi-product carts lock their rows in id order first (same
+        # statement), so overlapping carts cannot deadlock each other
+        locked = (
+            select(Product.id)
+            .where(Product.id.in_(list(quantities)))
+            .order_by(Product.id)
+            .with_for_update()
+            .cte("locked")
+            .prefix_with("MATERIALIZED", dialect="postgresql")
+        )
+        stmt = stmt.where(Product.id == locked.c.id)
+    
+    return stmt
+
+async def reserve_stock(
+    db: AsyncSession,
+    items: Mapping[uuid.UUID, int],
+    all_or_nothing: bool = True
+) -> ReservationResult:
+    """
+    Reserve several products in one round trip (caller commits)
+    
+    items: {product_id: quantity}. With all_or_nothing, nothing is reserved
+    unless every product has enough stock.
+    """
+    quantities = _merge_quantities(items)
+    if not quantities:
+        return ReservationResult(success=True)
+    
+    lines: List[StockLine] = []
+    try:
+        async with db.begin_nested():
+            result = await db.execute(_reserve_statement(quantities))
+            lines = [StockLine(*row) for row in result.all()]
+            if all_or_nothing and len(lines) < len(quantities):
+                raise _PartialReservation()
+    except _PartialReservation:
+        reserved = {line.product_id for line in lines}
+        return ReservationResult(
+            success=False,
+            failed=[product_id for product_id in quantities if product_id not in reserved]
+        )
+    
+    reserved = {line.product_id for line in lines}
+    failed = [product_id for product_id in quantities if product_id not in reserved]
+    if reserved:
+        mark_products_changed(db, reserved)
+    return ReservationResult(success=not failed, lines=lines, failed=failed)
+
+async def release_stock(db: AsyncSession, items: Mapping[uuid.UUID, int]) -> List[StockLine]:
+    """Give reserved stock back, reactivating OUT_OF_STOCK products (caller commits)"""
+    quantities = _merge_quantities(items)
+    if not quantities:
+        return []
+    
+    req = _request_values(quantities)
+    stmt = (
+        update(Product)
+        .values(
+            stock_quantity=Product.stock_quantity + req.c.qty,
+            status=case(
+                (Product.status == ProductStatus.OUT_OF_STOCK, _status(ProductStatus.ACTIVE)),
+                else_=Product.status
+            )
+        )
+        .where(Product.id == req.c.id)
+        .returning(Product.id, req.c.qty, Product.stock_quantity, Product.status)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    lines = [StockLine(*row) for row in result.all()]
+    mark_products_changed(db, [line.product_id for line in lines])
+    return lines
@@ -0,0 +1,129 @@
+# ========================================
+# STOCKTECH - AvAdmin Usage Reporting
+# ========================================
+
+import asyncio
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..clients.avadmin_client import avadmin_client
+from ..core.config import settings
+from ..core.database import AsyncSessionFactory
+from ..core.metrics import usage_outbox_pending
+from ..models.outbox import UsageDelta
+
+# Claim a batch of outbox rows and aggregate them per (account, counter).
+# The DELETE commits before anything is sent, so a delta can be lost but
+# never reported twice (at-most-once).
+DRAIN_USAGE_SQL = text("""
+    WITH drained AS (
+        DELETE FROM usage_deltas
+        WHERE id IN (
+            SELECT id FROM usage_deltas
+            ORDER BY created_at
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING account_id, counter_type, delta
+    )
+    SELECT account_id, counter_type, sum(delta)::int AS delta, count(*) AS row_count
+    FROM drained
+    GROUP BY account_id, counter_type
+""")
+
+def record_usage(db: AsyncSession, account_id: uuid.UUID, counter_type: str, amount: int = 1) -> None:
+    """
+    Queue a usage increment in the caller's transaction (caller commits)
+    Bulk operations should pass the total as `amount` instead of looping
+    """
+    db.add(UsageDelta(account_id=account_id, counter_type=counter_type, delta=amount))
+    usage_reporter.note(1)
+
+class UsageReporter:
+    """Flushes the usage_deltas outbox to AvAdmin on an interval or size threshold"""
+    
+    def __init__(self, flush_interval: float, max_pending: int, batch_size: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._pending = 0
+        self._wake = asyncio.Event()
+    
+    def note(self, rows: int) -> None:
+        """Count outbox rows written by this worker; wakes the loop past max_pending"""
+        self._pending += rows
+        usage_outbox_pending.set(self._pending)
+        if self._pending >= self.max_pending:
+            self._wake.set()
+    
+    async def flush(self) -> Dict[str, int]:
+        """Drain the outbox until a partial batch comes back"""
+        self._pending = 0
+        usage_outbox_pending.set(0)
+        stats = {"rows": 0, "reported": 0, "requeued": 0}
+        
+        while True:
+            async with AsyncSessionFactory() as db:
+                result = await db.execute(DRAIN_USAGE_SQL, {"batch_size": self.batch_size})
+                groups = result.mappings().all()
+                await db.commit()
+            
+            if not groups:
+                return stats
+            
+            rows = sum(group["row_count"] for group in groups)
+            deltas = [
+                {"account_id": str(group["account_id"]), "counter_type": group["counter_type"], "delta": group["delta"]}
+                for group in groups
+                if group["delta"]
+            ]
+            undelivered = await avadmin_client.report_usage(deltas) if deltas else []
+            if undelivered:
+                await self._requeue(undelivered)
+            
+            stats["rows"] += rows
+            stats["reported"] += len(deltas) - len(undelivered)
+            stats["requeued"] += len(undelivered)
+            
+            # AvAdmin is unreachable; retry next cycle
+            if undelivered or rows < self.batch_size:
+                return stats
+    
+    async def _requeue(self, deltas: List[Dict]) -> None:
+        """Put back deltas AvAdmin never received (aggregated, one row each)"""
+        async with AsyncSessionFactory() as db:
+            await db.execute(insert(UsageDelta), [
+                {"account_id": uuid.UUID(item["account_id"]), "counter_type": item["counter_type"], "delta": item["delta"]}
+                for item in deltas
+            ])
+            await db.commit()
+    
+    async def run(self) -> None:
+        """Background task: flush every flush_interval or when max_pending is hit"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️  Usage report flush failed: {str(e)[:100]}")
+    
+    async def close(self) -> None:
+        """Final flush on shutdown"""
+        await self.flush()
+
+# Global reporter instance
+usage_reporter = UsageReporter(
+    flush_interval=settings.usage_flush_interval_seconds,
+    max_pending=settings.usage_flush_max_pending,
+    batch_size=settings.usage_flush_batch_size
+)
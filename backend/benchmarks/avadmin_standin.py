@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Local AvAdmin Stand-in
+# ========================================
+#
+# Fake of every AvAdmin internal route used by AvAdminClient, for
+# benchmarks and load tests that must not depend on the real service.
+# Latency, injected 503s and payload sizes are configurable (also at
+# runtime via PUT /_standin/config); GET /_standin/stats reports request
+# and connection counts.
+#
+# Usage:
+#     python benchmarks/avadmin_standin.py [--port 8800] [--latency-ms 20]
+#         [--jitter-ms 5] [--error-rate 0.01] [--users-per-account 3]
+#         [--features 0] [--no-bulk]
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 0.0        # Added to every response
+    jitter_ms: float = 0.0         # Uniform extra delay on top of latency_ms
+    error_rate: float = 0.0        # Fraction of requests answered with 503
+    users_per_account: int = 3     # Size of /accounts/{id}/users
+    features: int = 0              # Extra plan feature flags (account payload size)
+    bulk: bool = True              # Serve the */batch routes
+
+@dataclass
+class StandinStats:
+    requests: int = 0
+    errors: int = 0
+    routes: Counter = field(default_factory=Counter)
+    clients: set = field(default_factory=set)   # (host, port) seen = client connections
+    
+    def reset(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.routes.clear()
+        self.clients.clear()
+    
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "connections": len(self.clients),
+            "routes": dict(self.routes),
+        }
+
+class ChaosMiddleware:
+    """Pure ASGI wrapper: counts requests/connections, adds latency, injects 503s"""
+    
+    def __init__(self, app, config: StandinConfig, stats: StandinStats):
+        self.app = app
+        self.config = config
+        self.stats = stats
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/_standin"):
+            return await self.app(scope, receive, send)
+        
+        self.stats.requests += 1
+        parts = scope["path"].split("/")
+        self.stats.routes[f"{scope['method']} {parts[3] if len(parts) > 3 else scope['path']}"] += 1
+        if scope.get("client"):
+            self.stats.clients.add(tuple(scope["client"]))
+        
+        delay = self.config.latency_ms + random.uniform(0, self.config.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        
+        if random.random() < self.config.error_rate:
+            self.stats.errors += 1
+            await send({"type": "http.response.start", "status": 503, "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": b'{"detail":"Injected failure"}'})
+            return
+        
+        await self.app(scope, receive, send)
+
+def _user(user_id: str) -> dict:
+    return {
+        "id": user_id,
+        "full_name": "João Silva Santos",
+        "cpf": "12345678900",
+        "whatsapp": "5511999999999",
+        "role": "owner",
+        "account_id": str(uuid.uuid5(uuid.NAMESPACE_OID, user_id)),
+        "is_active": True,
+        "whatsapp_verified": True,
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat(),
+    }
+
+def _account(account_id: str, features: int = 0) -> dict:
+    return {
+        "id": account_id,
+        "company_name": "Empresa Demo LTDA",
+        "cnpj": "12345678000100",
+        "whatsapp": "5511999999999",
+        "responsible_name": "João Silva Santos",
+        "status": "active",
+        "enabled_modules": ["StockTech"],
+        "plan": {
+            "id": "plan-pro",
+            "name": "Pro",
+            "max_users": 10,
+            "max_products": 5000,
+            "max_transactions": 10000,
+            "features": {f"feature_{i}": True for i in range(features)},
+        },
+        "limits": {
+            "max_users": 10,
+            "max_products": 5000,
+            "max_transactions": 10000,
+            "current_users": 1,
+            "current_products": 42,
+            "current_transactions": 7,
+        },
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc).isoformat(),
+    }
+
+def create_app(config: Optional[StandinConfig] = None, **options) -> FastAPI:
+    """Stand-in app; pass a StandinConfig or its fields as keyword arguments"""
+    config = config or StandinConfig(**options)
+    stats = StandinStats()
+    
+    app = FastAPI(title="AvAdmin stand-in")
+    app.state.config = config
+    app.state.stats = stats
+    
+    def require_bulk():
+        if not config.bulk:
+            raise HTTPException(status_code=404, detail="Not Found")
+    
+    @app.get("/api/internal/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    @app.get("/api/internal/users/by-cpf/{cpf}")
+    async def user_by_cpf(cpf: str):
+        return _user(str(uuid.uuid5(uuid.NAMESPACE_OID, cpf)))
+    
+    @app.post("/api/internal/users/batch")
+    async def get_users(payload: dict):
+        require_bulk()
+        return {"users": [_user(user_id) for user_id in payload.get("ids", [])]}
+    
+    @app.get("/api/internal/users/{user_id}")
+    async def get_user(user_id: str):
+        return _user(user_id)
+    
+    @app.post("/api/internal/accounts/batch")
+    async def get_accounts(payload: dict):
+        require_bulk()
+        return {"accounts": [_account(account_id, config.features) for account_id in payload.get("ids", [])]}
+    
+    @app.get("/api/internal/accounts/{account_id}/users")
+    async def account_users(account_id: str, active_only: bool = True):
+        return {"users": [_user(str(uuid.uuid4())) for _ in range(config.users_per_account)]}
+    
+    @app.get("/api/internal/accounts/{account_id}/permissions")
+    async def permissions(account_id: str, module: str = "StockTech"):
+        return {"account_id": account_id, "module": module, "has_access": True, "reason": "Plan includes module"}
+    
+    @app.get("/api/internal/accounts/{account_id}")
+    async def get_account(account_id: str):
+        return _account(account_id, config.features)
+    
+    @app.post("/api/internal/accounts/{account_id}/usage/{counter_type}")
+    async def increment_usage(account_id: str, counter_type: str):
+        return {"account_id": account_id, "counter_type": counter_type, "ok": True}
+    
+    @app.post("/api/internal/usage/batch")
+    async def report_usage(payload: dict):
+        require_bulk()
+        return {"applied": len(payload.get("deltas", []))}
+    
+    @app.get("/api/internal/auth/revocations")
+    async def revocations():
+        return {"jtis": [], "users": {}}
+    
+    @app.post("/api/internal/validate/user-access")
+    async def validate_user_access(payload: dict):
+        return {"user_id": payload.get("user_id"), "has_access": True}
+    
+    # Control routes (not counted, no injected latency/errors)
+    @app.get("/_standin/stats")
+    async def get_stats():
+        return stats.as_dict()
+    
+    @app.put("/_standin/config")
+    async def update_config(payload: dict):
+        names = {f.name for f in fields(StandinConfig)}
+        for name, value in payload.items():
+            if name in names:
+                setattr(config, name, value)
+        return asdict(config)
+    
+    @app.post("/_standin/stats/reset")
+    async def reset_stats():
+        stats.reset()
+        return stats.as_dict()
+    
+    app.add_middleware(ChaosMiddleware, config=config, stats=stats)
+    return app
+
+@contextmanager
+def run_standin(app: FastAPI = None, host: str = "127.0.0.1", port: int = 8800):
+    """Serve the stand-in from a background thread; yields its base URL"""
+    config = uvicorn.Config(app or create_app(), host=host, port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--users-per-account", type=int, default=3)
+    parser.add_argument("--features", type=int, default=0)
+    parser.add_argument("--no-bulk", action="store_true")
+    args = parser.parse_args()
+    
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        users_per_account=args.users_per_account,
+        features=args.features,
+        bulk=not args.no_bulk
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
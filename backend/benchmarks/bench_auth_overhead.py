@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: Auth Overhead per Request
+# ========================================
+#
+# Cost of authorizing one request for the StockTech module:
+#   avadmin     - POST validate/user-access to the local AvAdmin stand-in (previous behaviour)
+#   jwt-verify  - python-jose HMAC verification of every token
+#   dependency  - get_current_user + has_module_access (claims cache + revocation list)
+#
+# Usage:
+#     python benchmarks/bench_auth_overhead.py [--requests 2000] [--users 200]
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.api.deps import get_current_user
+from app.clients.avadmin_client import avadmin_client
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services.auth import has_module_access
+from avadmin_standin import run_standin
+
+async def measure(label: str, authorize, tokens, requests: int):
+    latencies = []
+    for i in range(requests):
+        token = tokens[i % len(tokens)]
+        start = time.perf_counter()
+        await authorize(token)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"   {label:<11} p50 {statistics.median(latencies):9.1f} µs   p99 {p99:9.1f} µs")
+
+async def main(base_url: str, requests: int, users: int):
+    avadmin_client.base_url = base_url
+    await avadmin_client.open()
+    
+    tokens = [
+        create_access_token(str(uuid.uuid4()), account_id=str(uuid.uuid4()), modules=["StockTech"])
+        for _ in range(users)
+    ]
+    
+    async def via_avadmin(token):
+        claims = jwt.get_unverified_claims(token)
+        return await avadmin_client.validate_user_access(claims["sub"], "StockTech")
+    
+    async def via_jwt(token):
+        claims = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        return "StockTech" in claims["modules"]
+    
+    async def via_dependency(token):
+        claims = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+        return await has_module_access(claims, "StockTech")
+    
+    # Loads the revocation list once, as the first request of a worker would
+    await via_dependency(tokens[0])
+    
+    print(f"🔐 {requests} authorizations across {users} users\n")
+    await measure("avadmin", via_avadmin, tokens, requests)
+    await measure("jwt-verify", via_jwt, tokens, requests)
+    await measure("dependency", via_dependency, tokens, requests)
+    await avadmin_client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    
+    with run_standin(port=args.port) as base_url:
+        asyncio.run(main(base_url, args.requests, args.users))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: AvAdmin Batched Lookups
+# ========================================
+#
+# Resolving buyer/seller users and accounts for a transaction list page
+# against the local AvAdmin stand-in:
+#   per-row  - awaiting get_user/get_account row by row (previous pattern)
+#   batched  - get_users/get_accounts, one bulk request per tick
+#   fallback - same, against a stand-in without bulk endpoints
+#
+# The lookup cache is disabled so every run hits the stand-in.
+#
+# Usage:
+#     python benchmarks/bench_avadmin_batching.py [--rows 50] [--latency-ms 5]
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+
+settings.avadmin_cache_enabled = False
+
+from app.clients.avadmin_client import AvAdminClient
+from avadmin_standin import create_app, run_standin
+
+def transaction_rows(rows: int):
+    return [
+        {
+            "buyer_user_id": str(uuid.uuid4()),
+            "seller_user_id": str(uuid.uuid4()),
+            "buyer_account_id": str(uuid.uuid4()),
+            "seller_account_id": str(uuid.uuid4()),
+        }
+        for _ in range(rows)
+    ]
+
+async def per_row(client: AvAdminClient, rows):
+    for row in rows:
+        await client.get_user(row["buyer_user_id"])
+        await client.get_user(row["seller_user_id"])
+        await client.get_account(row["buyer_account_id"])
+        await client.get_account(row["seller_account_id"])
+
+async def batched(client: AvAdminClient, rows):
+    user_ids = [row[field] for row in rows for field in ("buyer_user_id", "seller_user_id")]
+    account_ids = [row[field] for row in rows for field in ("buyer_account_id", "seller_account_id")]
+    await asyncio.gather(client.get_users(user_ids), client.get_accounts(account_ids))
+
+async def measure(label: str, app, base_url: str, render, rows: int):
+    client = AvAdminClient()
+    client.base_url = base_url
+    await client.open()
+    
+    app.state.stats.reset()
+    start = time.perf_counter()
+    await render(client, transaction_rows(rows))
+    elapsed = (time.perf_counter() - start) * 1000
+    await client.close()
+    
+    print(f"   {label:<9} {elapsed:9.1f} ms   {app.state.stats.requests:5d} AvAdmin requests")
+
+async def run(app, base_url: str, rows: int, modes):
+    for label, render in modes:
+        await measure(label, app, base_url, render, rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    
+    print(f"🔗 {args.rows} transaction rows, {args.latency_ms} ms stand-in latency\n")
+    
+    bulk_app = create_app(bulk=True, latency_ms=args.latency_ms)
+    with run_standin(bulk_app, port=args.port) as base_url:
+        asyncio.run(run(bulk_app, base_url, args.rows, [("per-row", per_row), ("batched", batched)]))
+    
+    plain_app = create_app(bulk=False, latency_ms=args.latency_ms)
+    with run_standin(plain_app, port=args.port) as base_url:
+        asyncio.run(run(plain_app, base_url, args.rows, [("fallback", batched)]))
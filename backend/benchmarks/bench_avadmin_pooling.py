@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: AvAdmin Client Connection Pooling
+# ========================================
+#
+# Per-call latency of get_user() against the local AvAdmin stand-in:
+#   per-call - a new httpx.AsyncClient per request (previous behaviour)
+#   pooled   - AvAdminClient's long-lived pooled client
+#
+# Usage:
+#     python benchmarks/bench_avadmin_pooling.py [--calls 500] [--concurrency 1]
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+
+from app.clients.avadmin_client import AvAdminClient, UserData
+from avadmin_standin import run_standin
+
+async def per_call_get_user(base_url: str, user_id: str):
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(f"{base_url}/api/internal/users/{user_id}")
+        return UserData(**response.json())
+
+async def measure(label: str, call, calls: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await call(str(uuid.uuid4()))
+            latencies.append((time.perf_counter() - start) * 1000)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"   {label:<9} p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms   "
+        f"{calls / elapsed:8.1f} calls/s"
+    )
+
+async def main(base_url: str, calls: int, concurrency: int):
+    client = AvAdminClient()
+    client.base_url = base_url
+    await client.open()
+    
+    # Warm up both paths
+    await per_call_get_user(base_url, "warmup")
+    await client.get_user("warmup")
+    
+    print(f"🔗 {calls} get_user calls, concurrency {concurrency}\n")
+    await measure("per-call", lambda user_id: per_call_get_user(base_url, user_id), calls, concurrency)
+    await measure("pooled", client.get_user, calls, concurrency)
+    await client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    
+    with run_standin(port=args.port) as base_url:
+        asyncio.run(main(base_url, args.calls, args.concurrency))
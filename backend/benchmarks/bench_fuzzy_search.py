@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: Trigram vs B-tree Name Lookup
+# ========================================
+#
+# Compares the ILIKE lookup the catalog used to run (only ix_products_name,
+# a b-tree, is available to it) with the trigram fuzzy lookup backed by
+# ix_products_name_trgm / ix_products_code_trgm.
+#
+# Usage (against a populated database, STOCKTECH_DATABASE_URL as usual):
+#     python benchmarks/bench_fuzzy_search.py [--runs 20] [--explain] [term ...]
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from app.core.database import AsyncSessionFactory, engine
+from app.models import Product, ProductStatus
+from app.services.search import fuzzy_search_products
+
+DEFAULT_TERMS = [
+    "iPhone 15 Pro",     # exact words
+    "iphnoe 15",         # typo
+    "galaxi s24 ultra",  # typo
+    "ST000001A",         # exact code
+    "st 00001a",         # mangled code
+]
+
+def btree_lookup(term: str):
+    """What the catalog did before: ILIKE on name/code"""
+    pattern = f"%{term}%"
+    return (
+        select(Product.id)
+        .where(
+            (Product.name.ilike(pattern) | Product.code.ilike(pattern)),
+            Product.status == ProductStatus.ACTIVE
+        )
+        .limit(20)
+    )
+
+async def time_async(fn, runs: int):
+    """Run coroutine factory `runs` times and return (timings_ms, last_result)"""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+def summarize(label: str, timings, hits: int):
+    timings = sorted(timings)
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    print(f"   {label:<8} median {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms   hits {hits}")
+
+async def explain(db, stmt):
+    compiled = stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {compiled}"))
+    for (line,) in result.all():
+        print(f"      {line}")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("terms", nargs="*", default=DEFAULT_TERMS)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--explain", action="store_true", help="Print EXPLAIN ANALYZE for the b-tree lookup")
+    args = parser.parse_args()
+    
+    async with AsyncSessionFactory() as db:
+        total = (await db.execute(text("SELECT count(*) FROM products"))).scalar()
+        print(f"📊 products: {total} rows, {args.runs} runs per query\n")
+        
+        for term in args.terms:
+            print(f"🔎 {term!r}")
+            
+            async def run_btree():
+                return (await db.execute(btree_lookup(term))).all()
+            
+            async def run_trigram():
+                return await fuzzy_search_products(db, term, limit=20)
+            
+            timings, rows = await time_async(run_btree, args.runs)
+            summarize("b-tree", timings, len(rows))
+            timings, rows = await time_async(run_trigram, args.runs)
+            summarize("trigram", timings, len(rows))
+            
+            if args.explain:
+                await explain(db, btree_lookup(term))
+            print()
+    
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
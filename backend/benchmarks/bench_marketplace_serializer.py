@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: Catalog Page Serialization
+# ========================================
+#
+# Serializes a 100-item catalog page two ways (no database needed):
+#   per-item - Product.to_marketplace_dict() + FastAPI's default JSON path
+#   bulk     - services.serializers.marketplace_items() + orjson
+#
+# Usage:
+#     python benchmarks/bench_marketplace_serializer.py [--items 100] [--runs 2000]
+
+import argparse
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import Product, ProductCondition, ProductStatus
+from app.services.serializers import dumps, marketplace_items
+
+CATEGORIES = {uuid.uuid4(): name for name in ("Smartphones", "Acessórios", "Tablets")}
+BRANDS = {uuid.uuid4(): name for name in ("Apple", "Samsung", "Xiaomi", "Motorola")}
+
+def build_page(size: int):
+    now = datetime.now(timezone.utc)
+    category_ids = list(CATEGORIES)
+    brand_ids = list(BRANDS)
+    products = []
+    for i in range(size):
+        price = Decimal(1000 + i * 37) + Decimal("0.90")
+        products.append(Product(
+            id=uuid.uuid4(),
+            account_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            code=f"ST{i:06d}A",
+            name=f"Smartphone Modelo {i} 256GB",
+            description="Aparelho seminovo em excelente estado, com nota fiscal.",
+            category_id=category_ids[i % len(category_ids)],
+            brand_id=brand_ids[i % len(brand_ids)],
+            price=price,
+            original_price=price + Decimal("250.00") if i % 3 == 0 else None,
+            stock_quantity=i % 7,
+            condition=ProductCondition.USED_EXCELLENT,
+            status=ProductStatus.ACTIVE,
+            specifications={"storage": "256GB", "color": "Preto", "warranty_months": 3},
+            images=[
+                {"url": f"/uploads/products/{i}_1.jpg", "thumbnail": f"/uploads/products/thumb_{i}_1.jpg", "is_primary": False},
+                {"url": f"/uploads/products/{i}_2.jpg", "thumbnail": f"/uploads/products/thumb_{i}_2.jpg", "is_primary": True},
+            ],
+            view_count=i * 11,
+            allows_negotiation=True,
+            created_at=now,
+            updated_at=now,
+        ))
+    return products
+
+def per_item(products) -> bytes:
+    items = [
+        product.to_marketplace_dict(
+            category_name=CATEGORIES.get(product.category_id),
+            brand_name=BRANDS.get(product.brand_id)
+        )
+        for product in products
+    ]
+    return json.dumps(jsonable_encoder({"items": items})).encode()
+
+def bulk(products) -> bytes:
+    return dumps({"items": marketplace_items(products, CATEGORIES, BRANDS)})
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+    
+    products = build_page(args.items)
+    assert json.loads(per_item(products)) == json.loads(bulk(products)), "Outputs differ"
+    
+    print(f"📦 {args.items}-item page, {args.runs} runs\n")
+    baseline = None
+    for label, fn in (("per-item", per_item), ("bulk", bulk)):
+        seconds = min(timeit.repeat(lambda: fn(products), number=args.runs, repeat=3)) / args.runs
+        baseline = baseline or seconds
+        print(f"   {label:<9} {seconds * 1e6:9.1f} µs/page   {baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: BRL Money Formatting
+# ========================================
+#
+# Compares the chained str.replace formatting the models used with
+# core.formatting (scalar and single-pass column, with a cold and a warm
+# cache), and checks the output is identical.
+#
+# Usage:
+#     python benchmarks/bench_money_format.py [--rows 100] [--runs 5000]
+
+import argparse
+import random
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.formatting import clear_format_cache, format_brl, format_brl_column
+
+def legacy(value) -> str:
+    return f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+def build_prices(rows: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [Decimal(rng.randint(0, 5_000_000)) / 100 for _ in range(rows)]
+
+def check_identical():
+    rng = random.Random(7)
+    samples = [Decimal(rng.randint(-10**9, 10**9)) / 1000 for _ in range(50_000)]
+    samples += [Decimal("0"), Decimal("0.005"), Decimal("999.995"), Decimal("1000000"), 0, 12.5]
+    samples += [Decimal("-0"), -0.0, Decimal("-0.00"), 0.0]  # Equal to 0 but signed
+    for value in samples:
+        assert format_brl(value) == legacy(value), value
+    assert format_brl_column(samples) == [legacy(value) for value in samples]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5000)
+    args = parser.parse_args()
+    
+    check_identical()
+    prices = build_prices(args.rows)
+    
+    def cold(fn):
+        def run():
+            clear_format_cache()
+            return fn()
+        return run
+    
+    cases = (
+        ("legacy", lambda: [legacy(price) for price in prices]),
+        ("scalar cold", cold(lambda: [format_brl(price) for price in prices])),
+        ("column cold", cold(lambda: format_brl_column(prices))),
+        ("scalar warm", lambda: [format_brl(price) for price in prices]),
+        ("column warm", lambda: format_brl_column(prices)),
+    )
+    
+    print(f"💰 {args.rows} prices per page, {args.runs} runs (outputs identical)\n")
+    baseline = None
+    for label, fn in cases:
+        seconds = min(timeit.repeat(fn, number=args.runs, repeat=3)) / args.runs
+        baseline = baseline or seconds
+        print(f"   {label:<12} {seconds * 1e6:8.2f} µs/page   {baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: Planning vs Execution per Hot Query
+# ========================================
+#
+# Runs the hot read queries through two engines:
+#   cold    - query_cache_size=0, prepared_statement_cache_size=0
+#             (compiled and planned on every call)
+#   cached  - the app's settings (compiled cache + per-connection prepared
+#             statements, or the --pgbouncer-mode variant)
+# Reports client latency and, from pg_stat_statements, calls vs plans and
+# mean planning vs execution time. Also lists how many named statements the
+# cached connection holds (pg_prepared_statements) to prove reuse.
+#
+# Needs pg_stat_statements with track_planning (docker-compose.replica.yml
+# preloads it on the primary).
+#
+# Usage (against a populated database, STOCKTECH_DATABASE_URL as usual):
+#     python benchmarks/bench_statement_cache.py [--runs 200] [--pgbouncer-mode off|transaction|prepared]
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import statement_cache_args
+from app.models import Product, ProductStatus, Transaction
+from app.services.catalog import get_product, list_products
+from app.services.pagination import encode_cursor
+from app.services.serializers import clear_name_cache, load_taxonomy_names
+
+STATS_SQL = text("""
+SELECT sum(calls) AS calls, sum(plans) AS plans,
+       sum(total_plan_time) / nullif(sum(plans), 0) AS plan_ms,
+       sum(total_exec_time) / nullif(sum(calls), 0) AS exec_ms
+FROM pg_stat_statements
+WHERE calls >= :runs
+  AND query NOT ILIKE '%pg_stat_statements%'
+  AND query NOT ILIKE '%pg_catalog%'
+  AND query ILIKE 'select%'
+""")
+
+async def sample(db: AsyncSession) -> dict:
+    """Real ids/cursors to query with"""
+    products = (await db.execute(
+        select(Product).where(Product.status == ProductStatus.ACTIVE).limit(50)
+    )).scalars().all()
+    if not products:
+        raise SystemExit("No active products; seed the database first")
+    
+    buyer = (await db.execute(select(Transaction.buyer_account_id).limit(1))).scalar()
+    return {
+        "products": products,
+        "cursor": encode_cursor("newest", products[len(products) // 2]),
+        "buyer_account_id": buyer or products[0].account_id,
+    }
+
+def scenarios(data: dict) -> dict:
+    products = data["products"]
+    
+    async def catalog_first_page(db, i):
+        await list_products(db, sort="newest", limit=20)
+    
+    async def catalog_next_page(db, i):
+        await list_products(db, sort="newest", limit=20, cursor=data["cursor"])
+    
+    async def product_detail(db, i):
+        await get_product(db, products[i % len(products)].id)
+    
+    async def transaction_list(db, i):
+        await db.execute(
+            select(Transaction)
+            .where(Transaction.buyer_account_id == data["buyer_account_id"])
+            .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+            .limit(20)
+        )
+    
+    async def taxonomy_names(db, i):
+        clear_name_cache()
+        start = i % len(products)
+        await load_taxonomy_names(db, products[start:start + 1 + i % 20])
+    
+    return {
+        "catalog first page": catalog_first_page,
+        "catalog next page": catalog_next_page,
+        "product detail": product_detail,
+        "transaction list": transaction_list,
+        "taxonomy names": taxonomy_names,
+    }
+
+async def measure(label: str, session_factory, stats_factory, query, runs: int, has_stats: bool):
+    if has_stats:
+        async with stats_factory() as stats_db:
+            await stats_db.execute(text("SELECT pg_stat_statements_reset()"))
+    
+    latencies = []
+    async with session_factory() as db:
+        for i in range(runs):
+            start = time.perf_counter()
+            await query(db, i)
+            latencies.append((time.perf_counter() - start) * 1000)
+        prepared = (await db.execute(text("SELECT count(*) FROM pg_prepared_statements"))).scalar()
+        await db.rollback()
+    
+    line = f"   {label:<7} p50 {statistics.median(latencies):7.3f} ms   named statements {prepared:>3}"
+    if has_stats:
+        async with stats_factory() as stats_db:
+            row = (await stats_db.execute(STATS_SQL, {"runs": runs})).one()
+        if row.calls:
+            line += (
+                f"   calls {row.calls:>5}   plans {row.plans:>5}   "
+                f"plan {row.plan_ms or 0:7.3f} ms   exec {row.exec_ms or 0:7.3f} ms"
+            )
+    print(line)
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--pgbouncer-mode", default=settings.database_pgbouncer_mode)
+    args = parser.parse_args()
+    
+    cold = create_async_engine(
+        settings.database_url,
+        query_cache_size=0,
+        connect_args={"prepared_statement_cache_size": 0}
+    )
+    cached = create_async_engine(
+        settings.database_url,
+        query_cache_size=settings.database_query_cache_size,
+        connect_args=statement_cache_args(args.pgbouncer_mode, settings.database_prepared_statement_cache_size)
+    )
+    cold_factory = sessionmaker(cold, class_=AsyncSession, expire_on_commit=False)
+    cached_factory = sessionmaker(cached, class_=AsyncSession, expire_on_commit=False)
+    
+    async with cold_factory() as db:
+        data = await sample(db)
+        try:
+            await db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_stat_statements"))
+            await db.commit()
+            track = (await db.execute(text("SHOW pg_stat_statements.track_planning"))).scalar()
+            has_stats = track == "on"
+        except Exception:
+            await db.rollback()
+            has_stats = False
+    if not has_stats:
+        print("⚠️  pg_stat_statements with track_planning unavailable; client latency only")
+    
+    print(f"🧮 {args.runs} runs per query, pgbouncer mode '{args.pgbouncer_mode}'\n")
+    for name, query in scenarios(data).items():
+        print(f"{name}:")
+        await measure("cold", cold_factory, cold_factory, query, args.runs, has_stats)
+        await measure("cached", cached_factory, cold_factory, query, args.runs, has_stats)
+    
+    await cold.dispose()
+    await cached.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Benchmark: Concurrent Stock Reservation
+# ========================================
+#
+# N concurrent buyers each try to reserve 1 unit of the same SKU.
+#   naive  - load the row, Product.reserve_stock() in Python, commit
+#   atomic - services.stock.reserve_stock() (conditional UPDATE ... RETURNING)
+# Reports throughput and oversells (units sold beyond the initial stock).
+#
+# Usage (against a migrated database, STOCKTECH_DATABASE_URL as usual):
+#     python benchmarks/bench_stock_reservation.py [--buyers 200] [--stock 50]
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models import Product, ProductStatus
+from app.services.stock import reserve_stock
+
+# Client connections the server can still accept (besides this one)
+FREE_CONNECTIONS_SQL = """
+SELECT current_setting('max_connections')::int
+    - current_setting('superuser_reserved_connections')::int
+    - count(*) FILTER (WHERE backend_type = 'client backend' AND pid <> pg_backend_pid())
+FROM pg_stat_activity
+"""
+
+async def create_sku(session_factory, stock: int) -> uuid.UUID:
+    async with session_factory() as db:
+        product = Product(
+            account_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            code=f"BENCH{uuid.uuid4().hex[:8].upper()}",
+            name="Benchmark SKU",
+            price=Decimal("100.00"),
+            stock_quantity=stock,
+            status=ProductStatus.ACTIVE,
+            specifications={},
+            images=[]
+        )
+        db.add(product)
+        await db.commit()
+        return product.id
+
+async def naive_buyer(session_factory, product_id: uuid.UUID) -> bool:
+    async with session_factory() as db:
+        product = (await db.execute(select(Product).where(Product.id == product_id))).scalar_one()
+        await asyncio.sleep(0)  # Let other buyers read the same stock value
+        ok = product.status == ProductStatus.ACTIVE and product.reserve_stock(1)
+        await db.commit()
+        return ok
+
+async def atomic_buyer(session_factory, product_id: uuid.UUID) -> bool:
+    async with session_factory() as db:
+        result = await reserve_stock(db, {product_id: 1})
+        await db.commit()
+        return result.success
+
+async def run(label: str, buyer, session_factory, buyers: int, stock: int):
+    product_id = await create_sku(session_factory, stock)
+    
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(buyer(session_factory, product_id) for _ in range(buyers)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    
+    async with session_factory() as db:
+        product = (await db.execute(select(Product).where(Product.id == product_id))).scalar_one()
+        sold = sum(1 for outcome in outcomes if outcome is True)
+        errors = sum(1 for outcome in outcomes if isinstance(outcome, Exception))
+        oversold = max(0, sold - stock)
+        print(
+            f"   {label:<7} {buyers / elapsed:8.1f} buyers/s   sold {sold:>4}/{stock}   "
+            f"oversold {oversold:>4}   errors {errors:>3}   "
+            f"final stock {product.stock_quantity} ({product.status.value})"
+        )
+        await db.execute(delete(Product).where(Product.id == product_id))
+        await db.commit()
+
+async def free_connections(url: str) -> int:
+    probe = create_async_engine(url, poolclass=NullPool)
+    try:
+        async with probe.connect() as conn:
+            return (await conn.execute(text(FREE_CONNECTIONS_SQL))).scalar_one()
+    finally:
+        await probe.dispose()
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--stock", type=int, default=50)
+    args = parser.parse_args()
+    
+    # One connection per buyer so the database, not the pool, is measured -
+    # capped at what the server has free (max_connections is 100 by default);
+    # buyers beyond that queue for a connection
+    pool_size = max(min(args.buyers, await free_connections(settings.database_url)), 1)
+    engine = create_async_engine(
+        settings.database_url,
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=300
+    )
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    print(f"🛒 {args.buyers} concurrent buyers, 1 SKU with {args.stock} units")
+    if pool_size < args.buyers:
+        print(f"   (server has {pool_size} free connections; the rest queue in the pool)")
+    print()
+    await run("naive", naive_buyer, session_factory, args.buyers, args.stock)
+    await run("atomic", atomic_buyer, session_factory, args.buyers, args.stock)
+    
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# ========================================
+# STOCKTECH - Load Test: AvAdminClient vs Local Stand-in
+# ========================================
+#
+# Drives get_user / get_account / check_module_permission at a target
+# concurrency against the AvAdmin stand-in and reports latency
+# percentiles, client retries, breaker rejections, cache outcomes and
+# the number of connections the stand-in saw.
+#
+# --outage START:LENGTH makes the stand-in fail every request during that
+# window (seconds from start) to exercise the circuit breaker.
+#
+# Usage:
+#     python benchmarks/load_avadmin_client.py [--concurrency 50] [--duration 10]
+#         [--ids 1000] [--mix user=5,account=3,permission=2]
+#         [--latency-ms 10] [--jitter-ms 5] [--error-rate 0.0]
+#         [--outage 3:4] [--breaker-recovery 15] [--no-cache] [--no-bulk]
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from prometheus_client import REGISTRY
+
+from app.clients.avadmin_client import AvAdminClient
+from app.core.config import settings
+from avadmin_standin import StandinConfig, create_app, run_standin
+
+def metric(sample: str, **labels) -> float:
+    return REGISTRY.get_sample_value(sample, labels) or 0.0
+
+def client_counters() -> dict:
+    counters = {
+        "retries": metric("stocktech_avadmin_request_retries_total"),
+        "breaker_rejections": metric("stocktech_circuit_breaker_rejections_total", name="avadmin"),
+    }
+    for lookup in ("user", "account", "permission"):
+        for result in ("hit", "coalesced", "miss"):
+            key = f"cache_{result}"
+            counters[key] = counters.get(key, 0.0) + metric(
+                "stocktech_avadmin_cache_requests_total", lookup=lookup, result=result
+            )
+    return counters
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+async def outage(config: StandinConfig, start: float, length: float, error_rate: float):
+    await asyncio.sleep(start)
+    config.error_rate = 1.0
+    await asyncio.sleep(length)
+    config.error_rate = error_rate
+
+async def main(app, base_url: str, args):
+    client = AvAdminClient()
+    client.base_url = base_url
+    client.breaker.recovery_timeout = args.breaker_recovery
+    await client.open()
+    
+    ids = [str(uuid.uuid4()) for _ in range(args.ids)]
+    mix = parse_mix(args.mix)
+    calls = {
+        "user": client.get_user,
+        "account": client.get_account,
+        "permission": client.check_module_permission,
+    }
+    names, weights = list(mix), list(mix.values())
+    
+    latencies = []
+    failures = 0
+    before = client_counters()
+    app.state.stats.reset()
+    
+    async def worker(deadline: float):
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights)[0]
+            start = time.perf_counter()
+            result = await calls[name](random.choice(ids))
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result is None or (name == "permission" and not result.has_access):
+                failures += 1
+    
+    tasks = []
+    if args.outage:
+        outage_start, outage_length = (float(part) for part in args.outage.split(":"))
+        tasks.append(asyncio.ensure_future(outage(app.state.config, outage_start, outage_length, args.error_rate)))
+    
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(deadline) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    
+    after = client_counters()
+    stats = app.state.stats.as_dict()
+    await client.close()
+    
+    latencies.sort()
+    
+    def percentile(p: float) -> float:
+        return latencies[max(int(len(latencies) * p) - 1, 0)]
+    
+    print(f"\n📊 {len(latencies)} calls in {elapsed:.1f}s ({len(latencies) / elapsed:,.0f} calls/s)")
+    print(
+        f"   latency    p50 {statistics.median(latencies):8.2f} ms   "
+        f"p95 {percentile(0.95):8.2f} ms   p99 {percentile(0.99):8.2f} ms   max {latencies[-1]:8.2f} ms"
+    )
+    print(f"   failures   {failures} ({failures / len(latencies):.1%})")
+    print(
+        f"   client     retries {after['retries'] - before['retries']:.0f}   "
+        f"breaker rejections {after['breaker_rejections'] - before['breaker_rejections']:.0f}   "
+        f"breaker state {client.breaker.state}"
+    )
+    print(
+        f"   cache      hit {after['cache_hit'] - before['cache_hit']:.0f}   "
+        f"coalesced {after['cache_coalesced'] - before['cache_coalesced']:.0f}   "
+        f"miss {after['cache_miss'] - before['cache_miss']:.0f}"
+    )
+    print(
+        f"   stand-in   requests {stats['requests']}   injected errors {stats['errors']}   "
+        f"connections {stats['connections']}"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--ids", type=int, default=1000, help="Distinct user/account ids (cache hit ratio)")
+    parser.add_argument("--mix", default="user=5,account=3,permission=2")
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--features", type=int, default=0, help="Plan feature flags per account payload")
+    parser.add_argument("--outage", default=None, help="START:LENGTH seconds of 100%% errors")
+    parser.add_argument("--breaker-recovery", type=float, default=settings.avadmin_breaker_recovery_timeout)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--no-bulk", action="store_true")
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+    
+    settings.avadmin_cache_enabled = not args.no_cache
+    
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        features=args.features,
+        bulk=not args.no_bulk
+    )
+    
+    print(
+        f"🔗 concurrency {args.concurrency}, {args.duration:.0f}s, {args.ids} ids, "
+        f"stand-in {args.latency_ms}±{args.jitter_ms} ms, error rate {args.error_rate:.0%}, "
+        f"cache {'off' if args.no_cache else 'on'}"
+    )
+    with run_standin(app, port=args.port) as base_url:
+        asyncio.run(main(app, base_url, args))
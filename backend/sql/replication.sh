@@ -0,0 +1,12 @@
+#!/bin/sh
+# ========================================
+# STOCKTECH - Replication role (primary, first start only)
+# ========================================
+# Executado pelo docker-entrypoint do primary em docker-compose.replica.yml
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-SQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+SQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"